@@ -14,10 +14,10 @@ import { Pool } from "pg";
 
 // Services
 import { initAudit, accessLogMiddleware } from "./lib/audit.js";
+import { negotiateEncoding } from "./lib/encoding.js";
 import { logger, requestLogger, logError } from "./lib/logger.js";
 import {
   sendSuccess,
-  sendPaginated,
   sendBadRequest,
   sendNotFound,
   sendServiceUnavailable,
@@ -27,16 +27,34 @@ import {
 import { versionMiddleware, getSupportedVersions, getCurrentVersion } from "./lib/versioning.js";
 import { initAuthMiddleware, rateLimit } from "./middleware/auth.js";
 import { createAdminRouter } from "./routes/admin.js";
+import { createArtifactsRouter } from "./routes/artifacts.js";
 import { createAuthRouter } from "./routes/auth.js";
+import batchRouter from "./routes/batch.js";
 import { createChainRouter } from "./routes/chain.js";
 import { createContainersRouter } from "./routes/containers.js";
 import { createOrganizationsRouter } from "./routes/organizations.js";
+import { createSearchRouter } from "./routes/search.js";
+import {
+  ArtifactService,
+  estimateTokens,
+  isArtifactFormat,
+  joinFragments,
+  renderFragment,
+} from "./services/artifacts.js";
+import {
+  AtomService,
+  isTrustLevel,
+  parseFieldGlobs,
+  PayloadNormalizer,
+  projectFields,
+} from "./services/atoms.js";
 import { AuthService, verifyToken, isValidApiKeyFormat } from "./services/auth.js";
 import { ContainerService } from "./services/containers.js";
 import { OrganizationService } from "./services/organizations.js";
 
 // Routes
 import { createUsersRouter } from "./routes/users.js";
+import webhooksRouter from "./routes/webhooks.js";
 
 // Middleware
 
@@ -161,7 +179,9 @@ const db = {
 
 const authService = new AuthService(db);
 const containerService = new ContainerService(db);
+const atomService = new AtomService(pool);
 const organizationService = new OrganizationService(db);
+const artifactService = new ArtifactService(db);
 
 // ===========================================
 // APP
@@ -326,14 +346,26 @@ const authRouter = createAuthRouter(authService);
 app.use("/v1/auth", rateLimit(10), authRouter);
 
 // Container routes
-app.use("/v1/containers", createContainersRouter(containerService));
+app.use("/v1/containers", createContainersRouter(containerService, atomService, artifactService));
+
+// Pre-rendered inject context
+app.use("/v1/artifacts", createArtifactsRouter(artifactService));
 
 // Organization routes
 app.use("/v1/organizations", createOrganizationsRouter(organizationService));
 
+// Search routes
+app.use("/v1/search", createSearchRouter(containerService));
+
 // Chain routes
 app.use("/v1/chain", createChainRouter());
 
+// Batch container registration (one Git commit per repository)
+app.use("/v1/batch", batchRouter);
+
+// Webhook subscriptions (container.* and batch.registered events)
+app.use("/v1/webhooks", webhooksRouter);
+
 // User routes
 app.use("/v1/user", createUsersRouter(authService, containerService));
 app.use("/v1/users", createUsersRouter(authService, containerService));
@@ -349,14 +381,26 @@ app.use("/v1/admin", createAdminRouter());
 app.use("/auth", rateLimit(10), createAuthRouter(authService));
 
 // Container routes (legacy)
-app.use("/api/containers", createContainersRouter(containerService));
+app.use("/api/containers", createContainersRouter(containerService, atomService, artifactService));
+
+// Pre-rendered inject context (legacy)
+app.use("/api/artifacts", createArtifactsRouter(artifactService));
 
 // Organization routes (legacy)
 app.use("/api/organizations", createOrganizationsRouter(organizationService));
 
+// Search routes (legacy)
+app.use("/api/search", createSearchRouter(containerService));
+
 // Chain routes (legacy)
 app.use("/api/chain", createChainRouter());
 
+// Batch container registration (legacy)
+app.use("/api/batch", batchRouter);
+
+// Webhook subscriptions (legacy)
+app.use("/api/webhooks", webhooksRouter);
+
 // User routes (legacy)
 app.use("/api/user", createUsersRouter(authService, containerService));
 app.use("/api/users", createUsersRouter(authService, containerService));
@@ -367,8 +411,10 @@ app.use("/api/admin", createAdminRouter());
 // Inject endpoint
 app.post(
   "/api/inject",
+  negotiateEncoding(),
   asyncHandler(async (req: Request, res: Response) => {
-    const { containers: containerIds, verify = true, format = "markdown" } = req.body;
+    const { containers: containerIds, verify = true, format = "markdown", minTrust, normalize } = req.body;
+    const fields = parseFieldGlobs(req.body.fields);
 
     if (!containerIds || !Array.isArray(containerIds)) {
       return sendBadRequest(res, "containers array is required");
@@ -378,91 +424,88 @@ app.post(
       return sendBadRequest(res, "Maximum 50 containers per inject request");
     }
 
+    if (minTrust !== undefined && !isTrustLevel(minTrust)) {
+      return sendBadRequest(res, "Invalid minTrust");
+    }
+
+    const projected = !!fields || !!minTrust;
     const containers = [];
     for (const id of containerIds) {
       if (typeof id !== "string") continue;
       const container = await containerService.getByContainerId(id);
       if (container) {
+        if (projected) {
+          if (fields) container.data = projectFields(container.data, fields);
+          container.atoms = await atomService.getAllAtoms(container.id, { fields, trustMin: minTrust });
+        }
         containers.push(container);
         await containerService.incrementStat(container.id, "inject_count");
       }
     }
 
+    // Full containers are served from artifacts pre-rendered at write time
     let formatted = "";
-    if (format === "markdown") {
-      for (const c of containers) {
-        formatted += `# ${c.data.name || c.identifier}\n\n`;
-        formatted += `**Container ID:** \`${c.container_id}\`\n`;
-        formatted += `**Type:** ${c.type}\n`;
-        formatted += `**Namespace:** ${c.namespace}\n\n`;
-
-        if (c.data.description) {
-          formatted += `## Description\n${c.data.description}\n\n`;
-        }
-
-        if (c.data.specs || c.data.specifications) {
-          formatted += `## Specifications\n`;
-          const specs = c.data.specs || c.data.specifications;
-          for (const [key, value] of Object.entries(specs as Record<string, unknown>)) {
-            formatted += `- **${key}:** ${value}\n`;
-          }
-          formatted += "\n";
-        }
+    if (isArtifactFormat(format)) {
+      const fragments = projected
+        ? containers.map((c) => renderFragment(c, format))
+        : await artifactService.fragments(containers, format);
+      formatted = joinFragments(fragments, format);
+    }
 
-        formatted += `---\n\n`;
-      }
-    } else if (format === "json") {
-      formatted = JSON.stringify(
-        containers.map((c) => c.data),
-        null,
-        2
-      );
+    // Containers anchored on chain; proofs themselves come from /api/verify
+    const verified = verify && containers.length > 0 && containers.every((c) => c.is_verified);
+
+    if (normalize === true) {
+      // Shared document, citation, contributor and unit tables referenced by index
+      const normalizer = new PayloadNormalizer();
+      const citations = new Set<number>();
+      const normalized = containers.map((c) => {
+        const refs = c.atoms ? normalizer.atoms(c.atoms) : null;
+        refs?.citations.forEach((index) => citations.add(index));
+        return {
+          id: c.container_id,
+          type: c.type,
+          namespace: c.namespace,
+          identifier: c.identifier,
+          version: c.version,
+          data: c.data,
+          ...(refs && { atoms: refs.atoms, citations: refs.citations }),
+          ...(!projected && { contextHash: c.context_hash }),
+          verified: c.is_verified,
+        };
+      });
+      return sendSuccess(res, {
+        normalized: true,
+        tables: normalizer.tables,
+        containers: normalized,
+        citations: [...citations],
+        formatted,
+        tokenCount: estimateTokens(formatted),
+        verified,
+        containerCount: containers.length,
+      });
     }
 
     sendSuccess(res, {
       containers: containers.map((c) => ({
         id: c.container_id,
         type: c.type,
+        namespace: c.namespace,
+        identifier: c.identifier,
+        version: c.version,
         data: c.data,
+        ...(c.atoms && { atoms: c.atoms }),
+        ...(!projected && { contextHash: c.context_hash }),
         verified: c.is_verified,
       })),
       formatted,
+      tokenCount: estimateTokens(formatted),
+      verified,
       containerCount: containers.length,
     });
   })
 );
 
-// Search endpoint
-app.get(
-  "/api/search",
-  asyncHandler(async (req: Request, res: Response) => {
-    const { q, type, namespace, limit = "20", page = "1" } = req.query;
-
-    if (!q || typeof q !== "string") {
-      return sendBadRequest(res, "Search query (q) is required");
-    }
-
-    if (q.length > 200) {
-      return sendBadRequest(res, "Search query too long (max 200 characters)");
-    }
-
-    const limitNum = Math.min(parseInt(limit as string, 10) || 20, 100);
-    const pageNum = Math.max(parseInt(page as string, 10) || 1, 1);
-
-    const result = await containerService.search(q, {
-      type: type as string | undefined,
-      namespace: namespace as string | undefined,
-      limit: limitNum,
-    });
-
-    sendPaginated(res, result.containers, {
-      total: result.total,
-      page: pageNum,
-      limit: limitNum,
-    });
-  })
-);
-
 // Namespaces
 app.get(
   "/api/namespaces",
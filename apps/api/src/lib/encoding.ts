@@ -0,0 +1,174 @@
+/**
+ * Binary Response Encoding
+ *
+ * Clients sending `Accept: application/msgpack` get MessagePack instead of
+ * JSON text. Lowercase hex strings of at least 16 bytes (content hashes,
+ * merkle roots, transaction hashes, commits) are sent as raw bytes in
+ * extension types, which restore them losslessly.
+ */
+
+import { Request, Response, NextFunction, RequestHandler } from "express";
+
+export const MSGPACK_TYPE = "application/msgpack";
+
+/** Extension type of a hex string without prefix */
+export const HEX_EXT = 1;
+/** Extension type of a "0x"-prefixed hex string */
+export const PREFIXED_HEX_EXT = 2;
+
+const HEX_HASH = /^(0x)?((?:[0-9a-f]{2}){16,})$/;
+
+// ===========================================
+// ENCODER
+// ===========================================
+
+// Only encoding is needed server-side, and only for JSON values, so this
+// small writer covers it without a MessagePack dependency.
+
+class Writer {
+  private buffer = Buffer.allocUnsafe(4096);
+  private length = 0;
+
+  private reserve(size: number): number {
+    if (this.length + size > this.buffer.length) {
+      const next = Buffer.allocUnsafe(Math.max(this.buffer.length * 2, this.length + size));
+      this.buffer.copy(next, 0, 0, this.length);
+      this.buffer = next;
+    }
+    const offset = this.length;
+    this.length += size;
+    return offset;
+  }
+
+  u8(value: number): void {
+    this.buffer[this.reserve(1)] = value;
+  }
+
+  head(type: number, size: number, value: number): void {
+    this.u8(type);
+    const offset = this.reserve(size);
+    if (size === 1) this.buffer.writeUInt8(value, offset);
+    else if (size === 2) this.buffer.writeUInt16BE(value, offset);
+    else this.buffer.writeUInt32BE(value, offset);
+  }
+
+  int(type: number, size: number, value: number): void {
+    this.u8(type);
+    const offset = this.reserve(size);
+    if (size === 1) this.buffer.writeInt8(value, offset);
+    else if (size === 2) this.buffer.writeInt16BE(value, offset);
+    else if (size === 4) this.buffer.writeInt32BE(value, offset);
+    else this.buffer.writeBigInt64BE(BigInt(value), offset);
+  }
+
+  float(value: number): void {
+    this.u8(0xcb);
+    this.buffer.writeDoubleBE(value, this.reserve(8));
+  }
+
+  bytes(data: Uint8Array): void {
+    this.buffer.set(data, this.reserve(data.length));
+  }
+
+  string(value: string): void {
+    const size = Buffer.byteLength(value);
+    if (size < 32) this.u8(0xa0 | size);
+    else if (size <= 0xff) this.head(0xd9, 1, size);
+    else if (size <= 0xffff) this.head(0xda, 2, size);
+    else this.head(0xdb, 4, size);
+    this.buffer.write(value, this.reserve(size), size, "utf8");
+  }
+
+  result(): Buffer {
+    return this.buffer.subarray(0, this.length);
+  }
+}
+
+function writeNumber(w: Writer, value: number): void {
+  if (!Number.isSafeInteger(value)) {
+    w.float(value);
+  } else if (value >= 0) {
+    if (value < 0x80) w.u8(value);
+    else if (value <= 0xff) w.head(0xcc, 1, value);
+    else if (value <= 0xffff) w.head(0xcd, 2, value);
+    else if (value <= 0xffffffff) w.head(0xce, 4, value);
+    else w.int(0xd3, 8, value);
+  } else {
+    if (value >= -32) w.u8(value & 0xff);
+    else if (value >= -0x80) w.int(0xd0, 1, value);
+    else if (value >= -0x8000) w.int(0xd1, 2, value);
+    else if (value >= -0x80000000) w.int(0xd2, 4, value);
+    else w.int(0xd3, 8, value);
+  }
+}
+
+function writeHash(w: Writer, type: number, data: Buffer): void {
+  const fixext: Record<number, number> = { 1: 0xd4, 2: 0xd5, 4: 0xd6, 8: 0xd7, 16: 0xd8 };
+  if (fixext[data.length]) w.u8(fixext[data.length]);
+  else if (data.length <= 0xff) w.head(0xc7, 1, data.length);
+  else if (data.length <= 0xffff) w.head(0xc8, 2, data.length);
+  else w.head(0xc9, 4, data.length);
+  w.u8(type);
+  w.bytes(data);
+}
+
+/**
+ * Write a JSON value; hex hashes go out as extension types
+ */
+function writeValue(w: Writer, value: unknown): void {
+  if (value === null || value === undefined) {
+    w.u8(0xc0);
+  } else if (typeof value === "boolean") {
+    w.u8(value ? 0xc3 : 0xc2);
+  } else if (typeof value === "number") {
+    writeNumber(w, value);
+  } else if (typeof value === "string") {
+    const match = value.length >= 32 ? HEX_HASH.exec(value) : null;
+    if (match) {
+      writeHash(w, match[1] ? PREFIXED_HEX_EXT : HEX_EXT, Buffer.from(match[2], "hex"));
+    } else {
+      w.string(value);
+    }
+  } else if (Array.isArray(value)) {
+    if (value.length < 16) w.u8(0x90 | value.length);
+    else if (value.length <= 0xffff) w.head(0xdc, 2, value.length);
+    else w.head(0xdd, 4, value.length);
+    for (const item of value) writeValue(w, item);
+  } else {
+    const entries = Object.entries(value as Record<string, unknown>);
+    if (entries.length < 16) w.u8(0x80 | entries.length);
+    else if (entries.length <= 0xffff) w.head(0xde, 2, entries.length);
+    else w.head(0xdf, 4, entries.length);
+    for (const [key, item] of entries) {
+      w.string(key);
+      writeValue(w, item);
+    }
+  }
+}
+
+/**
+ * Encode a JSON-serializable value as MessagePack
+ */
+export function encodeMsgpack(value: unknown): Uint8Array {
+  // Round-trip through JSON first so toJSON() and undefined behave as in res.json()
+  const plain = value === undefined ? null : JSON.parse(JSON.stringify(value));
+  const writer = new Writer();
+  writeValue(writer, plain);
+  return writer.result();
+}
+
+/**
+ * Answer res.json() with MessagePack when the client prefers it
+ */
+export function negotiateEncoding(): RequestHandler {
+  return (req: Request, res: Response, next: NextFunction) => {
+    res.vary("Accept");
+    if (req.accepts(["application/json", MSGPACK_TYPE]) === MSGPACK_TYPE) {
+      res.json = (body?: unknown) => {
+        res.type(MSGPACK_TYPE);
+        return res.send(Buffer.from(encodeMsgpack(body)));
+      };
+    }
+    next();
+  };
+}
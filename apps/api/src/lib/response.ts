@@ -117,6 +117,25 @@ export function sendPaginated<T>(
   });
 }
 
+/**
+ * Send a keyset-paginated response. Pass meta.nextCursor back as ?cursor=
+ * to get the next page; it is null on the last page.
+ */
+export function sendCursorPaginated<T>(
+  res: Response,
+  data: T[],
+  pagination: { limit: number; nextCursor: string | null }
+): void {
+  res.status(200).json({
+    data,
+    meta: {
+      limit: pagination.limit,
+      hasMore: pagination.nextCursor !== null,
+      nextCursor: pagination.nextCursor,
+    },
+  });
+}
+
 /**
  * Send a created response (201).
  */
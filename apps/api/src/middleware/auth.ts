@@ -95,9 +95,11 @@ export function rateLimit(requestsPerMinute = 60) {
     limit.count++;
 
     if (limit.count > requestsPerMinute) {
+      const retryAfter = Math.ceil((limit.resetAt - now) / 1000);
+      res.setHeader("Retry-After", retryAfter);
       return res.status(429).json({
         error: "Rate limit exceeded",
-        retryAfter: Math.ceil((limit.resetAt - now) / 1000),
+        retryAfter,
       });
     }
 
@@ -0,0 +1,70 @@
+/**
+ * Context artifact routes
+ *
+ * Pre-rendered inject context by hash (migration 014). Inject responses
+ * carry each full container's `contextHash`; artifacts are immutable, so
+ * clients can cache them indefinitely.
+ */
+
+import { Router, Request, Response } from "express";
+import type { Router as IRouter } from "express";
+
+import { sendSuccess, sendBadRequest, sendNotFound, asyncHandler } from "../lib/response.js";
+import { ArtifactService, ContextArtifact, isArtifactFormat } from "../services/artifacts.js";
+
+const MAX_HASHES = 200;
+
+function toResponse(artifact: ContextArtifact) {
+  return {
+    hash: artifact.context_hash,
+    format: artifact.format,
+    content: artifact.content,
+    tokenCount: artifact.token_count,
+  };
+}
+
+export function createArtifactsRouter(artifactService: ArtifactService): IRouter {
+  const router: IRouter = Router();
+
+  /**
+   * GET /artifacts/:hash?format=markdown
+   */
+  router.get("/:hash", asyncHandler(async (req: Request, res: Response) => {
+    const { format = "markdown" } = req.query;
+    if (!isArtifactFormat(format)) {
+      return sendBadRequest(res, "format must be markdown or json");
+    }
+
+    const artifact = (await artifactService.getMany([req.params.hash], format)).get(req.params.hash);
+    if (!artifact) {
+      return sendNotFound(res, "Artifact");
+    }
+
+    res.setHeader("Cache-Control", "public, max-age=31536000, immutable");
+    sendSuccess(res, toResponse(artifact));
+  }));
+
+  /**
+   * POST /artifacts
+   * { hashes: string[], format?: "markdown" | "json" }
+   * Found artifacts in the order of `hashes`; unknown hashes are left out.
+   */
+  router.post("/", asyncHandler(async (req: Request, res: Response) => {
+    const { hashes, format = "markdown" } = req.body;
+    if (!Array.isArray(hashes) || !hashes.every((h) => typeof h === "string")) {
+      return sendBadRequest(res, "hashes array is required");
+    }
+    if (hashes.length > MAX_HASHES) {
+      return sendBadRequest(res, `Maximum ${MAX_HASHES} hashes per request`);
+    }
+    if (!isArtifactFormat(format)) {
+      return sendBadRequest(res, "format must be markdown or json");
+    }
+
+    const found = await artifactService.getMany(hashes, format);
+    const artifacts = hashes.filter((h) => found.has(h)).map((h) => toResponse(found.get(h)!));
+    sendSuccess(res, { artifacts });
+  }));
+
+  return router;
+}
@@ -1,7 +1,8 @@
 /**
  * Batch registration routes
  * 
- * Register multiple containers in a single blockchain batch
+ * Register multiple containers in a single blockchain batch.
+ * Containers of the same namespace are written in a single Git commit.
  */
 
 import { Router } from "express";
@@ -9,6 +10,7 @@ import type { Router as IRouter } from "express";
 import { getBlockchainService, createBatch, verifyProof, hashContent } from "@0711/chain";
 import { GitRepository } from "@0711/git";
 import { requireAuth, AuthenticatedRequest } from "../middleware/auth.js";
+import { broadcastWebhook } from "./webhooks.js";
 
 const router: IRouter = Router();
 
@@ -18,6 +20,22 @@ const gitConfig = {
   authorEmail: "api@gitchain.0711.io",
 };
 
+// Pending write per repository; concurrent batches for the same
+// repository are committed one after another
+const repoLocks = new Map<string, Promise<unknown>>();
+
+function withRepoLock<T>(repoNamespace: string, fn: () => Promise<T>): Promise<T> {
+  const previous = repoLocks.get(repoNamespace) || Promise.resolve();
+  const next = previous.catch(() => undefined).then(fn);
+  repoLocks.set(repoNamespace, next);
+  next.finally(() => {
+    if (repoLocks.get(repoNamespace) === next) {
+      repoLocks.delete(repoNamespace);
+    }
+  }).catch(() => undefined);
+  return next;
+}
+
 interface BatchContainer {
   type: string;
   namespace: string;
@@ -52,43 +70,67 @@ router.post("/", requireAuth, async (req: AuthenticatedRequest, res) => {
       });
     }
 
-    // 1. Write containers to Git
+    // 1. Write containers to Git, one commit per repository
     const results: Array<{
       id: string;
       version: number;
       commitHash: string;
-    }> = [];
-
-    for (const container of containers) {
-      const { type, namespace, identifier, data, meta } = container;
-      const repoNamespace = `${type}/${namespace}`;
-      const repo = new GitRepository(repoNamespace, gitConfig);
-
-      const containerData = {
-        meta: {
-          name: meta?.name || identifier,
-          description: meta?.description,
-          createdAt: new Date().toISOString(),
-          updatedAt: new Date().toISOString(),
-          author: meta?.author || req.user?.email || "api",
-        },
-        data,
-      };
-
-      const hash = await repo.writeContainer(
-        identifier,
-        containerData,
-        message || `Batch update: ${identifier}`
-      );
-      const history = await repo.getHistory(identifier, 1);
-      const version = history.length;
-
-      results.push({
-        id: `0711:${type}:${namespace}:${identifier}:v${version}`,
-        version,
-        commitHash: hash,
-      });
-    }
+    }> = new Array(containers.length);
+
+    const groups = new Map<string, number[]>();
+    containers.forEach((container, index) => {
+      const repoNamespace = `${container.type}/${container.namespace}`;
+      const group = groups.get(repoNamespace);
+      if (group) {
+        group.push(index);
+      } else {
+        groups.set(repoNamespace, [index]);
+      }
+    });
+
+    const now = new Date().toISOString();
+    await Promise.all(
+      Array.from(groups, ([repoNamespace, indexes]) => withRepoLock(repoNamespace, async () => {
+        const repo = new GitRepository(repoNamespace, gitConfig);
+
+        const entries = indexes.map((index) => {
+          const { identifier, data, meta } = containers[index];
+          return {
+            identifier,
+            content: {
+              meta: {
+                name: meta?.name || identifier,
+                description: meta?.description,
+                createdAt: now,
+                updatedAt: now,
+                author: meta?.author || req.user?.email || "api",
+              },
+              data,
+            },
+          };
+        });
+
+        const hash = await repo.writeContainers(
+          entries,
+          message ||
+            (entries.length === 1
+              ? `Batch update: ${entries[0].identifier}`
+              : `Batch update: ${entries.length} containers`)
+        );
+
+        for (const index of indexes) {
+          const { type, namespace, identifier } = containers[index];
+          const history = await repo.getHistory(identifier, 1);
+          const version = history.length;
+
+          results[index] = {
+            id: `0711:${type}:${namespace}:${identifier}:v${version}`,
+            version,
+            commitHash: hash,
+          };
+        }
+      }))
+    );
 
     // 2. Create Merkle tree batch
     const batchContainers = results.map((r, i) => ({
@@ -112,6 +154,14 @@ router.post("/", requireAuth, async (req: AuthenticatedRequest, res) => {
       }
     }
 
+    // Batch containers live in Git with no visibility, so only the
+    // registering user is notified
+    broadcastWebhook([req.user!.id], "batch.registered", {
+      containerIds: results.map((r) => r.id),
+      merkleRoot: batch.merkleRoot,
+      ...(chainResult && { batchId: chainResult.batchId }),
+    });
+
     res.status(201).json({
       success: true,
       containers: results,
@@ -8,6 +8,7 @@
  *   POST /api/chain/certify        — Certify content
  *   GET  /api/chain/certify        — Health + queue status
  *   POST /api/chain/batch          — Create Merkle batch from queue
+ *   POST /api/chain/batch/staged   — Create Merkle batch from import-time leaves
  *   GET  /api/chain/batch          — List all batches
  *   GET  /api/chain/batch/:id      — Get specific batch
  *   POST /api/chain/submit         — Submit batch to Base Mainnet
@@ -27,6 +28,7 @@ import {
   getBlockchainService,
   // Merkle
   createBatch,
+  createBatchFromLeaves,
   getBatchLocal,
   getAllBatches,
   updateBatchStatus,
@@ -39,8 +41,11 @@ import {
   getManifest,
   saveProof,
   getProof,
+  getStagedLeaves,
+  saveStagedBatch,
   getStats,
   logAudit,
+  type ProofRecord,
 } from "@0711/chain";
 
 export function createChainRouter(): Router {
@@ -137,6 +142,7 @@ export function createChainRouter(): Router {
           endpoints: {
             certify: "POST /api/chain/certify",
             batch: "POST /api/chain/batch",
+            stagedBatch: "POST /api/chain/batch/staged",
             submit: "POST /api/chain/submit",
             verify: "GET /api/chain/verify/:hash",
             status: "GET /api/chain/status",
@@ -225,6 +231,69 @@ export function createChainRouter(): Router {
     }
   );
 
+  // ============================================
+  // POST /batch/staged — Create Merkle batch from staged leaves
+  // ============================================
+
+  router.post(
+    "/batch/staged",
+    async (req: Request, res: Response, next: NextFunction) => {
+      try {
+        const limit = Math.min(Math.max(parseInt(req.body?.limit, 10) || 10000, 1), 100000);
+
+        // Leaves were hashed at import time, content is not read again
+        const leaves = await getStagedLeaves(limit);
+        const result = createBatchFromLeaves(leaves);
+
+        if (!result) {
+          return res
+            .status(400)
+            .json({ error: "No staged leaves to batch", stagedLeaves: 0 });
+        }
+
+        // Proofs are keyed by content hash, as for queued manifests
+        const proofs: ProofRecord[] = [];
+        for (const leaf of leaves) {
+          const proof = result.proofs.get(leaf.id);
+          if (!proof) continue;
+          proofs.push({
+            manifestHash: leaf.contentHash,
+            batchId: result.batchId,
+            leafIndex: proof.index,
+            proof: proof.proof,
+          });
+        }
+
+        // Batch, proofs and batched leaves commit together or not at all
+        await saveStagedBatch(
+          {
+            batchId: result.batchId,
+            merkleRoot: result.merkleRoot,
+            itemCount: result.itemCount,
+            status: "pending",
+            network: "base-mainnet",
+          },
+          proofs,
+          leaves.map((leaf) => leaf.rowId)
+        );
+
+        res.json({
+          success: true,
+          batch: {
+            batchId: result.batchId,
+            merkleRoot: result.merkleRoot,
+            itemCount: result.itemCount,
+            containerCount: new Set(leaves.map((leaf) => leaf.containerId)).size,
+            status: "pending",
+          },
+          message: `Batch #${result.batchId} created from ${result.itemCount} staged leaves. Ready for blockchain submission.`,
+        });
+      } catch (err) {
+        next(err);
+      }
+    }
+  );
+
   // ============================================
   // GET /batch — List all batches
   // ============================================
@@ -5,12 +5,30 @@
  * Uses standardized API response format.
  */
 
+import type { TrustLevel } from "@0711/core";
 import { Router, Request, Response } from "express";
-import { ContainerService, CollaboratorRole, ContainerVisibility } from "../services/containers.js";
+import {
+  AtomService,
+  diffAtoms,
+  diffCitations,
+  diffData,
+  isTrustLevel,
+  parseFieldGlobs,
+  projectFields,
+} from "../services/atoms.js";
+import { ArtifactService } from "../services/artifacts.js";
+import {
+  ContainerService,
+  CollaboratorRole,
+  ContainerVisibility,
+  isKeysetColumn,
+  isValidCursor,
+} from "../services/containers.js";
 import {
   sendSuccess,
   sendCreated,
   sendPaginated,
+  sendCursorPaginated,
   sendNoContent,
   sendBadRequest,
   sendUnauthorized,
@@ -18,14 +36,27 @@ import {
   sendNotFound,
   asyncHandler,
 } from "../lib/response.js";
-
-export function createContainersRouter(containerService: ContainerService): Router {
+import { negotiateEncoding } from "../lib/encoding.js";
+import { broadcastWebhook, webhookSubscribers } from "./webhooks.js";
+
+export function createContainersRouter(
+  containerService: ContainerService,
+  atomService?: AtomService,
+  artifactService?: ArtifactService
+): Router {
   const router = Router();
 
+  // Webhook subscribers that can read the container
+  const subscribers = (event: string, containerId: string) =>
+    webhookSubscribers(event, (userId) => containerService.canAccess(containerId, userId));
+
   /**
    * GET /containers
    * List containers with filtering and pagination
    * Respects visibility & access control
+   *
+   * Keyset pagination: pass ?cursor= (empty) for the first page, then
+   * meta.nextCursor. Supported for orderBy=created_at|updated_at.
    */
   router.get("/", asyncHandler(async (req: Request, res: Response) => {
     const user = (req as any).user;
@@ -39,9 +70,42 @@ export function createContainersRouter(containerService: ContainerService): Rout
       page = "1",
       orderBy = "created_at",
       orderDir = "desc",
+      cursor,
+      updatedSince,
     } = req.query;
 
     const limitNum = Math.min(parseInt(limit as string, 10) || 50, 100);
+
+    if (updatedSince !== undefined && (typeof updatedSince !== "string" || isNaN(Date.parse(updatedSince)))) {
+      return sendBadRequest(res, "Invalid updatedSince");
+    }
+
+    if (cursor !== undefined) {
+      if (typeof cursor !== "string" || (cursor && !isValidCursor(cursor))) {
+        return sendBadRequest(res, "Invalid cursor");
+      }
+      if (!isKeysetColumn(orderBy as string)) {
+        return sendBadRequest(res, "Cursor pagination supports orderBy=created_at or updated_at");
+      }
+
+      const result = await containerService.list({
+        type: type as string | undefined,
+        namespace: namespace as string | undefined,
+        search: search as string | undefined,
+        visibility: visibility as ContainerVisibility | undefined,
+        updatedSince: updatedSince as string | undefined,
+        userId: user?.id,
+        limit: limitNum,
+        orderBy: orderBy as string,
+        orderDir: orderDir === "asc" ? "asc" : "desc",
+        cursor: cursor || null,
+      });
+
+      return sendCursorPaginated(res, result.containers, {
+        limit: limitNum,
+        nextCursor: result.nextCursor ?? null,
+      });
+    }
     const offsetNum = parseInt(offset as string, 10) || 0;
     const pageNum = Math.max(parseInt(page as string, 10) || 1, 1);
 
@@ -50,6 +114,7 @@ export function createContainersRouter(containerService: ContainerService): Rout
       namespace: namespace as string | undefined,
       search: search as string | undefined,
       visibility: visibility as ContainerVisibility | undefined,
+      updatedSince: updatedSince as string | undefined,
       userId: user?.id,
       limit: limitNum,
       offset: offsetNum || (pageNum - 1) * limitNum,
@@ -99,13 +164,64 @@ export function createContainersRouter(containerService: ContainerService): Rout
     });
   }));
 
+  /**
+   * POST /containers/bulk
+   * Several containers by container_id ({ ids }, at most 100), each as
+   * `container` in GET /containers/:id. Missing IDs are left out.
+   *
+   * Optional projection like GET /containers/:id: { fields, minTrust }.
+   * Unlike GET /containers/:id and POST /inject, reads are not counted in
+   * the container stats, so replicas can sync through it.
+   * Sent as MessagePack with `Accept: application/msgpack`
+   */
+  router.post("/bulk", negotiateEncoding(), asyncHandler(async (req: Request, res: Response) => {
+    const user = (req as any).user;
+    const { ids, minTrust } = req.body;
+    const fields = parseFieldGlobs(req.body.fields);
+
+    if (!Array.isArray(ids) || ids.length === 0 || !ids.every((id) => typeof id === "string")) {
+      return sendBadRequest(res, "ids must be a non-empty array of container IDs");
+    }
+    if (ids.length > 100) {
+      return sendBadRequest(res, "Maximum 100 containers per request");
+    }
+    if (minTrust !== undefined && !isTrustLevel(minTrust)) {
+      return sendBadRequest(res, "Invalid minTrust");
+    }
+
+    const containers = await containerService.getManyByContainerId(ids, user?.id);
+
+    if (fields || minTrust) {
+      for (const container of containers) {
+        if (fields) container.data = projectFields(container.data, fields);
+        if (atomService) {
+          container.atoms = await atomService.getAllAtoms(container.id, {
+            fields,
+            trustMin: minTrust as TrustLevel | undefined,
+          });
+        }
+      }
+    }
+
+    sendSuccess(res, { containers });
+  }));
+
   /**
    * GET /containers/:id
    * Get single container by ID or container_id
+   *
+   * Optional projection: ?fields=leistung.*,effizienz.cop&minTrust=high
+   * Sent as MessagePack with `Accept: application/msgpack`
    */
-  router.get("/:id", asyncHandler(async (req: Request, res: Response) => {
+  router.get("/:id", negotiateEncoding(), asyncHandler(async (req: Request, res: Response) => {
     const user = (req as any).user;
     const { id } = req.params;
+    const fields = parseFieldGlobs(req.query.fields);
+    const { minTrust } = req.query;
+
+    if (minTrust !== undefined && !isTrustLevel(minTrust)) {
+      return sendBadRequest(res, "Invalid minTrust");
+    }
 
     let container;
 
@@ -120,6 +236,16 @@ export function createContainersRouter(containerService: ContainerService): Rout
       return sendNotFound(res, "Container");
     }
 
+    if (fields || minTrust) {
+      if (fields) container.data = projectFields(container.data, fields);
+      if (atomService) {
+        container.atoms = await atomService.getAllAtoms(container.id, {
+          fields,
+          trustMin: minTrust as TrustLevel | undefined,
+        });
+      }
+    }
+
     // Get user's role
     const role = await containerService.getUserRole(container.id, user?.id);
 
@@ -169,6 +295,15 @@ export function createContainersRouter(containerService: ContainerService): Rout
       userId: user?.id,
     });
 
+    // Pre-render the inject context of the new version
+    await artifactService?.store(container);
+
+    broadcastWebhook(
+      await subscribers("container.created", container.id),
+      "container.created",
+      { containerId: container.container_id }
+    );
+
     sendCreated(res, container);
   }));
 
@@ -208,6 +343,15 @@ export function createContainersRouter(containerService: ContainerService): Rout
       userId: user?.id,
     });
 
+    if (updated) {
+      await artifactService?.store(updated);
+      broadcastWebhook(
+        await subscribers("container.updated", updated.id),
+        "container.updated",
+        { containerId: updated.container_id }
+      );
+    }
+
     sendSuccess(res, updated);
   }));
 
@@ -237,11 +381,16 @@ export function createContainersRouter(containerService: ContainerService): Rout
       return sendForbidden(res, "Owner or admin access required");
     }
 
+    // Resolved first: deleted containers are no longer accessible
+    const recipients = await subscribers("container.deleted", container.id);
+
     const deleted = await containerService.delete(container.id);
     if (!deleted) {
       return sendNotFound(res, "Container");
     }
 
+    broadcastWebhook(recipients, "container.deleted", { containerId: container.container_id });
+
     sendNoContent(res);
   }));
 
@@ -438,6 +587,59 @@ export function createContainersRouter(containerService: ContainerService): Rout
     sendSuccess(res, history);
   }));
 
+  /**
+   * GET /containers/:id/diff?from=3&to=4
+   * Atoms, citations and top-level data changed between two versions of
+   * a container (`to` defaults to the latest version, `from` to the version
+   * before `to`)
+   */
+  router.get("/:id/diff", asyncHandler(async (req: Request, res: Response) => {
+    const user = (req as any).user;
+    const { id } = req.params;
+
+    let container;
+    if (id.startsWith("0711:")) {
+      container = await containerService.getByContainerId(id, user?.id);
+    } else {
+      container = await containerService.getById(id, user?.id);
+    }
+
+    if (!container) {
+      return sendNotFound(res, "Container");
+    }
+
+    const latest = await containerService.getLatestVersion(container.namespace, container.identifier);
+    const toVersion = req.query.to !== undefined ? parseInt(req.query.to as string, 10) : latest;
+    const fromVersion = req.query.from !== undefined ? parseInt(req.query.from as string, 10) : toVersion - 1;
+
+    if (!Number.isInteger(fromVersion) || !Number.isInteger(toVersion) || fromVersion < 1 || toVersion < 1) {
+      return sendBadRequest(res, "from and to must be positive version numbers");
+    }
+
+    const [from, to] = await Promise.all([
+      containerService.getVersion(container, fromVersion, user?.id),
+      containerService.getVersion(container, toVersion, user?.id),
+    ]);
+
+    if (!from || !to) {
+      return sendNotFound(res, "Container version");
+    }
+
+    const [fromAtoms, toAtoms] = atomService
+      ? await Promise.all([atomService.getAllAtoms(from.id), atomService.getAllAtoms(to.id)])
+      : [{}, {}];
+
+    sendSuccess(res, {
+      containerId: to.container_id,
+      fromVersion,
+      toVersion,
+      contentHash: to.content_hash,
+      data: diffData(from.data, to.data),
+      atoms: diffAtoms(fromAtoms, toAtoms),
+      citations: diffCitations(fromAtoms, toAtoms),
+    });
+  }));
+
   /**
    * GET /containers/:id/files
    * List files attached to container
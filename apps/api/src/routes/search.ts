@@ -1,201 +1,103 @@
 /**
  * Search routes
+ *
+ * Full-text search over the container_search index (migration 013), which
+ * triggers keep current on container and atom writes.
  */
 
-import fs from "fs";
-import path from "path";
-
-import { parseContainerId } from "@0711/core";
-import { GitRepository } from "@0711/git";
-import { Router } from "express";
+import { Router, Request, Response } from "express";
 import type { Router as IRouter } from "express";
 
-const router: IRouter = Router();
-
-const gitConfig = {
-  baseDir: process.env.GITCHAIN_DATA_DIR || "/data/gitchain/repos",
-  authorName: "GitChain API",
-  authorEmail: "api@gitchain.0711.io",
-};
-
-interface SearchResult {
-  id: string;
-  type: string;
-  namespace: string;
-  identifier: string;
-  version: number;
-  name: string;
-  score: number;
-  highlights?: string[];
-}
-
-/**
- * GET /search - Search containers
- */
-router.get("/", async (req, res) => {
-  try {
-    const { q, type, namespace, limit = 20, offset = 0 } = req.query;
+import {
+  sendSuccess,
+  sendPaginated,
+  sendCursorPaginated,
+  sendBadRequest,
+  asyncHandler,
+} from "../lib/response.js";
+import { ContainerService, isValidCursor } from "../services/containers.js";
+
+const MAX_QUERY_LENGTH = 200;
+
+export function createSearchRouter(containerService: ContainerService): IRouter {
+  const router: IRouter = Router();
+
+  /**
+   * GET /search?q=
+   * Ranked search over names, identifiers, descriptions, ETIM classes and
+   * atom values. Returns the latest version of each matching container,
+   * with its `score`.
+   *
+   * Keyset pagination: pass ?cursor= (empty) for the first page, then
+   * meta.nextCursor.
+   */
+  router.get("/", asyncHandler(async (req: Request, res: Response) => {
+    const user = (req as any).user;
+    const { q, type, namespace, limit = "20", page = "1", cursor } = req.query;
 
     if (!q || typeof q !== "string") {
-      return res.status(400).json({ error: "Query parameter q required" });
+      return sendBadRequest(res, "Search query (q) is required");
     }
 
-    const query = q.toLowerCase();
-    const results: SearchResult[] = [];
-
-    // Scan through repositories
-    const baseDir = gitConfig.baseDir;
-    if (!fs.existsSync(baseDir)) {
-      return res.json({ results: [], total: 0, query: q });
+    if (q.length > MAX_QUERY_LENGTH) {
+      return sendBadRequest(res, `Search query too long (max ${MAX_QUERY_LENGTH} characters)`);
     }
 
-    const types = type
-      ? [type as string]
-      : fs.readdirSync(baseDir).filter((f) => fs.statSync(path.join(baseDir, f)).isDirectory());
-
-    for (const t of types) {
-      const typeDir = path.join(baseDir, t);
-      if (!fs.existsSync(typeDir)) continue;
-
-      const namespaces = namespace
-        ? [namespace as string]
-        : fs.readdirSync(typeDir).filter((f) => fs.statSync(path.join(typeDir, f)).isDirectory());
-
-      for (const ns of namespaces) {
-        const nsDir = path.join(typeDir, ns);
-        if (!fs.existsSync(nsDir)) continue;
-
-        const files = fs.readdirSync(nsDir).filter((f) => f.endsWith(".json"));
-
-        for (const file of files) {
-          try {
-            const filePath = path.join(nsDir, file);
-            const content = JSON.parse(fs.readFileSync(filePath, "utf-8"));
-            const identifier = file.replace(".json", "");
-
-            // Simple text search in name, description, and data
-            const searchText = JSON.stringify(content).toLowerCase();
-            const name = content.meta?.name || identifier;
-
-            if (searchText.includes(query) || name.toLowerCase().includes(query)) {
-              const repo = new GitRepository(`${t}/${ns}`, gitConfig);
-              const history = await repo.getHistory(identifier, 1);
-              const version = history.length;
-
-              // Calculate simple relevance score
-              let score = 0;
-              if (name.toLowerCase().includes(query)) score += 10;
-              if (identifier.toLowerCase().includes(query)) score += 5;
-              score += (searchText.match(new RegExp(query, "g")) || []).length;
-
-              results.push({
-                id: `0711:${t}:${ns}:${identifier}:v${version}`,
-                type: t,
-                namespace: ns,
-                identifier,
-                version,
-                name,
-                score,
-              });
-            }
-          } catch {
-            // Skip invalid files
-          }
-        }
+    const limitNum = Math.min(parseInt(limit as string, 10) || 20, 100);
+    const filters = {
+      type: type as string | undefined,
+      namespace: namespace as string | undefined,
+      userId: user?.id,
+      limit: limitNum,
+    };
+
+    if (cursor !== undefined) {
+      if (typeof cursor !== "string" || (cursor && !isValidCursor(cursor))) {
+        return sendBadRequest(res, "Invalid cursor");
       }
-    }
 
-    // Sort by score descending
-    results.sort((a, b) => b.score - a.score);
+      const result = await containerService.search(q, { ...filters, cursor: cursor || null });
+      return sendCursorPaginated(res, result.containers, {
+        limit: limitNum,
+        nextCursor: result.nextCursor ?? null,
+      });
+    }
 
-    // Apply pagination
-    const total = results.length;
-    const paged = results.slice(Number(offset), Number(offset) + Number(limit));
+    const pageNum = Math.max(parseInt(page as string, 10) || 1, 1);
+    const result = await containerService.search(q, { ...filters, offset: (pageNum - 1) * limitNum });
 
-    res.json({
-      results: paged,
-      total,
-      query: q,
-      limit: Number(limit),
-      offset: Number(offset),
+    sendPaginated(res, result.containers, {
+      total: result.total,
+      page: pageNum,
+      limit: limitNum,
     });
-  } catch (err: any) {
-    res.status(500).json({ error: err.message });
-  }
-});
+  }));
 
-/**
- * GET /search/suggest - Autocomplete suggestions from database
- */
-router.get("/suggest", async (req, res) => {
-  try {
-    const { q, limit = 10 } = req.query;
+  /**
+   * GET /search/suggest?q=
+   * Autocomplete by word prefix
+   */
+  router.get("/suggest", asyncHandler(async (req: Request, res: Response) => {
+    const user = (req as any).user;
+    const { q, type, namespace, limit = "10" } = req.query;
 
     if (!q || typeof q !== "string" || q.length < 2) {
-      return res.json({ suggestions: [] });
+      return sendSuccess(res, []);
     }
 
-    const limitNum = Math.min(Number(limit) || 10, 20);
-
-    // Search containers by name pattern using database
-    const baseDir = gitConfig.baseDir;
-    const suggestions: Array<{ text: string; type: string; id: string }> = [];
-
-    if (!fs.existsSync(baseDir)) {
-      return res.json({ suggestions: [], query: q });
+    if (q.length > MAX_QUERY_LENGTH) {
+      return sendBadRequest(res, `Search query too long (max ${MAX_QUERY_LENGTH} characters)`);
     }
 
-    const query = q.toLowerCase();
-    const types = fs.readdirSync(baseDir).filter((f) => {
-      try {
-        return fs.statSync(path.join(baseDir, f)).isDirectory();
-      } catch {
-        return false;
-      }
+    const suggestions = await containerService.suggest(q, {
+      type: type as string | undefined,
+      namespace: namespace as string | undefined,
+      userId: user?.id,
+      limit: Math.min(parseInt(limit as string, 10) || 10, 20),
     });
 
-    outer: for (const t of types) {
-      const typeDir = path.join(baseDir, t);
-      if (!fs.existsSync(typeDir)) continue;
-
-      const namespaces = fs.readdirSync(typeDir).filter((f) => {
-        try {
-          return fs.statSync(path.join(typeDir, f)).isDirectory();
-        } catch {
-          return false;
-        }
-      });
-
-      for (const ns of namespaces) {
-        const nsDir = path.join(typeDir, ns);
-        if (!fs.existsSync(nsDir)) continue;
-
-        const files = fs.readdirSync(nsDir).filter((f) => f.endsWith(".json"));
-
-        for (const file of files) {
-          const identifier = file.replace(".json", "");
-          if (identifier.toLowerCase().includes(query) || ns.toLowerCase().includes(query)) {
-            try {
-              const content = JSON.parse(fs.readFileSync(path.join(nsDir, file), "utf-8"));
-              const name = content.meta?.name || identifier;
-              suggestions.push({
-                text: name,
-                type: t,
-                id: `0711:${t}:${ns}:${identifier}`,
-              });
-              if (suggestions.length >= limitNum) break outer;
-            } catch {
-              /* skip */
-            }
-          }
-        }
-      }
-    }
+    sendSuccess(res, suggestions);
+  }));
 
-    res.json({ suggestions, query: q });
-  } catch (err: any) {
-    res.status(500).json({ error: err.message });
-  }
-});
-
-export default router;
+  return router;
+}
@@ -7,6 +7,7 @@ import type { Router as IRouter } from "express";
 import { getBlockchainService } from "@0711/chain";
 import { inject } from "@0711/inject";
 import { validateContainerId, parseContainerId } from "@0711/core";
+import { negotiateEncoding } from "../lib/encoding.js";
 
 const router: IRouter = Router();
 
@@ -68,8 +69,9 @@ router.get("/:hashOrId", async (req, res) => {
 
 /**
  * POST /verify/batch - Verify multiple containers
+ * (MessagePack with `Accept: application/msgpack`)
  */
-router.post("/batch", async (req, res) => {
+router.post("/batch", negotiateEncoding(), async (req, res) => {
   try {
     const { containers } = req.body;
 
@@ -1,5 +1,12 @@
 /**
  * Webhook management routes
+ *
+ * Events and their payloads:
+ *   container.created / .updated / .deleted  { containerId }
+ *   batch.registered                         { containerIds, merkleRoot, batchId? }
+ *
+ * Container events go to every subscriber that can read the container;
+ * batch.registered only to the user who registered the batch.
  */
 
 import { Router } from "express";
@@ -134,4 +141,28 @@ export async function dispatchWebhook(
   }
 }
 
+/**
+ * Users with an enabled webhook for `event` that pass `canReceive`
+ */
+export async function webhookSubscribers(
+  event: string,
+  canReceive: (userId: string) => Promise<boolean> = async () => true
+): Promise<string[]> {
+  const subscribers: string[] = [];
+  for (const [userId, userWebhooks] of webhooks) {
+    if (!userWebhooks.some((w) => w.enabled && w.events.includes(event))) continue;
+    if (await canReceive(userId)) subscribers.push(userId);
+  }
+  return subscribers;
+}
+
+/**
+ * Dispatch an event to several users without holding up the response
+ */
+export function broadcastWebhook(userIds: string[], event: string, payload: unknown): void {
+  for (const userId of userIds) {
+    dispatchWebhook(userId, event, payload).catch(() => undefined);
+  }
+}
+
 export default router;
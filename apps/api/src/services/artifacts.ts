@@ -0,0 +1,228 @@
+/**
+ * GitChain Context Artifact Service
+ *
+ * Pre-renders the inject context (markdown and JSON) of a container when it
+ * is written, keyed by a hash of everything the rendering depends on. A
+ * container version's context never changes, so /api/inject serves stored
+ * fragments and only concatenates them.
+ */
+
+import crypto from "crypto";
+import type { PoolClient } from "pg";
+
+import type { Container } from "./containers.js";
+
+// ===========================================
+// TYPES
+// ===========================================
+
+export type ArtifactFormat = "markdown" | "json";
+
+export const ARTIFACT_FORMATS: ArtifactFormat[] = ["markdown", "json"];
+
+export interface ContextArtifact {
+  context_hash: string;
+  format: ArtifactFormat;
+  content: string;
+  token_count: number;
+}
+
+// Bump when the rendering below changes, so stored artifacts are not reused
+const RENDER_VERSION = 1;
+
+// ===========================================
+// RENDERING
+// ===========================================
+
+export function isArtifactFormat(value: unknown): value is ArtifactFormat {
+  return value === "markdown" || value === "json";
+}
+
+/**
+ * ~4 characters per token, as in @0711/inject
+ */
+export function estimateTokens(text: string): number {
+  return Math.ceil(text.length / 4);
+}
+
+/**
+ * Hash of a container's rendering inputs
+ */
+export function contextHash(c: Container): string {
+  const inputs = [RENDER_VERSION, c.container_id, c.type, c.namespace, c.identifier, c.data, c.atoms ?? null];
+  return crypto.createHash("sha256").update(JSON.stringify(inputs)).digest("hex");
+}
+
+/**
+ * Markdown section of one container; sections are concatenated
+ */
+export function renderMarkdown(c: Container): string {
+  let formatted = `# ${c.data.name || c.identifier}\n\n`;
+  formatted += `**Container ID:** \`${c.container_id}\`\n`;
+  formatted += `**Type:** ${c.type}\n`;
+  formatted += `**Namespace:** ${c.namespace}\n\n`;
+
+  if (c.data.description) {
+    formatted += `## Description\n${c.data.description}\n\n`;
+  }
+
+  if (c.data.specs || c.data.specifications) {
+    formatted += `## Specifications\n`;
+    const specs = c.data.specs || c.data.specifications;
+    for (const [key, value] of Object.entries(specs as Record<string, unknown>)) {
+      formatted += `- **${key}:** ${value}\n`;
+    }
+    formatted += "\n";
+  }
+
+  if (c.atoms && Object.keys(c.atoms).length > 0) {
+    formatted += `## Data\n`;
+    for (const [path, atom] of Object.entries(c.atoms)) {
+      const unit = atom.unit ? ` ${atom.unit}` : "";
+      formatted += `- **${path}:** ${atom.value}${unit} _(${atom.trust})_\n`;
+    }
+    formatted += "\n";
+  }
+
+  formatted += `---\n\n`;
+  return formatted;
+}
+
+/**
+ * JSON array element of one container, indented as in JSON.stringify(array, null, 2)
+ */
+export function renderJSON(c: Container): string {
+  const value = c.atoms ? { ...c.data, atoms: c.atoms } : c.data;
+  return JSON.stringify(value, null, 2)
+    .split("\n")
+    .map((line) => `  ${line}`)
+    .join("\n");
+}
+
+export function renderFragment(c: Container, format: ArtifactFormat): string {
+  return format === "json" ? renderJSON(c) : renderMarkdown(c);
+}
+
+/**
+ * Join fragments into the inject `formatted` output
+ */
+export function joinFragments(fragments: string[], format: ArtifactFormat): string {
+  if (format === "json") {
+    return fragments.length > 0 ? `[\n${fragments.join(",\n")}\n]` : "[]";
+  }
+  return fragments.join("");
+}
+
+// ===========================================
+// DATABASE INTERFACE
+// ===========================================
+
+interface DatabaseConnector {
+  query<T>(sql: string, params?: unknown[]): Promise<T[]>;
+  execute(sql: string, params?: unknown[]): Promise<{ rowCount: number }>;
+}
+
+// ===========================================
+// SERVICE
+// ===========================================
+
+export class ArtifactService {
+  constructor(private db: DatabaseConnector) {}
+
+  /**
+   * Render and store a container's artifacts, and record their hash on the
+   * container row. Returns the hash.
+   */
+  async store(container: Container): Promise<string> {
+    const hash = contextHash(container);
+    for (const format of ARTIFACT_FORMATS) {
+      const content = renderFragment(container, format);
+      await this.db.execute(
+        `INSERT INTO context_artifacts (context_hash, format, content, token_count)
+         VALUES ($1, $2, $3, $4)
+         ON CONFLICT (context_hash, format) DO NOTHING`,
+        [hash, format, content, estimateTokens(content)]
+      );
+    }
+    // Projected containers (atoms set) are rendered but not the row's context
+    if (!container.atoms) {
+      await this.db.execute(
+        "UPDATE containers SET context_hash = $1 WHERE id = $2",
+        [hash, container.id]
+      );
+      container.context_hash = hash;
+    }
+    return hash;
+  }
+
+  /**
+   * Render and store artifacts of the given containers (containers.id) that
+   * have none yet, such as rows an import wrote with plain SQL. Returns how
+   * many were rendered.
+   */
+  async storeMissing(ids: string[]): Promise<number> {
+    if (ids.length === 0) return 0;
+    const containers = await this.db.query<Container>(
+      `SELECT * FROM containers
+       WHERE id = ANY($1) AND context_hash IS NULL AND deleted_at IS NULL`,
+      [ids]
+    );
+    for (const container of containers) {
+      await this.store(container);
+    }
+    return containers.length;
+  }
+
+  /**
+   * Stored artifacts by hash (missing hashes are left out)
+   */
+  async getMany(hashes: string[], format: ArtifactFormat): Promise<Map<string, ContextArtifact>> {
+    if (hashes.length === 0) return new Map();
+    const rows = await this.db.query<ContextArtifact>(
+      `SELECT context_hash, format, content, token_count
+       FROM context_artifacts
+       WHERE context_hash = ANY($1) AND format = $2`,
+      [[...new Set(hashes)], format]
+    );
+    return new Map(rows.map((row) => [row.context_hash, row]));
+  }
+
+  /**
+   * Context fragments of full (unprojected) containers in order, from stored
+   * artifacts where possible. Containers written before artifacts existed
+   * are rendered and stored on first use.
+   */
+  async fragments(containers: Container[], format: ArtifactFormat): Promise<string[]> {
+    const hashes = containers.map((c) => c.context_hash).filter((h): h is string => !!h);
+    const stored = await this.getMany(hashes, format);
+
+    const fragments: string[] = [];
+    for (const container of containers) {
+      const artifact = container.context_hash ? stored.get(container.context_hash) : undefined;
+      if (artifact) {
+        fragments.push(artifact.content);
+      } else {
+        await this.store(container);
+        fragments.push(renderFragment(container, format));
+      }
+    }
+    return fragments;
+  }
+}
+
+/**
+ * ArtifactService on a client inside a transaction, so artifacts commit
+ * together with the container rows they render (imports, bulk loads)
+ */
+export function createArtifactService(client: PoolClient): ArtifactService {
+  return new ArtifactService({
+    query: async <T>(sql: string, params?: unknown[]) => {
+      const r = await client.query(sql, params);
+      return r.rows as T[];
+    },
+    execute: async (sql: string, params?: unknown[]) => {
+      const r = await client.query(sql, params);
+      return { rowCount: r.rowCount || 0 };
+    },
+  });
+}
@@ -21,13 +21,289 @@ import type {
   ProductContainerManifest,
 } from '@0711/core';
 import { SOURCE_TO_TRUST, TRUST_PRIORITY } from '@0711/core';
+import type { LeafStager } from '@0711/chain';
+
+// ============================================================================
+// FIELD PROJECTION
+// ============================================================================
+
+/**
+ * Trust levels at or above `min` (e.g. 'high' -> ['highest', 'high'])
+ */
+export function trustLevelsAtOrAbove(min: TrustLevel): TrustLevel[] {
+  const maxPriority = TRUST_PRIORITY[min];
+  return (Object.keys(TRUST_PRIORITY) as TrustLevel[]).filter(
+    level => TRUST_PRIORITY[level] <= maxPriority
+  );
+}
+
+export function isTrustLevel(value: unknown): value is TrustLevel {
+  return typeof value === 'string' && value in TRUST_PRIORITY;
+}
+
+/**
+ * Parse a `fields` parameter given as an array or comma-separated string
+ */
+export function parseFieldGlobs(value: unknown): string[] | undefined {
+  const list = Array.isArray(value) ? value : typeof value === 'string' ? value.split(',') : [];
+  const fields = list
+    .filter((f): f is string => typeof f === 'string')
+    .map(f => f.trim())
+    .filter(f => f.length > 0);
+  return fields.length > 0 ? fields : undefined;
+}
+
+function isFieldGlob(field: string): boolean {
+  return field.includes('*') || field.includes('?');
+}
+
+/**
+ * Convert a field_path glob ("leistung.*") to a LIKE pattern ("leistung.%")
+ */
+function fieldGlobToLike(glob: string): string {
+  return glob
+    .replace(/[\\%_]/g, c => `\\${c}`)
+    .replace(/\*/g, '%')
+    .replace(/\?/g, '_');
+}
+
+/**
+ * Test a field_path against field globs
+ */
+export function matchesFieldGlobs(fieldPath: string, globs: string[]): boolean {
+  return globs.some(glob => {
+    const regex = glob
+      .replace(/[.+^${}()|[\]\\]/g, '\\$&')
+      .replace(/\*/g, '.*')
+      .replace(/\?/g, '.');
+    return new RegExp(`^${regex}$`).test(fieldPath);
+  });
+}
+
+/**
+ * Project a nested data object onto field globs (matched against dotted paths)
+ */
+export function projectFields(
+  data: Record<string, unknown>,
+  globs: string[],
+  prefix = ''
+): Record<string, unknown> {
+  const result: Record<string, unknown> = {};
+  for (const [key, value] of Object.entries(data)) {
+    const path = prefix ? `${prefix}.${key}` : key;
+    if (matchesFieldGlobs(path, globs)) {
+      result[key] = value;
+    } else if (value && typeof value === 'object' && !Array.isArray(value)) {
+      const nested = projectFields(value as Record<string, unknown>, globs, path);
+      if (Object.keys(nested).length > 0) {
+        result[key] = nested;
+      }
+    }
+  }
+  return result;
+}
+
+// ============================================================================
+// VERSION DIFF
+// ============================================================================
+
+export interface AtomDiff {
+  added: Record<string, DataAtom>;
+  changed: Record<string, DataAtom>;
+  removed: string[];
+}
+
+export interface CitationRef {
+  documentId: string;
+  page?: number;
+  quote?: string;
+}
+
+/**
+ * Atom content relevant to consumers (commit and timestamps change on
+ * every import and are ignored)
+ */
+function atomFingerprint(atom: DataAtom): string {
+  const { value, unit, lang, trust, source, citation, verification } = atom;
+  return JSON.stringify({ value, unit, lang, trust, source, citation, verification });
+}
+
+/**
+ * Added, changed and removed atoms between two versions
+ */
+export function diffAtoms(
+  from: Record<string, DataAtom>,
+  to: Record<string, DataAtom>
+): AtomDiff {
+  const diff: AtomDiff = { added: {}, changed: {}, removed: [] };
+  for (const [path, atom] of Object.entries(to)) {
+    if (!(path in from)) {
+      diff.added[path] = atom;
+    } else if (atomFingerprint(from[path]) !== atomFingerprint(atom)) {
+      diff.changed[path] = atom;
+    }
+  }
+  diff.removed = Object.keys(from).filter(path => !(path in to));
+  return diff;
+}
+
+/**
+ * Top-level data keys set (added or changed) and removed between versions
+ */
+export function diffData(
+  from: Record<string, unknown>,
+  to: Record<string, unknown>
+): { set: Record<string, unknown>; removed: string[] } {
+  const set: Record<string, unknown> = {};
+  for (const [key, value] of Object.entries(to)) {
+    if (JSON.stringify(from[key]) !== JSON.stringify(value)) {
+      set[key] = value;
+    }
+  }
+  return { set, removed: Object.keys(from).filter(key => !(key in to)) };
+}
+
+/**
+ * Distinct citations referenced by atoms, keyed by document and page
+ */
+export function citationsFromAtoms(atoms: Record<string, DataAtom>): Map<string, CitationRef> {
+  const citations = new Map<string, CitationRef>();
+  for (const atom of Object.values(atoms)) {
+    if (!atom.citation) continue;
+    const key = `${atom.citation.document}#${atom.citation.page ?? ''}`;
+    if (!citations.has(key)) {
+      citations.set(key, {
+        documentId: atom.citation.document,
+        page: atom.citation.page,
+        quote: atom.citation.excerpt,
+      });
+    }
+  }
+  return citations;
+}
+
+/**
+ * Citations added and removed between versions
+ */
+export function diffCitations(
+  from: Record<string, DataAtom>,
+  to: Record<string, DataAtom>
+): { added: CitationRef[]; removed: CitationRef[] } {
+  const before = citationsFromAtoms(from);
+  const after = citationsFromAtoms(to);
+  return {
+    added: [...after].filter(([key]) => !before.has(key)).map(([, c]) => c),
+    removed: [...before].filter(([key]) => !after.has(key)).map(([, c]) => c),
+  };
+}
+
+// ============================================================================
+// NORMALIZED PAYLOADS
+// ============================================================================
+
+export interface NormalizedTables {
+  documents: string[];
+  /** `document` is an index into `documents` */
+  citations: Array<{ document: number; page?: number; quote?: string }>;
+  contributors: string[];
+  units: string[];
+  commits: string[];
+}
+
+/**
+ * Moves strings repeated across atoms and containers (document IDs,
+ * citations, contributors, units, commits) into shared tables. Payloads reference
+ * table entries by index.
+ */
+export class PayloadNormalizer {
+  readonly tables: NormalizedTables = { documents: [], citations: [], contributors: [], units: [], commits: [] };
+  private indexes = {
+    documents: new Map<string, number>(),
+    citations: new Map<string, number>(),
+    contributors: new Map<string, number>(),
+    units: new Map<string, number>(),
+    commits: new Map<string, number>(),
+  };
+
+  /**
+   * Atoms with units, contributors, commits and cited documents as table indexes,
+   * and the indexes of the citations they reference
+   */
+  atoms(atoms: Record<string, DataAtom>): { atoms: Record<string, unknown>; citations: number[] } {
+    const normalized: Record<string, unknown> = {};
+    for (const [path, atom] of Object.entries(atoms)) {
+      normalized[path] = {
+        ...atom,
+        unit: atom.unit != null ? this.intern('units', atom.unit) : undefined,
+        source: { ...atom.source, contributor_id: this.intern('contributors', atom.source.contributor_id) },
+        commit: atom.commit != null ? this.intern('commits', atom.commit) : undefined,
+        citation: atom.citation
+          ? { ...atom.citation, document: this.intern('documents', atom.citation.document) }
+          : undefined,
+      };
+    }
+    const citations = [...citationsFromAtoms(atoms).values()].map(ref => this.citation(ref));
+    return { atoms: normalized, citations };
+  }
+
+  citation(ref: CitationRef): number {
+    const key = `${ref.documentId}#${ref.page ?? ''}#${ref.quote ?? ''}`;
+    let index = this.indexes.citations.get(key);
+    if (index === undefined) {
+      index = this.tables.citations.length;
+      this.tables.citations.push({
+        document: this.intern('documents', ref.documentId),
+        page: ref.page ?? undefined,
+        quote: ref.quote ?? undefined,
+      });
+      this.indexes.citations.set(key, index);
+    }
+    return index;
+  }
+
+  private intern(table: 'documents' | 'contributors' | 'units' | 'commits', value: string): number {
+    let index = this.indexes[table].get(value);
+    if (index === undefined) {
+      index = this.tables[table].length;
+      this.tables[table].push(value);
+      this.indexes[table].set(value, index);
+    }
+    return index;
+  }
+}
+
+/**
+ * value_type column of an atom value
+ */
+export function atomValueType(value: unknown): string {
+  if (value === null) return 'null';
+  if (Array.isArray(value)) return 'array';
+  return typeof value;
+}
 
 // ============================================================================
 // ATOM SERVICE
 // ============================================================================
 
 export class AtomService {
-  constructor(private pool: Pool) {}
+  /**
+   * @param stager Hashes written atoms and stages them for the next
+   *   certification batch (importers pass one; the API doesn't)
+   */
+  constructor(private pool: Pool, private stager?: LeafStager) {}
+
+  // Public container IDs by containers.id; leaves are staged under the public ID
+  private containerKeys = new Map<string, string>();
+
+  private async containerKey(containerId: string): Promise<string> {
+    let key = this.containerKeys.get(containerId);
+    if (!key) {
+      const result = await this.pool.query('SELECT container_id FROM containers WHERE id = $1', [containerId]);
+      key = (result.rows[0]?.container_id as string | undefined) ?? containerId;
+      this.containerKeys.set(containerId, key);
+    }
+    return key;
+  }
 
   // --------------------------------------------------------------------------
   // CONTRIBUTORS
@@ -123,7 +399,7 @@ export class AtomService {
     }
   ): Promise<DataAtom<T>> {
     const trustLevel = SOURCE_TO_TRUST[source.type];
-    const valueType = this.getValueType(value);
+    const valueType = atomValueType(value);
     
     const result = await this.pool.query(
       `INSERT INTO container_atoms (
@@ -156,6 +432,16 @@ export class AtomService {
       ]
     );
     
+    this.stager?.stageAtom(await this.containerKey(containerId), {
+      fieldPath,
+      value,
+      layerId: source.layer_id,
+      unit: options?.unit,
+      lang: options?.lang,
+      sourceType: source.type,
+      contributorId: source.contributor_id,
+    });
+    
     return this.rowToAtom<T>(result.rows[0]);
   }
 
@@ -189,7 +475,7 @@ export class AtomService {
             atom.source.layer_id,
             atom.fieldPath,
             JSON.stringify(atom.value),
-            this.getValueType(atom.value),
+            atomValueType(atom.value),
             atom.unit,
             atom.lang,
             atom.source.type,
@@ -206,6 +492,19 @@ export class AtomService {
       }
       
       await client.query('COMMIT');
+      
+      const key = this.stager ? await this.containerKey(containerId) : containerId;
+      for (const atom of atoms) {
+        this.stager?.stageAtom(key, {
+          fieldPath: atom.fieldPath,
+          value: atom.value,
+          layerId: atom.source.layer_id,
+          unit: atom.unit,
+          lang: atom.lang,
+          sourceType: atom.source.type,
+          contributorId: atom.source.contributor_id,
+        });
+      }
       return count;
     } catch (error) {
       await client.query('ROLLBACK');
@@ -216,29 +515,68 @@ export class AtomService {
   }
 
   async getAtom(containerId: string, fieldPath: string): Promise<DataAtom | null> {
-    // Get the winning atom (highest trust level)
+    // The winning atom (highest trust level), resolved on write
     const result = await this.pool.query(
-      `SELECT * FROM container_atoms
-       WHERE container_id = $1 AND field_path = $2 AND is_current = true
-       ORDER BY 
-         CASE trust_level
-           WHEN 'highest' THEN 1
-           WHEN 'high' THEN 2
-           WHEN 'certified' THEN 3
-           WHEN 'verified' THEN 4
-           WHEN 'medium' THEN 5
-           WHEN 'customer' THEN 6
-           WHEN 'generated' THEN 7
-           WHEN 'community' THEN 8
-         END,
-         created_at DESC
-       LIMIT 1`,
+      `SELECT a.* FROM resolved_atoms r
+       JOIN container_atoms a ON a.id = r.atom_id
+       WHERE r.container_id = $1 AND r.field_path = $2`,
       [containerId, fieldPath]
     );
     
     return result.rows[0] ? this.rowToAtom(result.rows[0]) : null;
   }
 
+  /**
+   * The winning atom per field_path, from resolved_atoms (migration 015)
+   *
+   * Same result as merging layers with getAllAtoms(): the winner is the
+   * highest-trust atom, so filtering winners by trustMin or fields keeps
+   * exactly the atoms the merge would return.
+   */
+  async getResolvedAtoms(
+    containerId: string,
+    options?: { trustMin?: TrustLevel; fields?: string[] }
+  ): Promise<Record<string, DataAtom>> {
+    let query = `
+      SELECT a.*
+      FROM resolved_atoms r
+      JOIN container_atoms a ON a.id = r.atom_id
+      WHERE r.container_id = $1
+    `;
+    const params: unknown[] = [containerId];
+    let paramIndex = 2;
+    
+    if (options?.trustMin) {
+      query += ` AND r.trust_level = ANY($${paramIndex++}::trust_level[])`;
+      params.push(trustLevelsAtOrAbove(options.trustMin));
+    }
+    
+    if (options?.fields && options.fields.length > 0) {
+      const exact = options.fields.filter(f => !isFieldGlob(f));
+      const patterns = options.fields.filter(isFieldGlob).map(fieldGlobToLike);
+      const clauses: string[] = [];
+      if (exact.length > 0) {
+        clauses.push(`r.field_path = ANY($${paramIndex++})`);
+        params.push(exact);
+      }
+      if (patterns.length > 0) {
+        clauses.push(`r.field_path LIKE ANY($${paramIndex++})`);
+        params.push(patterns);
+      }
+      query += ` AND (${clauses.join(' OR ')})`;
+    }
+    
+    query += ' ORDER BY r.field_path';
+    
+    const result = await this.pool.query(query, params);
+    
+    const atoms: Record<string, DataAtom> = {};
+    for (const row of result.rows) {
+      atoms[row.field_path] = this.rowToAtom(row);
+    }
+    return atoms;
+  }
+
   async getAllAtoms(
     containerId: string,
     options?: {
@@ -248,6 +586,12 @@ export class AtomService {
       fields?: string[];
     }
   ): Promise<Record<string, DataAtom>> {
+    // Per-layer and verified-only reads can pick a losing atom, so only
+    // they still merge layers here
+    if (!options?.layerId && !options?.verifiedOnly) {
+      return this.getResolvedAtoms(containerId, options);
+    }
+    
     let query = `
       SELECT DISTINCT ON (field_path) *
       FROM container_atoms
@@ -262,12 +606,9 @@ export class AtomService {
     }
     
     if (options?.trustMin) {
-      const maxPriority = TRUST_PRIORITY[options.trustMin];
-      query += ` AND CASE trust_level
-        WHEN 'highest' THEN 1 WHEN 'high' THEN 2 WHEN 'certified' THEN 3
-        WHEN 'verified' THEN 4 WHEN 'medium' THEN 5 WHEN 'customer' THEN 6
-        WHEN 'generated' THEN 7 WHEN 'community' THEN 8 END <= $${paramIndex++}`;
-      params.push(maxPriority);
+      // Plain enum list (not a CASE expression) so idx_atoms_trust is usable
+      query += ` AND trust_level = ANY($${paramIndex++}::trust_level[])`;
+      params.push(trustLevelsAtOrAbove(options.trustMin));
     }
     
     if (options?.verifiedOnly) {
@@ -275,8 +616,21 @@ export class AtomService {
     }
     
     if (options?.fields && options.fields.length > 0) {
-      query += ` AND field_path = ANY($${paramIndex++})`;
-      params.push(options.fields);
+      // idx_atoms_container_field narrows to the container; exact paths also
+      // match on field_path there. LIKE ANY can't become an index range (the
+      // collation isn't C and it's an array), so globs filter those rows.
+      const exact = options.fields.filter(f => !isFieldGlob(f));
+      const patterns = options.fields.filter(isFieldGlob).map(fieldGlobToLike);
+      const clauses: string[] = [];
+      if (exact.length > 0) {
+        clauses.push(`field_path = ANY($${paramIndex++})`);
+        params.push(exact);
+      }
+      if (patterns.length > 0) {
+        clauses.push(`field_path LIKE ANY($${paramIndex++})`);
+        params.push(patterns);
+      }
+      query += ` AND (${clauses.join(' OR ')})`;
     }
     
     query += ` ORDER BY field_path, 
@@ -573,12 +927,6 @@ export class AtomService {
   // HELPERS
   // --------------------------------------------------------------------------
 
-  private getValueType(value: unknown): string {
-    if (value === null) return 'null';
-    if (Array.isArray(value)) return 'array';
-    return typeof value;
-  }
-
   private rowToAtom<T = unknown>(row: Record<string, unknown>): DataAtom<T> {
     return {
       value: row.value as T,
@@ -0,0 +1,541 @@
+/**
+ * 0711-GitChain: Bulk Load Service
+ *
+ * Full catalogue loads. Per-row inserts update every secondary index of
+ * container_atoms (including the GIN index on value) and fire the per-row
+ * count triggers on each write. Instead, atoms and layers are appended to
+ * UNLOGGED staging tables, validated and deduplicated there, and merged
+ * with set-based SQL in one transaction:
+ *
+ *   1. Stage     atoms and layers into staging_atoms_<id> / staging_layers_<id>,
+ *                STAGING_ROWS_PER_INSERT rows per jsonb_populate_recordset
+ *   2. Validate  reject rows with unknown containers, contributors or layers
+ *   3. Dedupe    keep the last row per (container, layer, field_path); drop
+ *                rows equal to the current atom
+ *   4. Merge     upsert layers, insert atoms, supersede the atoms they replace,
+ *                apply layer and contributor counts in one statement each
+ *   5. Render    inject artifacts of loaded containers that have none yet
+ *                (rows written with plain SQL), before the merge commits
+ *
+ * Large loads (rebuildIndexes, by default from REBUILD_THRESHOLD staged
+ * atoms) drop the DEFERRED_INDEXES inside the merge transaction and build
+ * them again before commit. DROP INDEX locks container_atoms against reads
+ * until the load commits, so run those in a maintenance window.
+ */
+
+import crypto from 'crypto';
+import { Pool, PoolClient } from 'pg';
+import type { ContainerLayer, DataAtomCitation, DataAtomSource } from '@0711/core';
+import { SOURCE_TO_TRUST } from '@0711/core';
+import type { LeafStager } from '@0711/chain';
+import { createArtifactService } from './artifacts.js';
+import { atomValueType } from './atoms.js';
+
+// ============================================================================
+// TYPES
+// ============================================================================
+
+export interface BulkAtom {
+  /** containers.id */
+  containerId: string;
+  fieldPath: string;
+  value: unknown;
+  source: DataAtomSource;
+  fieldName?: string;
+  unit?: string;
+  lang?: string;
+  citation?: DataAtomCitation;
+}
+
+export type BulkLayer = Omit<
+  ContainerLayer,
+  'created_at' | 'updated_at' | 'atom_count' | 'verified_count' | 'commit'
+> & {
+  /** containers.id */
+  containerId: string;
+};
+
+export interface BulkLoadOptions {
+  /** Drop and rebuild DEFERRED_INDEXES; 'auto' from REBUILD_THRESHOLD staged atoms */
+  rebuildIndexes?: boolean | 'auto';
+  /** maintenance_work_mem for the index builds */
+  maintenanceWorkMem?: string;
+}
+
+export interface BulkLoadResult {
+  /** Atoms written to staging */
+  staged: number;
+  inserted: number;
+  /** Atoms equal to the current atom of their layer and field */
+  unchanged: number;
+  /** Previous atoms marked is_current = false */
+  superseded: number;
+  /** Dropped atoms and layers by reason */
+  rejected: Record<string, number>;
+  layers: number;
+  /** Containers whose inject artifacts were rendered */
+  artifacts: number;
+  indexesRebuilt: string[];
+  /** Milliseconds per phase */
+  timings: Record<string, number>;
+}
+
+/**
+ * Secondary indexes of container_atoms that nothing in the merge reads.
+ * The primary key, idx_atoms_container_field (merge and resolve lookups)
+ * and the foreign key indexes stay in place.
+ */
+export const DEFERRED_INDEXES = [
+  'idx_atoms_container_current',
+  'idx_atoms_contributor',
+  'idx_atoms_trust',
+  'idx_atoms_source',
+  'idx_atoms_verified',
+  'idx_atoms_citation_doc',
+  'idx_atoms_value',
+];
+
+export const REBUILD_THRESHOLD = 500_000;
+
+// Per-row triggers replaced by set-based updates during the merge
+const ROW_TRIGGERS = ['trigger_layer_counts', 'trigger_verified_counts'];
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// One parameter per statement; large enough that round trips don't dominate
+export const STAGING_ROWS_PER_INSERT = 5000;
+
+/**
+ * Reason a staged atom can't be loaded, checked before staging
+ */
+function atomRejection(atom: BulkAtom): string | null {
+  if (!UUID_PATTERN.test(atom.containerId)) return 'invalid_container_id';
+  if (!atom.fieldPath) return 'missing_field_path';
+  if (atom.value === undefined) return 'missing_value';
+  if (!(atom.source.type in SOURCE_TO_TRUST)) return 'invalid_source_type';
+  const confidence = atom.citation?.confidence;
+  if (confidence !== undefined && !(confidence >= 0 && confidence <= 1)) return 'invalid_confidence';
+  return null;
+}
+
+// ============================================================================
+// BULK LOAD SERVICE
+// ============================================================================
+
+export class BulkLoadService {
+  /**
+   * @param stager Stages the inserted atoms for the next certification batch
+   */
+  constructor(private pool: Pool, private stager?: LeafStager) {}
+
+  async load(
+    layers: Iterable<BulkLayer> | AsyncIterable<BulkLayer>,
+    atoms: Iterable<BulkAtom> | AsyncIterable<BulkAtom>,
+    commitHash: string,
+    options: BulkLoadOptions = {}
+  ): Promise<BulkLoadResult> {
+    const suffix = crypto.randomBytes(6).toString('hex');
+    const stagingAtoms = `staging_atoms_${suffix}`;
+    const stagingLayers = `staging_layers_${suffix}`;
+    const result: BulkLoadResult = {
+      staged: 0,
+      inserted: 0,
+      unchanged: 0,
+      superseded: 0,
+      rejected: {},
+      layers: 0,
+      artifacts: 0,
+      indexesRebuilt: [],
+      timings: {},
+    };
+    const reject = (reason: string, count = 1) => {
+      if (count > 0) result.rejected[reason] = (result.rejected[reason] || 0) + count;
+    };
+
+    const started = performance.now();
+    let phase = started;
+    const lap = (name: string) => {
+      const now = performance.now();
+      result.timings[name] = Math.round(now - phase);
+      phase = now;
+    };
+
+    const client = await this.pool.connect();
+    try {
+      // 1. Stage (outside the merge transaction, so no locks yet)
+      await this.createStaging(client, stagingAtoms, stagingLayers);
+
+      let layerSeq = 0;
+      await this.stageRows(client, stagingLayers, layers, layer => {
+        if (!UUID_PATTERN.test(layer.containerId)) {
+          reject('invalid_layer_container_id');
+          return null;
+        }
+        return {
+          seq: layerSeq++,
+          container_id: layer.containerId,
+          id: layer.id,
+          name: layer.name,
+          type: layer.type,
+          contributor_id: layer.contributor_id,
+          trust_level: layer.trust_level,
+          requires_verification: layer.requires_verification ?? false,
+          schema_version: layer.schema_version,
+          description: layer.description,
+        };
+      });
+
+      await this.stageRows(client, stagingAtoms, atoms, atom => {
+        const rejection = atomRejection(atom);
+        if (rejection) {
+          reject(rejection);
+          return null;
+        }
+        return {
+          seq: result.staged++,
+          container_id: atom.containerId,
+          layer_id: atom.source.layer_id,
+          field_path: atom.fieldPath,
+          field_name: atom.fieldName,
+          value: atom.value,
+          value_type: atomValueType(atom.value),
+          unit: atom.unit,
+          lang: atom.lang,
+          source_type: atom.source.type,
+          contributor_id: atom.source.contributor_id,
+          trust_level: SOURCE_TO_TRUST[atom.source.type],
+          citation_document: atom.citation?.document,
+          citation_page: atom.citation?.page,
+          citation_section: atom.citation?.section,
+          citation_excerpt: atom.citation?.excerpt,
+          citation_confidence: atom.citation?.confidence,
+          citation_method: atom.citation?.method,
+        };
+      });
+      // jsonb_populate_recordset reads a JSON null as SQL NULL; missing values were rejected above
+      await client.query(`UPDATE ${stagingAtoms} SET value = 'null'::jsonb WHERE value IS NULL`);
+      await client.query(`ANALYZE ${stagingLayers}`);
+      await client.query(`ANALYZE ${stagingAtoms}`);
+      lap('staging');
+
+      // 2. Validate and dedupe in staging
+      await this.validate(client, stagingAtoms, stagingLayers, reject);
+      lap('validate');
+
+      // 3. Merge
+      const rebuild = options.rebuildIndexes ?? 'auto';
+      const rebuildIndexes = rebuild === 'auto' ? result.staged >= REBUILD_THRESHOLD : rebuild;
+
+      await client.query('BEGIN');
+      try {
+        for (const trigger of ROW_TRIGGERS) {
+          await client.query(`ALTER TABLE container_atoms DISABLE TRIGGER ${trigger}`);
+        }
+
+        let indexDefs: Array<{ indexname: string; indexdef: string }> = [];
+        if (rebuildIndexes) {
+          const defs = await client.query(
+            `SELECT indexname, indexdef FROM pg_indexes
+             WHERE schemaname = current_schema() AND tablename = 'container_atoms'
+               AND indexname = ANY($1)`,
+            [DEFERRED_INDEXES]
+          );
+          indexDefs = defs.rows;
+          for (const { indexname } of indexDefs) {
+            await client.query(`DROP INDEX ${indexname}`);
+          }
+        }
+
+        await this.merge(client, stagingAtoms, stagingLayers, commitHash, result);
+        lap('merge');
+
+        if (indexDefs.length > 0) {
+          if (options.maintenanceWorkMem) {
+            await client.query(`SET LOCAL maintenance_work_mem = '${options.maintenanceWorkMem.replace(/'/g, '')}'`);
+          }
+          for (const { indexname, indexdef } of indexDefs) {
+            await client.query(indexdef);
+            result.indexesRebuilt.push(indexname);
+          }
+          lap('indexes');
+        }
+
+        for (const trigger of ROW_TRIGGERS) {
+          await client.query(`ALTER TABLE container_atoms ENABLE TRIGGER ${trigger}`);
+        }
+
+        const loaded = await client.query(
+          `SELECT container_id FROM ${stagingLayers} UNION SELECT container_id FROM ${stagingAtoms}`
+        );
+        result.artifacts = await createArtifactService(client).storeMissing(
+          loaded.rows.map(row => row.container_id)
+        );
+        lap('artifacts');
+
+        await client.query('COMMIT');
+      } catch (error) {
+        await client.query('ROLLBACK');
+        throw error;
+      }
+
+      if (result.indexesRebuilt.length > 0) {
+        await client.query('ANALYZE container_atoms');
+      }
+
+      if (this.stager && result.inserted > 0) {
+        await this.stage(client, stagingAtoms);
+        lap('stage');
+      }
+    } finally {
+      await client.query(`DROP TABLE IF EXISTS ${stagingAtoms}, ${stagingLayers}`).catch(() => {});
+      client.release();
+    }
+
+    result.timings.total = Math.round(performance.now() - started);
+    return result;
+  }
+
+  // --------------------------------------------------------------------------
+  // PHASES
+  // --------------------------------------------------------------------------
+
+  private async createStaging(client: PoolClient, stagingAtoms: string, stagingLayers: string): Promise<void> {
+    // No indexes or constraints: staging only appends, validation runs set-based
+    await client.query(
+      `CREATE UNLOGGED TABLE ${stagingAtoms} (
+        seq BIGINT NOT NULL,
+        container_id UUID NOT NULL,
+        layer_id TEXT NOT NULL,
+        field_path TEXT NOT NULL,
+        field_name TEXT,
+        value JSONB,
+        value_type TEXT NOT NULL,
+        unit TEXT,
+        lang TEXT,
+        source_type source_type NOT NULL,
+        contributor_id TEXT NOT NULL,
+        trust_level trust_level NOT NULL,
+        citation_document TEXT,
+        citation_page INTEGER,
+        citation_section TEXT,
+        citation_excerpt TEXT,
+        citation_confidence NUMERIC(4,3),
+        citation_method extraction_method
+      )`
+    );
+    await client.query(
+      `CREATE UNLOGGED TABLE ${stagingLayers} (
+        seq BIGINT NOT NULL,
+        container_id UUID NOT NULL,
+        id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        type source_type NOT NULL,
+        contributor_id TEXT NOT NULL,
+        trust_level trust_level NOT NULL,
+        requires_verification BOOLEAN NOT NULL,
+        schema_version TEXT,
+        description TEXT
+      )`
+    );
+  }
+
+  /**
+   * Append rows to a staging table, STAGING_ROWS_PER_INSERT per statement.
+   * Rows are keyed by column name and typed by the table's row type;
+   * missing keys stage as NULL.
+   */
+  private async stageRows<T>(
+    client: PoolClient,
+    table: string,
+    rows: Iterable<T> | AsyncIterable<T>,
+    encode: (row: T) => Record<string, unknown> | null
+  ): Promise<void> {
+    let chunk: Record<string, unknown>[] = [];
+    const flush = async () => {
+      await client.query(
+        `INSERT INTO ${table} SELECT * FROM jsonb_populate_recordset(NULL::${table}, $1::jsonb)`,
+        [JSON.stringify(chunk)]
+      );
+      chunk = [];
+    };
+
+    for await (const row of rows) {
+      const values = encode(row);
+      if (!values) continue;
+      chunk.push(values);
+      if (chunk.length === STAGING_ROWS_PER_INSERT) await flush();
+    }
+    if (chunk.length > 0) await flush();
+  }
+
+  private async validate(
+    client: PoolClient,
+    stagingAtoms: string,
+    stagingLayers: string,
+    reject: (reason: string, count: number) => void
+  ): Promise<void> {
+    const drop = async (reason: string, sql: string) => {
+      const deleted = await client.query(sql);
+      reject(reason, deleted.rowCount ?? 0);
+    };
+
+    await drop('layer_missing_container', `
+      DELETE FROM ${stagingLayers} s
+      WHERE NOT EXISTS (SELECT 1 FROM containers c WHERE c.id = s.container_id)`);
+    await drop('layer_unknown_contributor', `
+      DELETE FROM ${stagingLayers} s
+      WHERE NOT EXISTS (SELECT 1 FROM contributors c WHERE c.id = s.contributor_id)`);
+    await drop('duplicate_layer', `
+      DELETE FROM ${stagingLayers} s
+      USING (
+        SELECT seq, row_number() OVER (PARTITION BY container_id, id ORDER BY seq DESC) AS n
+        FROM ${stagingLayers}
+      ) d
+      WHERE s.seq = d.seq AND d.n > 1`);
+
+    await drop('missing_container', `
+      DELETE FROM ${stagingAtoms} s
+      WHERE NOT EXISTS (SELECT 1 FROM containers c WHERE c.id = s.container_id)`);
+    await drop('unknown_contributor', `
+      DELETE FROM ${stagingAtoms} s
+      WHERE NOT EXISTS (SELECT 1 FROM contributors c WHERE c.id = s.contributor_id)`);
+    await drop('missing_layer', `
+      DELETE FROM ${stagingAtoms} s
+      WHERE NOT EXISTS (
+          SELECT 1 FROM container_layers l WHERE l.container_id = s.container_id AND l.id = s.layer_id
+        )
+        AND NOT EXISTS (
+          SELECT 1 FROM ${stagingLayers} l WHERE l.container_id = s.container_id AND l.id = s.layer_id
+        )`);
+    // Later rows win, as if the atoms had been written one after another
+    await drop('duplicate', `
+      DELETE FROM ${stagingAtoms} s
+      USING (
+        SELECT seq, row_number() OVER (PARTITION BY container_id, layer_id, field_path ORDER BY seq DESC) AS n
+        FROM ${stagingAtoms}
+      ) d
+      WHERE s.seq = d.seq AND d.n > 1`);
+  }
+
+  private async merge(
+    client: PoolClient,
+    stagingAtoms: string,
+    stagingLayers: string,
+    commitHash: string,
+    result: BulkLoadResult
+  ): Promise<void> {
+    const layers = await client.query(
+      `INSERT INTO container_layers
+         (id, container_id, name, type, contributor_id, trust_level, requires_verification, schema_version, description, commit_hash)
+       SELECT id, container_id, name, type, contributor_id, trust_level, requires_verification, schema_version, description, $1
+       FROM ${stagingLayers}
+       ON CONFLICT (container_id, id) DO UPDATE SET
+         name = EXCLUDED.name,
+         description = EXCLUDED.description,
+         schema_version = EXCLUDED.schema_version,
+         commit_hash = EXCLUDED.commit_hash,
+         updated_at = NOW()`,
+      [commitHash]
+    );
+    result.layers = layers.rowCount ?? 0;
+
+    // Re-imported atoms that match the current one are not written again
+    const unchanged = await client.query(
+      `DELETE FROM ${stagingAtoms} s
+       USING container_atoms a
+       WHERE a.container_id = s.container_id AND a.field_path = s.field_path
+         AND a.layer_id = s.layer_id AND a.is_current
+         AND a.value = s.value
+         AND a.unit IS NOT DISTINCT FROM s.unit
+         AND a.lang IS NOT DISTINCT FROM s.lang
+         AND a.source_type = s.source_type
+         AND a.contributor_id = s.contributor_id`
+    );
+    result.unchanged = unchanged.rowCount ?? 0;
+
+    const merged = await client.query(
+      `WITH previous AS (
+         SELECT s.seq, array_agg(a.id) AS ids
+         FROM ${stagingAtoms} s
+         JOIN container_atoms a
+           ON a.container_id = s.container_id AND a.field_path = s.field_path
+          AND a.layer_id = s.layer_id AND a.is_current
+         GROUP BY s.seq
+       ),
+       inserted AS (
+         INSERT INTO container_atoms (
+           container_id, layer_id, field_path, field_name,
+           value, value_type, unit, lang,
+           source_type, contributor_id, trust_level, commit_hash,
+           citation_document, citation_page, citation_section, citation_excerpt,
+           citation_confidence, citation_method, supersedes
+         )
+         SELECT
+           s.container_id, s.layer_id, s.field_path, s.field_name,
+           s.value, s.value_type, s.unit, s.lang,
+           s.source_type, s.contributor_id, s.trust_level, $1,
+           s.citation_document, s.citation_page, s.citation_section, s.citation_excerpt,
+           s.citation_confidence, s.citation_method, p.ids
+         FROM ${stagingAtoms} s
+         LEFT JOIN previous p ON p.seq = s.seq
+         RETURNING id, supersedes
+       ),
+       superseded AS (
+         UPDATE container_atoms a
+         SET is_current = false, superseded_by = i.id, updated_at = NOW()
+         FROM (SELECT id, unnest(supersedes) AS previous_id FROM inserted) i
+         WHERE a.id = i.previous_id
+         RETURNING a.id
+       )
+       SELECT
+         (SELECT COUNT(*) FROM inserted) AS inserted,
+         (SELECT COUNT(*) FROM superseded) AS superseded`,
+      [commitHash]
+    );
+    result.inserted = parseInt(merged.rows[0].inserted, 10);
+    result.superseded = parseInt(merged.rows[0].superseded, 10);
+
+    // What trigger_layer_counts would have done row by row
+    await client.query(
+      `UPDATE container_layers l
+       SET atom_count = l.atom_count + n.count, updated_at = NOW()
+       FROM (
+         SELECT container_id, layer_id, COUNT(*) AS count
+         FROM ${stagingAtoms} GROUP BY container_id, layer_id
+       ) n
+       WHERE l.container_id = n.container_id AND l.id = n.layer_id`
+    );
+    await client.query(
+      `UPDATE contributors c
+       SET total_contributions = c.total_contributions + n.count, updated_at = NOW()
+       FROM (
+         SELECT contributor_id, COUNT(*) AS count
+         FROM ${stagingAtoms} GROUP BY contributor_id
+       ) n
+       WHERE c.id = n.contributor_id`
+    );
+  }
+
+  /**
+   * Stage the inserted atoms (what is left in staging after the merge)
+   */
+  private async stage(client: PoolClient, stagingAtoms: string): Promise<void> {
+    // Leaves are keyed by the public container ID, not containers.id
+    const rows = await client.query(
+      `SELECT c.container_id, s.field_path, s.value, s.layer_id, s.unit, s.lang, s.source_type, s.contributor_id
+       FROM ${stagingAtoms} s JOIN containers c ON c.id = s.container_id
+       ORDER BY s.seq`
+    );
+    for (const row of rows.rows) {
+      this.stager!.stageAtom(row.container_id, {
+        fieldPath: row.field_path,
+        value: row.value,
+        layerId: row.layer_id,
+        unit: row.unit ?? undefined,
+        lang: row.lang ?? undefined,
+        sourceType: row.source_type,
+        contributorId: row.contributor_id,
+      });
+    }
+  }
+}
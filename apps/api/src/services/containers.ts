@@ -7,6 +7,8 @@
 
 import crypto from "crypto";
 
+import type { DataAtom } from "@0711/core";
+
 // ===========================================
 // TYPES
 // ===========================================
@@ -25,6 +27,8 @@ export interface Container {
   data: Record<string, unknown>;
   meta: Record<string, unknown>;
   content_hash: string | null;
+  // Hash of the pre-rendered inject context (migration 014), null until rendered
+  context_hash?: string | null;
   is_verified: boolean;
   verified_at: Date | null;
   created_by: string | null;
@@ -35,6 +39,8 @@ export interface Container {
   fork_count: number;
   created_at: Date;
   updated_at: Date;
+  // Filtered atoms, only set for projected reads (fields / minTrust)
+  atoms?: Record<string, DataAtom>;
 }
 
 export interface ContainerFile {
@@ -101,11 +107,14 @@ export interface ListContainersOptions {
   namespace?: string;
   search?: string;
   visibility?: ContainerVisibility;
+  updatedSince?: string;  // ISO timestamp, inclusive (incremental sync)
   userId?: string;  // Current user for access control
   limit?: number;
   offset?: number;
   orderBy?: string;
   orderDir?: "asc" | "desc";
+  // Keyset pagination: null for the first page, then the previous nextCursor
+  cursor?: string | null;
 }
 
 export interface ListContainersResult {
@@ -113,6 +122,59 @@ export interface ListContainersResult {
   total: number;
   limit: number;
   offset: number;
+  // Only set for keyset pagination; null on the last page
+  nextCursor?: string | null;
+}
+
+export type SearchContainersOptions = Omit<ListContainersOptions, "search" | "updatedSince" | "orderBy" | "orderDir">;
+
+export type ScoredContainer = Container & { score: number };
+
+export interface SearchContainersResult extends ListContainersResult {
+  containers: ScoredContainer[];
+}
+
+export interface SearchSuggestion {
+  text: string;
+  type: string;
+  id: string;
+}
+
+// Excludes rows superseded by a newer version of the same container
+const LATEST_VERSION_CONDITION = `NOT EXISTS (
+  SELECT 1 FROM containers n
+  WHERE n.namespace = c.namespace AND n.identifier = c.identifier
+    AND n.version > c.version AND n.deleted_at IS NULL
+)`;
+
+// Columns usable for keyset pagination, with their SQL type for the cursor cast
+const KEYSET_COLUMNS: Record<string, string> = {
+  created_at: "timestamptz",
+  updated_at: "timestamptz",
+};
+
+export function isKeysetColumn(column: string): boolean {
+  return column in KEYSET_COLUMNS;
+}
+
+function encodeCursor(value: string, id: string): string {
+  return Buffer.from(JSON.stringify([value, id])).toString("base64url");
+}
+
+export function isValidCursor(cursor: string): boolean {
+  return decodeCursor(cursor) !== null;
+}
+
+function decodeCursor(cursor: string): [string, string] | null {
+  try {
+    const parsed = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"));
+    if (Array.isArray(parsed) && parsed.length === 2 && parsed.every((v) => typeof v === "string")) {
+      return parsed as [string, string];
+    }
+  } catch {
+    // fall through
+  }
+  return null;
 }
 
 // ===========================================
@@ -366,6 +428,17 @@ export class ContainerService {
     return container;
   }
 
+  /**
+   * Get a specific version of the container lineage `container` belongs to
+   */
+  async getVersion(container: Container, version: number, userId?: string | null): Promise<Container | null> {
+    if (version === container.version) return container;
+    return this.getByContainerId(
+      buildContainerId(container.type, container.namespace, container.identifier, version),
+      userId
+    );
+  }
+
   async getByContainerId(containerId: string, userId?: string | null): Promise<Container | null> {
     let container: Container | null = null;
 
@@ -397,19 +470,92 @@ export class ContainerService {
     return container;
   }
 
+  /**
+   * Several containers by container_id, in request order. Missing and
+   * inaccessible IDs are left out; exact IDs are read in one query.
+   */
+  async getManyByContainerId(containerIds: string[], userId?: string | null): Promise<Container[]> {
+    const exact = containerIds.filter((id) => !id.endsWith(":latest"));
+    const rows = exact.length > 0
+      ? await this.db.query<Container>(
+          "SELECT * FROM containers WHERE container_id = ANY($1) AND deleted_at IS NULL",
+          [exact]
+        )
+      : [];
+    const byId = new Map(rows.map((row) => [row.container_id, row]));
+
+    const containers: Container[] = [];
+    for (const id of containerIds) {
+      let container: Container | null | undefined = byId.get(id);
+      if (id.endsWith(":latest")) {
+        container = await this.getByContainerId(id, userId);
+      } else if (container && container.visibility !== "public") {
+        container = (await this.canAccess(container.id, userId || null)) ? container : null;
+      }
+      if (container) containers.push(container);
+    }
+    return containers;
+  }
+
   async list(options: ListContainersOptions = {}): Promise<ListContainersResult> {
     const {
       type,
       namespace,
       search,
       visibility,
+      updatedSince,
       userId,
       limit = 50,
       offset = 0,
       orderBy = "created_at",
       orderDir = "desc",
+      cursor,
     } = options;
 
+    const { conditions, params } = this.accessConditions({ type, namespace, visibility, userId });
+    let paramIndex = params.length + 1;
+
+    if (search) {
+      conditions.push(`(c.data::text ILIKE $${paramIndex++} OR c.identifier ILIKE $${paramIndex++})`);
+      params.push(`%${search}%`, `%${search}%`);
+    }
+
+    if (updatedSince) {
+      conditions.push(`c.updated_at >= $${paramIndex++}::timestamptz`);
+      params.push(updatedSince);
+    }
+
+    if (cursor !== undefined) {
+      return this.listKeyset(conditions, params, paramIndex, { limit, orderBy, orderDir, cursor });
+    }
+
+    const whereClause = conditions.join(" AND ");
+    const orderClause = `c.${orderBy} ${orderDir.toUpperCase()}`;
+
+    // Get total count
+    const countResult = await this.db.queryOne<{ count: string }>(
+      `SELECT COUNT(*) as count FROM containers c WHERE ${whereClause}`,
+      params
+    );
+    const total = parseInt(countResult?.count || "0", 10);
+
+    // Get containers
+    const containers = await this.db.query<Container>(
+      `SELECT c.* FROM containers c WHERE ${whereClause} ORDER BY ${orderClause} LIMIT $${paramIndex++} OFFSET $${paramIndex++}`,
+      [...params, limit, offset]
+    );
+
+    return { containers, total, limit, offset };
+  }
+
+  /**
+   * WHERE conditions shared by listing and search: not deleted, visible to
+   * `userId`, and the type / namespace / visibility filters
+   */
+  private accessConditions(
+    options: Pick<ListContainersOptions, "type" | "namespace" | "visibility" | "userId">
+  ): { conditions: string[]; params: unknown[] } {
+    const { type, namespace, visibility, userId } = options;
     const conditions: string[] = ["c.deleted_at IS NULL"];
     const params: unknown[] = [];
     let paramIndex = 1;
@@ -443,28 +589,58 @@ export class ContainerService {
       params.push(visibility);
     }
 
-    if (search) {
-      conditions.push(`(c.data::text ILIKE $${paramIndex++} OR c.identifier ILIKE $${paramIndex++})`);
-      params.push(`%${search}%`, `%${search}%`);
+    return { conditions, params };
+  }
+
+  /**
+   * Keyset page: seeks past (orderBy, id) of the previous page's last row
+   * instead of OFFSET, so deep pages cost the same as the first one.
+   * Skips the total count (-1) for the same reason.
+   */
+  private async listKeyset(
+    conditions: string[],
+    params: unknown[],
+    paramIndex: number,
+    options: { limit: number; orderBy: string; orderDir: "asc" | "desc"; cursor: string | null }
+  ): Promise<ListContainersResult> {
+    const { limit, orderBy, orderDir, cursor } = options;
+    const sqlType = KEYSET_COLUMNS[orderBy];
+    if (!sqlType) {
+      throw new Error(`Keyset pagination is not supported for orderBy=${orderBy}`);
     }
 
-    const whereClause = conditions.join(" AND ");
-    const orderClause = `c.${orderBy} ${orderDir.toUpperCase()}`;
+    conditions = [...conditions];
+    params = [...params];
+    const dir = orderDir === "asc" ? "ASC" : "DESC";
+
+    if (cursor) {
+      const position = decodeCursor(cursor);
+      if (!position) {
+        throw new Error("Invalid cursor");
+      }
+      const op = dir === "ASC" ? ">" : "<";
+      conditions.push(
+        `(c.${orderBy}, c.id) ${op} ($${paramIndex++}::${sqlType}, $${paramIndex++}::uuid)`
+      );
+      params.push(...position);
+    }
 
-    // Get total count
-    const countResult = await this.db.queryOne<{ count: string }>(
-      `SELECT COUNT(*) as count FROM containers c WHERE ${whereClause}`,
-      params
+    // Fetch one extra row to know whether another page follows
+    const rows = await this.db.query<Container & { cursor_key: string }>(
+      `SELECT c.*, c.${orderBy}::text AS cursor_key FROM containers c
+       WHERE ${conditions.join(" AND ")}
+       ORDER BY c.${orderBy} ${dir}, c.id ${dir}
+       LIMIT $${paramIndex++}`,
+      [...params, limit + 1]
     );
-    const total = parseInt(countResult?.count || "0", 10);
 
-    // Get containers
-    const containers = await this.db.query<Container>(
-      `SELECT c.* FROM containers c WHERE ${whereClause} ORDER BY ${orderClause} LIMIT $${paramIndex++} OFFSET $${paramIndex++}`,
-      [...params, limit, offset]
-    );
+    const hasMore = rows.length > limit;
+    const page = rows.slice(0, limit);
+    const last = page[page.length - 1];
+    const nextCursor = hasMore && last ? encodeCursor(last.cursor_key, last.id) : null;
 
-    return { containers, total, limit, offset };
+    const containers = page.map(({ cursor_key: _cursorKey, ...container }) => container as Container);
+    return { containers, total: -1, limit, offset: 0, nextCursor };
   }
 
   /**
@@ -651,7 +827,100 @@ export class ContainerService {
   // SEARCH
   // ===========================================
 
-  async search(query: string, options: ListContainersOptions = {}): Promise<ListContainersResult> {
-    return this.list({ ...options, search: query });
+  /**
+   * Full-text search over the container_search index (names, identifiers,
+   * descriptions, ETIM classes and current atom values), best match first.
+   * Only the latest version of each container is returned.
+   *
+   * `query` uses web search syntax: words, "quoted phrases", or, -exclude.
+   * With `cursor` (null for the first page) pages by keyset on (score, id)
+   * and skips the total count, like list().
+   */
+  async search(query: string, options: SearchContainersOptions = {}): Promise<SearchContainersResult> {
+    const { limit = 20, offset = 0, cursor } = options;
+    const { conditions, params } = this.accessConditions(options);
+    let paramIndex = params.length + 1;
+
+    const tsquery = `websearch_to_tsquery('simple', $${paramIndex++})`;
+    params.push(query);
+    conditions.push(`cs.document @@ ${tsquery}`);
+    conditions.push(LATEST_VERSION_CONDITION);
+
+    const ranked = `SELECT c.*, ts_rank_cd(cs.document, ${tsquery}) AS score
+      FROM containers c JOIN container_search cs ON cs.container_id = c.id
+      WHERE ${conditions.join(" AND ")}`;
+
+    if (cursor === undefined) {
+      const countResult = await this.db.queryOne<{ count: string }>(
+        `SELECT COUNT(*) as count
+         FROM containers c JOIN container_search cs ON cs.container_id = c.id
+         WHERE ${conditions.join(" AND ")}`,
+        params
+      );
+      const containers = await this.db.query<ScoredContainer>(
+        `SELECT * FROM (${ranked}) r ORDER BY r.score DESC, r.id DESC
+         LIMIT $${paramIndex++} OFFSET $${paramIndex++}`,
+        [...params, limit, offset]
+      );
+      return { containers, total: parseInt(countResult?.count || "0", 10), limit, offset };
+    }
+
+    let seek = "";
+    const seekParams: unknown[] = [];
+    if (cursor) {
+      const position = decodeCursor(cursor);
+      if (!position) {
+        throw new Error("Invalid cursor");
+      }
+      seek = `WHERE (r.score, r.id) < ($${paramIndex++}::real, $${paramIndex++}::uuid)`;
+      seekParams.push(...position);
+    }
+
+    // Fetch one extra row to know whether another page follows
+    const rows = await this.db.query<ScoredContainer & { cursor_key: string }>(
+      `SELECT r.*, r.score::text AS cursor_key FROM (${ranked}) r
+       ${seek}
+       ORDER BY r.score DESC, r.id DESC
+       LIMIT $${paramIndex++}`,
+      [...params, ...seekParams, limit + 1]
+    );
+
+    const hasMore = rows.length > limit;
+    const page = rows.slice(0, limit);
+    const last = page[page.length - 1];
+    const nextCursor = hasMore && last ? encodeCursor(last.cursor_key, last.id) : null;
+
+    const containers = page.map(({ cursor_key: _cursorKey, ...container }) => container as ScoredContainer);
+    return { containers, total: -1, limit, offset: 0, nextCursor };
+  }
+
+  /**
+   * Autocomplete: containers whose indexed words start with the words of
+   * `prefix` (the last one may be incomplete)
+   */
+  async suggest(
+    prefix: string,
+    options: Pick<ListContainersOptions, "type" | "namespace" | "userId" | "limit"> = {}
+  ): Promise<SearchSuggestion[]> {
+    const words = prefix.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+    if (words.length === 0) return [];
+
+    const { conditions, params } = this.accessConditions(options);
+    let paramIndex = params.length + 1;
+
+    // Words were reduced to letters and digits, so the tsquery can't be malformed
+    const tsquery = `to_tsquery('simple', $${paramIndex++})`;
+    params.push(words.map((w) => `${w}:*`).join(" & "));
+    conditions.push(`cs.document @@ ${tsquery}`);
+    conditions.push(LATEST_VERSION_CONDITION);
+
+    return this.db.query<SearchSuggestion>(
+      `SELECT coalesce(c.data->>'name', c.identifier) AS text, c.type, c.container_id AS id
+       FROM containers c JOIN container_search cs ON cs.container_id = c.id
+       WHERE ${conditions.join(" AND ")}
+       ORDER BY ts_rank_cd(cs.document, ${tsquery}) DESC, c.id DESC
+       LIMIT $${paramIndex++}`,
+      [...params, options.limit ?? 10]
+    );
   }
 }
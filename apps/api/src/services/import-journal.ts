@@ -0,0 +1,191 @@
+/**
+ * 0711-GitChain: Import Journal
+ *
+ * Checkpointed catalogue imports (migration 016). Records are written in
+ * batches, one transaction per batch: the containers, a journal row per
+ * record with its content hash, and the run's checkpoint commit together.
+ * After a crash, the same run resumes after its checkpoint and re-imports
+ * only the batch that was in flight. Records whose journaled hash matches
+ * are skipped, so re-runs and nightly loads only write what changed.
+ */
+
+import { Pool, PoolClient } from 'pg';
+
+// ============================================================================
+// TYPES
+// ============================================================================
+
+export type ImportRunStatus = 'running' | 'completed' | 'failed';
+
+export interface ImportRun {
+  id: string;
+  source: string;
+  status: ImportRunStatus;
+  /** Source key of the last committed batch; resume after it */
+  checkpoint: string | null;
+  /** true when an unfinished run with this id was picked up again */
+  resumed: boolean;
+  batches: number;
+  imported: number;
+  skipped: number;
+  failed: number;
+}
+
+export interface JournalRecord<T> {
+  /** Stable source key (e.g. supplier_pid); batches are in key order */
+  key: string;
+  /** Hash of everything the import writes for this record */
+  contentHash: string;
+  record: T;
+}
+
+/**
+ * Writes one record inside the batch transaction and returns the
+ * containers.id it imported into
+ */
+export type RecordWriter<T> = (client: PoolClient, record: T) => Promise<string>;
+
+export interface BatchResult {
+  imported: number;
+  skipped: number;
+  failed: number;
+  errors: Array<{ key: string; message: string }>;
+}
+
+// ============================================================================
+// IMPORT JOURNAL
+// ============================================================================
+
+export class ImportJournal {
+  constructor(private pool: Pool) {}
+
+  /**
+   * Start a run, or resume it if a run with this id did not complete
+   */
+  async begin(source: string, runId: string): Promise<ImportRun> {
+    const existing = await this.pool.query('SELECT * FROM import_runs WHERE id = $1', [runId]);
+    if (existing.rows[0]) {
+      if (existing.rows[0].status === 'completed') {
+        throw new Error(`Import run ${runId} already completed`);
+      }
+      const resumed = await this.pool.query(
+        `UPDATE import_runs SET status = 'running', error = NULL, finished_at = NULL, updated_at = NOW()
+         WHERE id = $1 RETURNING *`,
+        [runId]
+      );
+      return this.rowToRun(resumed.rows[0], true);
+    }
+
+    const created = await this.pool.query(
+      'INSERT INTO import_runs (id, source) VALUES ($1, $2) RETURNING *',
+      [runId, source]
+    );
+    return this.rowToRun(created.rows[0], false);
+  }
+
+  /**
+   * Import one batch in a single transaction and advance the checkpoint.
+   *
+   * A record that fails is rolled back to its savepoint, counted and left
+   * out of the journal, so the next run retries it; the rest of the batch
+   * still commits.
+   */
+  async importBatch<T>(
+    run: ImportRun,
+    records: JournalRecord<T>[],
+    write: RecordWriter<T>
+  ): Promise<BatchResult> {
+    const result: BatchResult = { imported: 0, skipped: 0, failed: 0, errors: [] };
+    if (records.length === 0) return result;
+
+    const journaled = await this.pool.query(
+      `SELECT source_key, content_hash FROM import_journal
+       WHERE source = $1 AND source_key = ANY($2) AND container_id IS NOT NULL`,
+      [run.source, records.map(r => r.key)]
+    );
+    const hashes = new Map<string, string>(journaled.rows.map(row => [row.source_key, row.content_hash]));
+
+    const client = await this.pool.connect();
+    try {
+      await client.query('BEGIN');
+
+      for (const { key, contentHash, record } of records) {
+        if (hashes.get(key) === contentHash) {
+          result.skipped++;
+          continue;
+        }
+
+        await client.query('SAVEPOINT journal_record');
+        try {
+          const containerId = await write(client, record);
+          await client.query(
+            `INSERT INTO import_journal (source, source_key, content_hash, container_id, run_id)
+             VALUES ($1, $2, $3, $4, $5)
+             ON CONFLICT (source, source_key) DO UPDATE SET
+               content_hash = EXCLUDED.content_hash,
+               container_id = EXCLUDED.container_id,
+               run_id = EXCLUDED.run_id,
+               imported_at = NOW()`,
+            [run.source, key, contentHash, containerId, run.id]
+          );
+          await client.query('RELEASE SAVEPOINT journal_record');
+          result.imported++;
+        } catch (error) {
+          await client.query('ROLLBACK TO SAVEPOINT journal_record');
+          result.failed++;
+          result.errors.push({ key, message: error instanceof Error ? error.message : String(error) });
+        }
+      }
+
+      const checkpoint = records[records.length - 1].key;
+      await client.query(
+        `UPDATE import_runs SET
+           checkpoint = $2,
+           batches = batches + 1,
+           imported = imported + $3,
+           skipped = skipped + $4,
+           failed = failed + $5,
+           updated_at = NOW()
+         WHERE id = $1`,
+        [run.id, checkpoint, result.imported, result.skipped, result.failed]
+      );
+
+      await client.query('COMMIT');
+
+      run.checkpoint = checkpoint;
+      run.batches++;
+      run.imported += result.imported;
+      run.skipped += result.skipped;
+      run.failed += result.failed;
+      return result;
+    } catch (error) {
+      await client.query('ROLLBACK');
+      throw error;
+    } finally {
+      client.release();
+    }
+  }
+
+  async finish(run: ImportRun, error?: unknown): Promise<void> {
+    run.status = error ? 'failed' : 'completed';
+    await this.pool.query(
+      `UPDATE import_runs SET status = $2, error = $3, updated_at = NOW(), finished_at = NOW()
+       WHERE id = $1`,
+      [run.id, run.status, error ? (error instanceof Error ? error.message : String(error)) : null]
+    );
+  }
+
+  private rowToRun(row: Record<string, unknown>, resumed: boolean): ImportRun {
+    return {
+      id: row.id as string,
+      source: row.source as string,
+      status: row.status as ImportRunStatus,
+      checkpoint: row.checkpoint as string | null,
+      resumed,
+      batches: row.batches as number,
+      imported: row.imported as number,
+      skipped: row.skipped as number,
+      failed: row.failed as number,
+    };
+  }
+}
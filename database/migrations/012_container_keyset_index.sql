@@ -0,0 +1,12 @@
+-- GitChain Migration 012: Keyset pagination indexes for container listing
+-- GET /api/containers?cursor= seeks on (created_at|updated_at, id) instead of OFFSET
+
+CREATE INDEX IF NOT EXISTS idx_containers_created_keyset
+    ON containers(created_at, id) WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_containers_updated_keyset
+    ON containers(updated_at, id) WHERE deleted_at IS NULL;
+
+-- Namespace-scoped sync jobs
+CREATE INDEX IF NOT EXISTS idx_containers_namespace_created_keyset
+    ON containers(namespace, created_at, id) WHERE deleted_at IS NULL;
@@ -0,0 +1,116 @@
+-- GitChain Migration 013: Full-text search index for containers
+-- GET /api/search matches container_search (GIN over tsvector) instead of
+-- scanning repositories or ILIKE over data::text. Rows are kept current by
+-- triggers on containers and container_atoms.
+--
+-- Weights: A = name, identifier
+--          B = description, ETIM class code and name
+--          C = current atom values
+
+CREATE TABLE IF NOT EXISTS container_search (
+    container_id UUID PRIMARY KEY REFERENCES containers(id) ON DELETE CASCADE,
+    document tsvector NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_container_search_document
+    ON container_search USING GIN (document);
+
+-- ----------------------------------------------------------------------------
+-- BUILD
+-- ----------------------------------------------------------------------------
+
+-- 'simple' config: product data is multilingual and full of model numbers,
+-- so no stemming or stop words
+CREATE OR REPLACE FUNCTION container_search_document(
+    p_id UUID,
+    p_identifier TEXT,
+    p_data JSONB,
+    p_description TEXT
+) RETURNS tsvector AS $$
+    SELECT
+        setweight(to_tsvector('simple', coalesce(p_data->>'name', '') || ' ' || coalesce(p_identifier, '')), 'A') ||
+        setweight(to_tsvector('simple', concat_ws(' ',
+            p_description,
+            p_data->>'description',
+            p_data->>'etim_class',
+            p_data->>'etim_class_name',
+            p_data->'etim'->>'class_code',
+            p_data->'etim'->>'class_name',
+            p_data->'classification'->'etim'->>'class_code',
+            p_data->'classification'->'etim'->>'class_name'
+        )), 'B') ||
+        setweight(to_tsvector('simple', coalesce((
+            SELECT string_agg(
+                CASE jsonb_typeof(a.value) WHEN 'string' THEN a.value #>> '{}' ELSE a.value::text END,
+                ' '
+            )
+            FROM container_atoms a
+            WHERE a.container_id = p_id AND a.is_current
+        ), '')), 'C')
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION refresh_container_search(p_ids UUID[]) RETURNS void AS $$
+    INSERT INTO container_search (container_id, document, updated_at)
+    SELECT c.id, container_search_document(c.id, c.identifier, c.data, c.description), NOW()
+    FROM containers c
+    WHERE c.id = ANY(p_ids)
+    ON CONFLICT (container_id) DO UPDATE
+    SET document = EXCLUDED.document, updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql;
+
+-- ----------------------------------------------------------------------------
+-- TRIGGERS
+-- ----------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION update_container_search() RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM refresh_container_search(ARRAY[NEW.id]);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS containers_search ON containers;
+CREATE TRIGGER containers_search
+AFTER INSERT OR UPDATE OF data, identifier, description ON containers
+FOR EACH ROW EXECUTE FUNCTION update_container_search();
+
+-- Atom writes come in bulk (imports, certification), so rebuild once per
+-- statement and container rather than once per atom row
+CREATE OR REPLACE FUNCTION update_container_search_from_atoms() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    PERFORM refresh_container_search(ARRAY(SELECT DISTINCT container_id FROM old_atoms));
+  ELSE
+    PERFORM refresh_container_search(ARRAY(SELECT DISTINCT container_id FROM new_atoms));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS container_atoms_search_insert ON container_atoms;
+CREATE TRIGGER container_atoms_search_insert
+AFTER INSERT ON container_atoms
+REFERENCING NEW TABLE AS new_atoms
+FOR EACH STATEMENT EXECUTE FUNCTION update_container_search_from_atoms();
+
+DROP TRIGGER IF EXISTS container_atoms_search_update ON container_atoms;
+CREATE TRIGGER container_atoms_search_update
+AFTER UPDATE ON container_atoms
+REFERENCING NEW TABLE AS new_atoms
+FOR EACH STATEMENT EXECUTE FUNCTION update_container_search_from_atoms();
+
+DROP TRIGGER IF EXISTS container_atoms_search_delete ON container_atoms;
+CREATE TRIGGER container_atoms_search_delete
+AFTER DELETE ON container_atoms
+REFERENCING OLD TABLE AS old_atoms
+FOR EACH STATEMENT EXECUTE FUNCTION update_container_search_from_atoms();
+
+-- ----------------------------------------------------------------------------
+-- BACKFILL
+-- ----------------------------------------------------------------------------
+
+INSERT INTO container_search (container_id, document)
+SELECT c.id, container_search_document(c.id, c.identifier, c.data, c.description)
+FROM containers c
+ON CONFLICT (container_id) DO NOTHING;
@@ -0,0 +1,36 @@
+-- GitChain Migration 014: Pre-rendered inject context
+-- The markdown and JSON context of a container is rendered when it is
+-- written and stored by a hash of its rendering inputs. POST /api/inject
+-- concatenates stored fragments instead of formatting on every call.
+
+CREATE TABLE IF NOT EXISTS context_artifacts (
+    context_hash TEXT NOT NULL,
+    format TEXT NOT NULL,
+    content TEXT NOT NULL,
+    token_count INTEGER NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (context_hash, format)
+);
+
+-- Artifacts of the container's current content; NULL until rendered
+ALTER TABLE containers ADD COLUMN IF NOT EXISTS context_hash TEXT;
+
+-- Writes that bypass the API (imports, SQL) must not keep serving the old
+-- context: clear the hash, the next inject renders and stores it again
+CREATE OR REPLACE FUNCTION reset_container_context_hash() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.context_hash := NULL;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS containers_context_hash ON containers;
+CREATE TRIGGER containers_context_hash
+BEFORE UPDATE OF data, container_id, type, namespace, identifier ON containers
+FOR EACH ROW
+WHEN (OLD.data IS DISTINCT FROM NEW.data
+   OR OLD.container_id IS DISTINCT FROM NEW.container_id
+   OR OLD.type IS DISTINCT FROM NEW.type
+   OR OLD.namespace IS DISTINCT FROM NEW.namespace
+   OR OLD.identifier IS DISTINCT FROM NEW.identifier)
+EXECUTE FUNCTION reset_container_context_hash();
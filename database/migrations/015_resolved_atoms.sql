@@ -0,0 +1,110 @@
+-- GitChain Migration 015: Resolved atom view
+-- One row per (container, field_path) pointing at the winning current atom
+-- across layers: highest trust_level, then newest. Reads join it to
+-- container_atoms instead of running DISTINCT ON over every layer.
+-- Statement-level triggers keep it current for the fields each write touches.
+
+CREATE TABLE IF NOT EXISTS resolved_atoms (
+    container_id UUID NOT NULL REFERENCES containers(id) ON DELETE CASCADE,
+    field_path TEXT NOT NULL,
+    atom_id UUID NOT NULL REFERENCES container_atoms(id) ON DELETE CASCADE,
+    trust_level trust_level NOT NULL,
+    resolved_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (container_id, field_path)
+);
+
+CREATE INDEX IF NOT EXISTS idx_resolved_atoms_atom ON resolved_atoms(atom_id);
+
+-- ----------------------------------------------------------------------------
+-- RESOLVE
+-- ----------------------------------------------------------------------------
+
+-- trust_level enum values are declared highest first, so they sort by priority
+CREATE OR REPLACE FUNCTION resolve_atoms(p_container_ids UUID[], p_field_paths TEXT[]) RETURNS void AS $$
+    DELETE FROM resolved_atoms r
+    USING unnest(p_container_ids, p_field_paths) AS f(container_id, field_path)
+    WHERE r.container_id = f.container_id AND r.field_path = f.field_path;
+
+    INSERT INTO resolved_atoms (container_id, field_path, atom_id, trust_level, resolved_at)
+    SELECT DISTINCT ON (a.container_id, a.field_path)
+        a.container_id, a.field_path, a.id, a.trust_level, NOW()
+    FROM container_atoms a
+    JOIN (
+        SELECT DISTINCT container_id, field_path
+        FROM unnest(p_container_ids, p_field_paths) AS t(container_id, field_path)
+    ) f ON a.container_id = f.container_id AND a.field_path = f.field_path
+    WHERE a.is_current
+    ORDER BY a.container_id, a.field_path, a.trust_level, a.created_at DESC
+    -- A concurrent write may have resolved the same field meanwhile
+    ON CONFLICT (container_id, field_path) DO UPDATE
+    SET atom_id = EXCLUDED.atom_id,
+        trust_level = EXCLUDED.trust_level,
+        resolved_at = EXCLUDED.resolved_at;
+$$ LANGUAGE sql;
+
+-- Every field of the given containers (backfill, bulk loads)
+CREATE OR REPLACE FUNCTION resolve_container_atoms(p_container_ids UUID[]) RETURNS void AS $$
+    SELECT resolve_atoms(array_agg(container_id), array_agg(field_path))
+    FROM (
+        SELECT DISTINCT container_id, field_path
+        FROM container_atoms
+        WHERE container_id = ANY(p_container_ids)
+        UNION
+        SELECT container_id, field_path
+        FROM resolved_atoms
+        WHERE container_id = ANY(p_container_ids)
+    ) f;
+$$ LANGUAGE sql;
+
+-- ----------------------------------------------------------------------------
+-- TRIGGERS
+-- ----------------------------------------------------------------------------
+
+-- Imports insert atoms in bulk, so resolve once per statement for the
+-- fields it touched rather than once per atom row
+CREATE OR REPLACE FUNCTION update_resolved_atoms() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM resolve_atoms(
+      ARRAY(SELECT container_id FROM new_atoms), ARRAY(SELECT field_path FROM new_atoms));
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM resolve_atoms(
+      ARRAY(SELECT container_id FROM old_atoms), ARRAY(SELECT field_path FROM old_atoms));
+  ELSE
+    -- Updates can move an atom to another field or change its trust
+    PERFORM resolve_atoms(
+      ARRAY(SELECT container_id FROM new_atoms UNION ALL SELECT container_id FROM old_atoms),
+      ARRAY(SELECT field_path FROM new_atoms UNION ALL SELECT field_path FROM old_atoms));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS container_atoms_resolve_insert ON container_atoms;
+CREATE TRIGGER container_atoms_resolve_insert
+AFTER INSERT ON container_atoms
+REFERENCING NEW TABLE AS new_atoms
+FOR EACH STATEMENT EXECUTE FUNCTION update_resolved_atoms();
+
+DROP TRIGGER IF EXISTS container_atoms_resolve_update ON container_atoms;
+CREATE TRIGGER container_atoms_resolve_update
+AFTER UPDATE ON container_atoms
+REFERENCING OLD TABLE AS old_atoms NEW TABLE AS new_atoms
+FOR EACH STATEMENT EXECUTE FUNCTION update_resolved_atoms();
+
+DROP TRIGGER IF EXISTS container_atoms_resolve_delete ON container_atoms;
+CREATE TRIGGER container_atoms_resolve_delete
+AFTER DELETE ON container_atoms
+REFERENCING OLD TABLE AS old_atoms
+FOR EACH STATEMENT EXECUTE FUNCTION update_resolved_atoms();
+
+-- ----------------------------------------------------------------------------
+-- BACKFILL
+-- ----------------------------------------------------------------------------
+
+INSERT INTO resolved_atoms (container_id, field_path, atom_id, trust_level)
+SELECT DISTINCT ON (container_id, field_path) container_id, field_path, id, trust_level
+FROM container_atoms
+WHERE is_current
+ORDER BY container_id, field_path, trust_level, created_at DESC
+ON CONFLICT (container_id, field_path) DO NOTHING;
@@ -0,0 +1,41 @@
+-- GitChain Migration 016: Import journal
+-- Catalogue imports commit one batch of containers per transaction, together
+-- with a journal row per container (source key + content hash) and the run's
+-- checkpoint. A crash loses only the in-flight batch: re-runs resume after
+-- the checkpoint and skip containers whose journaled hash is unchanged.
+
+CREATE TABLE IF NOT EXISTS import_runs (
+    id TEXT PRIMARY KEY,                          -- "bosch-pim:2026-10-19"
+    source TEXT NOT NULL,                         -- "bosch-pim"
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'completed', 'failed')),
+
+    -- Last source key of the last committed batch
+    checkpoint TEXT,
+
+    batches INTEGER NOT NULL DEFAULT 0,
+    imported INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+
+    started_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_import_runs_source ON import_runs(source, started_at DESC);
+
+-- One row per source record that is fully imported. Rows are written in the
+-- same transaction as the container, so a row means the container matches
+-- content_hash; a deleted container clears container_id and is imported again.
+CREATE TABLE IF NOT EXISTS import_journal (
+    source TEXT NOT NULL,
+    source_key TEXT NOT NULL,                     -- e.g. supplier_pid
+    content_hash TEXT NOT NULL,
+    container_id UUID REFERENCES containers(id) ON DELETE SET NULL,
+    run_id TEXT REFERENCES import_runs(id) ON DELETE SET NULL,
+    imported_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (source, source_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_import_journal_container ON import_journal(container_id);
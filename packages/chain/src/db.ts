@@ -5,7 +5,7 @@
  * Uses GitChain's PostgreSQL database (port 5440).
  */
 
-import { Pool } from "pg";
+import { Pool, PoolClient } from "pg";
 
 // ============================================
 // DATABASE CONNECTION
@@ -22,6 +22,9 @@ const pool = new Pool({
   connectionTimeoutMillis: 5000,
 });
 
+/** The pool, or a client inside a transaction */
+type Queryable = Pool | PoolClient;
+
 // ============================================
 // SCHEMA INITIALIZATION
 // ============================================
@@ -80,6 +83,18 @@ export async function initializeSchema(): Promise<void> {
         UNIQUE(manifest_hash, batch_id)
       );
 
+      -- Leaves hashed at import time, waiting for a batch
+      CREATE TABLE IF NOT EXISTS staged_leaves (
+        id BIGSERIAL PRIMARY KEY,
+        leaf_id TEXT NOT NULL,
+        container_id VARCHAR(200) NOT NULL,
+        field_path TEXT,
+        content_hash VARCHAR(66) NOT NULL,
+        batch_id INTEGER,
+        staged_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        UNIQUE(leaf_id, content_hash)
+      );
+
       -- Chain Audit Log
       CREATE TABLE IF NOT EXISTS chain_audit_log (
         id SERIAL PRIMARY KEY,
@@ -101,6 +116,7 @@ export async function initializeSchema(): Promise<void> {
       CREATE INDEX IF NOT EXISTS idx_chain_batches_status ON certification_batches(status);
       CREATE INDEX IF NOT EXISTS idx_chain_batches_created ON certification_batches(created_at);
       CREATE INDEX IF NOT EXISTS idx_chain_proofs_batch ON merkle_proofs(batch_id);
+      CREATE INDEX IF NOT EXISTS idx_chain_staged_leaves_pending ON staged_leaves(id) WHERE batch_id IS NULL;
       CREATE INDEX IF NOT EXISTS idx_chain_audit_action ON chain_audit_log(action);
       CREATE INDEX IF NOT EXISTS idx_chain_audit_created ON chain_audit_log(created_at);
     `);
@@ -248,8 +264,8 @@ export interface BatchRecord {
   metadataUri?: string;
 }
 
-export async function saveBatch(batch: BatchRecord): Promise<void> {
-  await pool.query(
+export async function saveBatch(batch: BatchRecord, db: Queryable = pool): Promise<void> {
+  await db.query(
     `INSERT INTO certification_batches (
       batch_id, merkle_root, item_count, status, on_chain_batch_id,
       tx_hash, block_number, network, ipfs_cid, metadata_uri
@@ -326,8 +342,8 @@ export interface ProofRecord {
   proof: string[];
 }
 
-export async function saveProof(proof: ProofRecord): Promise<void> {
-  await pool.query(
+export async function saveProof(proof: ProofRecord, db: Queryable = pool): Promise<void> {
+  await db.query(
     `INSERT INTO merkle_proofs (manifest_hash, batch_id, leaf_index, proof)
     VALUES ($1, $2, $3, $4)
     ON CONFLICT (manifest_hash, batch_id) DO UPDATE SET
@@ -360,6 +376,103 @@ export async function getProof(
   };
 }
 
+// ============================================
+// STAGED LEAF OPERATIONS
+// ============================================
+
+export interface StagedLeafRecord {
+  id: string;
+  containerId: string;
+  fieldPath?: string;
+  contentHash: string;
+}
+
+const STAGE_CHUNK_SIZE = 5000;
+
+/**
+ * Stage leaves for the next batch. A pending leaf restaged with a new hash
+ * is replaced; a leaf already staged or anchored with the same hash is kept.
+ */
+export async function saveStagedLeaves(leaves: StagedLeafRecord[]): Promise<void> {
+  for (let i = 0; i < leaves.length; i += STAGE_CHUNK_SIZE) {
+    const chunk = leaves.slice(i, i + STAGE_CHUNK_SIZE);
+    await pool.query(
+      `WITH input AS (
+        SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::text[])
+          AS t(leaf_id, container_id, field_path, content_hash)
+      ), superseded AS (
+        DELETE FROM staged_leaves s USING input i
+        WHERE s.batch_id IS NULL AND s.leaf_id = i.leaf_id AND s.content_hash <> i.content_hash
+      )
+      INSERT INTO staged_leaves (leaf_id, container_id, field_path, content_hash)
+      SELECT leaf_id, container_id, field_path, content_hash FROM input
+      ON CONFLICT (leaf_id, content_hash) DO NOTHING`,
+      [
+        chunk.map((l) => l.id),
+        chunk.map((l) => l.containerId),
+        chunk.map((l) => l.fieldPath ?? null),
+        chunk.map((l) => l.contentHash),
+      ]
+    );
+  }
+}
+
+export async function getStagedLeaves(
+  limit: number
+): Promise<(StagedLeafRecord & { rowId: string })[]> {
+  const result = await pool.query(
+    `SELECT id, leaf_id, container_id, field_path, content_hash
+    FROM staged_leaves WHERE batch_id IS NULL ORDER BY id LIMIT $1`,
+    [limit]
+  );
+
+  return result.rows.map((row) => ({
+    rowId: row.id,
+    id: row.leaf_id,
+    containerId: row.container_id,
+    fieldPath: row.field_path || undefined,
+    contentHash: row.content_hash,
+  }));
+}
+
+export async function markLeavesBatched(
+  rowIds: string[],
+  batchId: number,
+  db: Queryable = pool
+): Promise<void> {
+  await db.query(
+    "UPDATE staged_leaves SET batch_id = $1 WHERE id = ANY($2::bigint[])",
+    [batchId, rowIds]
+  );
+}
+
+/**
+ * Persist a batch built from staged leaves in one transaction: the batch,
+ * its proofs and the leaves marked as batched commit together, so a failure
+ * leaves every leaf pending for the next batch.
+ */
+export async function saveStagedBatch(
+  batch: BatchRecord,
+  proofs: ProofRecord[],
+  rowIds: string[]
+): Promise<void> {
+  const client = await pool.connect();
+  try {
+    await client.query("BEGIN");
+    await saveBatch(batch, client);
+    for (const proof of proofs) {
+      await saveProof(proof, client);
+    }
+    await markLeavesBatched(rowIds, batch.batchId, client);
+    await client.query("COMMIT");
+  } catch (err) {
+    await client.query("ROLLBACK");
+    throw err;
+  } finally {
+    client.release();
+  }
+}
+
 // ============================================
 // AUDIT LOG
 // ============================================
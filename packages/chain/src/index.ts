@@ -39,6 +39,16 @@ export {
 } from "./merkle.js";
 export type { BatchResult, MerkleTreeResult, MerkleProof } from "./merkle.js";
 
+// Import-time Staging
+export {
+  LeafStager,
+  hashAtom,
+  atomLeafId,
+  hashRecords,
+  createBatchFromLeaves,
+} from "./staging.js";
+export type { AtomLeafInput, StagedLeaf, ImportRecord, HashedRecord } from "./staging.js";
+
 // Certification Service
 export {
   certify,
@@ -71,11 +81,21 @@ export {
   getPendingBatches,
   saveProof,
   getProof,
+  saveStagedLeaves,
+  getStagedLeaves,
+  markLeavesBatched,
+  saveStagedBatch,
   logAudit,
   getAuditLog,
   getStats,
 } from "./db.js";
-export type { ManifestRecord, BatchRecord, ProofRecord, AuditEntry } from "./db.js";
+export type {
+  ManifestRecord,
+  BatchRecord,
+  ProofRecord,
+  StagedLeafRecord,
+  AuditEntry,
+} from "./db.js";
 
 // Types
 export type {
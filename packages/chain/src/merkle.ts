@@ -104,6 +104,10 @@ export function generateProof(
     throw new Error("Leaf not found in tree");
   }
 
+  return proofAt(tree, index);
+}
+
+function proofAt(tree: MerkleTreeResult, index: number): MerkleProof {
   const proof: string[] = [];
   let currentIndex = index;
 
@@ -119,7 +123,7 @@ export function generateProof(
     currentIndex = Math.floor(currentIndex / 2);
   }
 
-  return { leaf: leafHash, proof, index };
+  return { leaf: tree.leaves[index], proof, index };
 }
 
 /**
@@ -187,14 +191,20 @@ export function createBatch(
   };
   batches.set(batchId, batch);
 
-  // Generate and store proofs
+  // Generate and store proofs. Leaf positions are indexed once, so large
+  // import-time batches don't search the leaves per item.
+  const leafIndex = new Map<string, number>();
+  tree.leaves.forEach((leaf, i) => {
+    if (!leafIndex.has(leaf)) leafIndex.set(leaf, i);
+  });
+
   const proofs = new Map<string, MerkleProof>();
   for (let i = 0; i < items.length; i++) {
     const hash = contentHashes[i];
-    const sortedIndex = tree.leaves.indexOf(hash);
-    if (sortedIndex === -1) continue;
+    const sortedIndex = leafIndex.get(hash);
+    if (sortedIndex === undefined) continue;
 
-    const proof = generateProof(tree, hash);
+    const proof = proofAt(tree, sortedIndex);
     proofs.set(items[i].id, proof);
 
     // Store in global proof store keyed by content hash
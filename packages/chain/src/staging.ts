@@ -0,0 +1,185 @@
+/**
+ * @0711/chain — Import-time Leaf Staging
+ *
+ * Importers hash containers and atoms while they stream in and stage the
+ * resulting leaves for the next certification batch. Anchoring then builds
+ * the Merkle tree from the staged hashes instead of re-reading content.
+ *
+ * Leaves are keyed by the public container ID (`0711:product:...`), never
+ * by the containers.id row UUID, so a container and its atoms land under
+ * the same key whichever writer staged them.
+ */
+
+import { createBatch, hashContent, type BatchResult } from "./merkle.js";
+import { saveStagedLeaves, type StagedLeafRecord } from "./db.js";
+
+// ============================================
+// TYPES
+// ============================================
+
+export interface AtomLeafInput {
+  fieldPath: string;
+  value: unknown;
+  layerId: string;
+  unit?: string;
+  lang?: string;
+  sourceType?: string;
+  contributorId?: string;
+}
+
+export interface StagedLeaf {
+  /** Container ID, or `<containerId>#<layerId>/<fieldPath>` for atoms */
+  id: string;
+  /** Public container ID (`0711:...`) */
+  containerId: string;
+  fieldPath?: string;
+  contentHash: string;
+}
+
+export interface ImportRecord {
+  containerId: string;
+  data: unknown;
+  atoms?: AtomLeafInput[];
+}
+
+export type HashedRecord<T extends ImportRecord> = T & {
+  contentHash: string;
+  atomHashes: string[];
+};
+
+// ============================================
+// HASHING
+// ============================================
+
+export function atomLeafId(containerId: string, atom: Pick<AtomLeafInput, "fieldPath" | "layerId">): string {
+  return `${containerId}#${atom.layerId}/${atom.fieldPath}`;
+}
+
+/**
+ * Hash an atom into a leaf. Uses the same canonical JSON as hashContent,
+ * over the atom's value and provenance.
+ */
+export function hashAtom(containerId: string, atom: AtomLeafInput): string {
+  return hashContent({
+    containerId,
+    fieldPath: atom.fieldPath,
+    value: atom.value,
+    layerId: atom.layerId,
+    unit: atom.unit,
+    lang: atom.lang,
+    sourceType: atom.sourceType,
+    contributorId: atom.contributorId,
+  });
+}
+
+// ============================================
+// STAGING
+// ============================================
+
+/**
+ * Leaves waiting for the next certification batch.
+ *
+ * Staging the same container or atom again replaces its hash, so a batch
+ * only anchors the latest content. Leaves are taken in staging order.
+ */
+export class LeafStager {
+  private leaves: Map<string, StagedLeaf> = new Map();
+
+  get size(): number {
+    return this.leaves.size;
+  }
+
+  stageContainer(containerId: string, data: unknown): string {
+    const contentHash = hashContent(data);
+    this.stage({ id: containerId, containerId, contentHash });
+    return contentHash;
+  }
+
+  stageAtom(containerId: string, atom: AtomLeafInput): string {
+    const contentHash = hashAtom(containerId, atom);
+    this.stage({
+      id: atomLeafId(containerId, atom),
+      containerId,
+      fieldPath: atom.fieldPath,
+      contentHash,
+    });
+    return contentHash;
+  }
+
+  stageRecord<T extends ImportRecord>(record: T): HashedRecord<T> {
+    const atomHashes = (record.atoms || []).map((atom) => this.stageAtom(record.containerId, atom));
+    const contentHash = this.stageContainer(record.containerId, record.data);
+    return { ...record, contentHash, atomHashes };
+  }
+
+  pending(): StagedLeaf[] {
+    return Array.from(this.leaves.values());
+  }
+
+  /**
+   * Remove and return up to `limit` leaves, oldest first.
+   */
+  take(limit = Infinity): StagedLeaf[] {
+    const taken: StagedLeaf[] = [];
+    for (const [id, leaf] of this.leaves) {
+      if (taken.length >= limit) break;
+      taken.push(leaf);
+      this.leaves.delete(id);
+    }
+    return taken;
+  }
+
+  /**
+   * Persist staged leaves so another process can anchor them, and clear
+   * them from memory.
+   */
+  async flush(
+    save: (leaves: StagedLeafRecord[]) => Promise<void> = saveStagedLeaves
+  ): Promise<number> {
+    const leaves = this.take();
+    if (leaves.length > 0) {
+      await save(leaves);
+    }
+    return leaves.length;
+  }
+
+  private stage(leaf: StagedLeaf): void {
+    // Re-insert so a restaged leaf moves to the end of the queue
+    this.leaves.delete(leaf.id);
+    this.leaves.set(leaf.id, leaf);
+  }
+}
+
+/**
+ * Import pipeline stage: hashes each record as it passes through and
+ * stages its container and atom leaves.
+ *
+ * Example:
+ *   for await (const record of hashRecords(readProducts(), stager)) {
+ *     await writeContainer(record);
+ *   }
+ */
+export async function* hashRecords<T extends ImportRecord>(
+  records: AsyncIterable<T> | Iterable<T>,
+  stager: LeafStager
+): AsyncGenerator<HashedRecord<T>> {
+  for await (const record of records) {
+    yield stager.stageRecord(record);
+  }
+}
+
+// ============================================
+// BATCHING
+// ============================================
+
+/**
+ * Create a certification batch from precomputed leaves.
+ * Proofs are keyed by leaf ID.
+ */
+export function createBatchFromLeaves(
+  leaves: Pick<StagedLeaf, "id" | "contentHash">[]
+): BatchResult | null {
+  return createBatch(
+    leaves.map((leaf) => ({ id: leaf.id, contentHash: leaf.contentHash, data: null }))
+  );
+}
@@ -0,0 +1,285 @@
+/**
+ * Tests for @0711/chain — Import-time Leaf Staging
+ *
+ * Covers: atom hashing, staging order and replacement, the streaming
+ * pipeline stage, persistence hand-off, and batches from staged leaves.
+ */
+
+import { describe, it, expect, beforeEach } from "@jest/globals";
+
+import {
+  hashContent,
+  buildMerkleTree,
+  verifyProof,
+  createBatch,
+  getProofByHash,
+  batches,
+  proofStore,
+} from "../src/merkle.js";
+import {
+  LeafStager,
+  hashAtom,
+  atomLeafId,
+  hashRecords,
+  createBatchFromLeaves,
+  type AtomLeafInput,
+  type ImportRecord,
+} from "../src/staging.js";
+import type { StagedLeafRecord } from "../src/db.js";
+
+// ============================================
+// HELPERS
+// ============================================
+
+const CONTAINER = "0711:product:bosch:8738208680:v1";
+
+function atom(fieldPath: string, value: unknown): AtomLeafInput {
+  return {
+    fieldPath,
+    value,
+    layerId: "000-core",
+    sourceType: "manufacturer",
+    contributorId: "bosch",
+  };
+}
+
+function clearGlobalState() {
+  batches.clear();
+  proofStore.clear();
+}
+
+// ============================================
+// hashAtom
+// ============================================
+
+describe("hashAtom", () => {
+  it("uses the canonical JSON of hashContent", () => {
+    const input = atom("leistung.cop_a7w35", 4.8);
+    expect(hashAtom(CONTAINER, input)).toBe(
+      hashContent({
+        containerId: CONTAINER,
+        fieldPath: "leistung.cop_a7w35",
+        value: 4.8,
+        layerId: "000-core",
+        sourceType: "manufacturer",
+        contributorId: "bosch",
+      })
+    );
+  });
+
+  it("is deterministic", () => {
+    expect(hashAtom(CONTAINER, atom("farbe", "weiß"))).toBe(hashAtom(CONTAINER, atom("farbe", "weiß")));
+  });
+
+  it("differs by value, container and provenance", () => {
+    const base = hashAtom(CONTAINER, atom("farbe", "weiß"));
+    expect(hashAtom(CONTAINER, atom("farbe", "grau"))).not.toBe(base);
+    expect(hashAtom("0711:product:bosch:1:v1", atom("farbe", "weiß"))).not.toBe(base);
+    expect(hashAtom(CONTAINER, { ...atom("farbe", "weiß"), layerId: "002-ai" })).not.toBe(base);
+  });
+});
+
+// ============================================
+// LeafStager
+// ============================================
+
+describe("LeafStager", () => {
+  it("stages containers with their hashContent hash", () => {
+    const stager = new LeafStager();
+    const data = { name: "Wärmepumpe", etim_class: "EC011185" };
+
+    const hash = stager.stageContainer(CONTAINER, data);
+
+    expect(hash).toBe(hashContent(data));
+    expect(stager.pending()).toEqual([{ id: CONTAINER, containerId: CONTAINER, contentHash: hash }]);
+  });
+
+  it("stages atoms under container, layer and field path", () => {
+    const stager = new LeafStager();
+    const input = atom("leistung.nennleistung", 8);
+
+    const hash = stager.stageAtom(CONTAINER, input);
+
+    expect(stager.pending()).toEqual([
+      {
+        id: atomLeafId(CONTAINER, input),
+        containerId: CONTAINER,
+        fieldPath: "leistung.nennleistung",
+        contentHash: hash,
+      },
+    ]);
+    expect(atomLeafId(CONTAINER, input)).toBe(`${CONTAINER}#000-core/leistung.nennleistung`);
+  });
+
+  it("replaces a restaged leaf and moves it to the end", () => {
+    const stager = new LeafStager();
+    stager.stageContainer("c-1", { v: 1 });
+    stager.stageContainer("c-2", { v: 2 });
+    const latest = stager.stageContainer("c-1", { v: 3 });
+
+    expect(stager.size).toBe(2);
+    expect(stager.pending().map((l) => l.id)).toEqual(["c-2", "c-1"]);
+    expect(stager.pending()[1].contentHash).toBe(latest);
+  });
+
+  it("takes leaves oldest first and removes them", () => {
+    const stager = new LeafStager();
+    for (let i = 0; i < 5; i++) stager.stageContainer(`c-${i}`, { i });
+
+    expect(stager.take(2).map((l) => l.id)).toEqual(["c-0", "c-1"]);
+    expect(stager.size).toBe(3);
+    expect(stager.take().map((l) => l.id)).toEqual(["c-2", "c-3", "c-4"]);
+    expect(stager.size).toBe(0);
+  });
+
+  it("stages a record's atoms and container", () => {
+    const stager = new LeafStager();
+    const record: ImportRecord = {
+      containerId: CONTAINER,
+      data: { name: "Wärmepumpe" },
+      atoms: [atom("farbe", "weiß"), atom("kaeltemittel", "R290")],
+    };
+
+    const hashed = stager.stageRecord(record);
+
+    expect(hashed.contentHash).toBe(hashContent(record.data));
+    expect(hashed.atomHashes).toEqual(record.atoms!.map((a) => hashAtom(CONTAINER, a)));
+    expect(stager.size).toBe(3);
+  });
+
+  it("flush hands all leaves to the save function and clears them", async () => {
+    const stager = new LeafStager();
+    stager.stageContainer("c-1", { a: 1 });
+    stager.stageAtom("c-1", atom("farbe", "weiß"));
+
+    const saved: StagedLeafRecord[][] = [];
+    const count = await stager.flush(async (leaves) => {
+      saved.push(leaves);
+    });
+
+    expect(count).toBe(2);
+    expect(saved).toHaveLength(1);
+    expect(saved[0].map((l) => l.containerId)).toEqual(["c-1", "c-1"]);
+    expect(stager.size).toBe(0);
+    expect(await stager.flush(async () => {
+      throw new Error("not called when empty");
+    })).toBe(0);
+  });
+});
+
+// ============================================
+// hashRecords
+// ============================================
+
+describe("hashRecords", () => {
+  it("hashes records as they stream through", async () => {
+    async function* source() {
+      for (let i = 0; i < 3; i++) {
+        yield { containerId: `c-${i}`, data: { i }, atoms: [atom("n", i)], extra: i };
+      }
+    }
+
+    const stager = new LeafStager();
+    const out = [];
+    for await (const record of hashRecords(source(), stager)) {
+      // Leaves are staged by the time the record is handed on
+      expect(stager.pending().some((l) => l.id === record.containerId)).toBe(true);
+      out.push(record);
+    }
+
+    expect(out.map((r) => r.extra)).toEqual([0, 1, 2]);
+    expect(out.map((r) => r.contentHash)).toEqual([0, 1, 2].map((i) => hashContent({ i })));
+    expect(stager.size).toBe(6);
+  });
+
+  it("accepts plain iterables", async () => {
+    const stager = new LeafStager();
+    const out = [];
+    for await (const record of hashRecords([{ containerId: "c-1", data: { a: 1 } }], stager)) {
+      out.push(record);
+    }
+    expect(out[0].atomHashes).toEqual([]);
+    expect(stager.size).toBe(1);
+  });
+});
+
+// ============================================
+// createBatchFromLeaves
+// ============================================
+
+describe("createBatchFromLeaves", () => {
+  beforeEach(() => {
+    clearGlobalState();
+  });
+
+  it("returns null without leaves", () => {
+    expect(createBatchFromLeaves([])).toBeNull();
+  });
+
+  it("builds the same root as the content hashes themselves", () => {
+    const stager = new LeafStager();
+    stager.stageRecord({ containerId: "c-1", data: { a: 1 }, atoms: [atom("x", 1), atom("y", 2)] });
+    stager.stageRecord({ containerId: "c-2", data: { b: 2 } });
+    const leaves = stager.take();
+
+    const result = createBatchFromLeaves(leaves);
+
+    expect(result!.merkleRoot).toBe(buildMerkleTree(leaves.map((l) => l.contentHash)).root);
+    expect(result!.itemCount).toBe(4);
+  });
+
+  it("keys proofs by leaf ID and they verify against the root", () => {
+    const stager = new LeafStager();
+    for (let i = 0; i < 10; i++) {
+      stager.stageRecord({ containerId: `c-${i}`, data: { i }, atoms: [atom("n", i)] });
+    }
+    const leaves = stager.take();
+
+    const result = createBatchFromLeaves(leaves)!;
+
+    for (const leaf of leaves) {
+      const proof = result.proofs.get(leaf.id)!;
+      expect(proof.leaf).toBe(leaf.contentHash);
+      expect(verifyProof(result.merkleRoot, leaf.contentHash, proof.proof)).toBe(true);
+      expect(getProofByHash(leaf.contentHash)!.batchId).toBe(result.batchId);
+    }
+  });
+});
+
+// ============================================
+// createBatch at import scale
+// ============================================
+
+describe("createBatch with many leaves", () => {
+  beforeEach(() => {
+    clearGlobalState();
+  });
+
+  it("generates a valid proof for every item", () => {
+    const items = Array.from({ length: 1000 }, (_, i) => ({
+      id: `c-${i}`,
+      contentHash: hashContent({ i }),
+      data: null,
+    }));
+
+    const result = createBatch(items)!;
+
+    expect(result.proofs.size).toBe(1000);
+    for (const item of items) {
+      const proof = result.proofs.get(item.id)!;
+      expect(verifyProof(result.merkleRoot, item.contentHash, proof.proof)).toBe(true);
+    }
+  });
+
+  it("gives items with identical content the same proof", () => {
+    const shared = hashContent({ same: true });
+    const result = createBatch([
+      { id: "a", contentHash: shared, data: null },
+      { id: "b", contentHash: shared, data: null },
+      { id: "c", contentHash: hashContent({ other: 1 }), data: null },
+    ])!;
+
+    expect(result.proofs.get("a")).toEqual(result.proofs.get("b"));
+    expect(verifyProof(result.merkleRoot, shared, result.proofs.get("a")!.proof)).toBe(true);
+  });
+});
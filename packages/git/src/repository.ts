@@ -64,6 +64,38 @@ export class GitRepository {
     return hash;
   }
 
+  /**
+   * Write several containers to the repository in a single commit
+   */
+  async writeContainers(
+    containers: Array<{ identifier: string; content: object }>,
+    message?: string
+  ): Promise<string> {
+    await this.init();
+
+    const relativePaths = containers.map(({ identifier, content }) => {
+      const relativePath = `${identifier}.json`;
+      fs.writeFileSync(path.join(this.repoPath, relativePath), JSON.stringify(content, null, 2));
+      return relativePath;
+    });
+
+    // Stage all files with one index update
+    await git.add({ fs, dir: this.repoPath, filepath: relativePaths });
+
+    const commitMessage = message || `Update ${containers.length} containers`;
+    const hash = await git.commit({
+      fs,
+      dir: this.repoPath,
+      message: commitMessage,
+      author: {
+        name: this.config.authorName,
+        email: this.config.authorEmail,
+      },
+    });
+
+    return hash;
+  }
+
   /**
    * Read a container from the repository
    */
@@ -149,6 +149,46 @@ describe("writeContainer / readContainer", () => {
   });
 });
 
+// ============================================
+// WRITE MANY CONTAINERS
+// ============================================
+
+describe("writeContainers", () => {
+  it("writes all containers in a single commit", async () => {
+    const repo = createRepo();
+
+    const hash = await repo.writeContainers(
+      [
+        { identifier: "product-a", content: { name: "A" } },
+        { identifier: "product-b", content: { name: "B" } },
+        { identifier: "product-c", content: { name: "C" } },
+      ],
+      "Batch update: 3 containers"
+    );
+
+    expect(await repo.readContainer("product-b")).toEqual({ name: "B" });
+    const history = await repo.getHistory();
+    expect(history).toHaveLength(1);
+    expect(history[0].hash).toBe(hash);
+    expect(history[0].message.trim()).toBe("Batch update: 3 containers");
+    expect((await repo.getHistory("product-c"))[0].hash).toBe(hash);
+  });
+
+  it("updates existing containers alongside new ones", async () => {
+    const repo = createRepo();
+    await repo.writeContainer("product-a", { version: 1 });
+
+    await repo.writeContainers([
+      { identifier: "product-a", content: { version: 2 } },
+      { identifier: "product-b", content: { version: 1 } },
+    ]);
+
+    expect(await repo.readContainer("product-a")).toEqual({ version: 2 });
+    expect(await repo.getHistory("product-a")).toHaveLength(2);
+    expect(await repo.listContainers()).toEqual(expect.arrayContaining(["product-a", "product-b"]));
+  });
+});
+
 // ============================================
 // HISTORY
 // ============================================
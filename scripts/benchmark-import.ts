@@ -0,0 +1,251 @@
+/**
+ * Import Benchmark
+ *
+ * Imports a synthetic catalogue (scripts/catalogue/generator.ts) into the
+ * database at DATABASE_URL (or the PG* environment variables) once per
+ * import strategy and reports containers/s, atoms/s, WAL written and the
+ * growth and leaf density of the container_atoms indexes.
+ *
+ * Strategies:
+ *   rows          AtomService.createAtom per atom (the importers' path)
+ *   batch         AtomService.createAtomsBatch, one transaction per container
+ *   bulk          BulkLoadService, indexes kept
+ *   bulk-rebuild  BulkLoadService, deferred indexes dropped and rebuilt
+ *
+ * Every strategy imports the same catalogue (same seed) into its own
+ * namespace, including inserting the container rows. Times include
+ * generating the catalogue; the "generate" line shows that share. Unless
+ * --keep is given, each namespace is deleted and container_atoms vacuumed
+ * before the next strategy runs. Leaf density needs the pgstattuple
+ * extension (CREATE EXTENSION pgstattuple).
+ *
+ * Usage:
+ *   DATABASE_URL=postgres://... npx tsx scripts/benchmark-import.ts [containers]
+ *     [--strategies rows,batch,bulk,bulk-rebuild] [--seed 1] [--atoms 40-120]
+ *     [--etim-features 80] [--citation-rate 0.9] [--keep]
+ *
+ * 15,000 containers at the default 40-120 atoms are about 1.2M atoms.
+ */
+
+import { Pool } from "pg";
+
+import { AtomService } from "../apps/api/src/services/atoms.js";
+import { BulkLoadService, type BulkAtom, type BulkLayer } from "../apps/api/src/services/bulk-load.js";
+import { CONTRIBUTORS, generateCatalogue, type CatalogueOptions, type SyntheticProduct } from "./catalogue/generator.js";
+
+const CONTAINER_BATCH = 1000;
+
+type Products = () => Generator<SyntheticProduct>;
+
+interface Strategy {
+  (pool: Pool, products: Products, ids: Map<string, string>): Promise<void>;
+}
+
+const STRATEGIES: Record<string, Strategy> = {
+  async rows(pool, products, ids) {
+    const atomService = new AtomService(pool);
+    for (const product of products()) {
+      const containerId = ids.get(product.containerId)!;
+      for (const layer of product.layers) {
+        await atomService.createLayer(containerId, { ...layer, commit: "bench-import" });
+      }
+      for (const atom of product.atoms) {
+        await atomService.createAtom(containerId, atom.fieldPath, atom.value, atom.source, "bench-import", atom);
+      }
+    }
+  },
+
+  async batch(pool, products, ids) {
+    const atomService = new AtomService(pool);
+    for (const product of products()) {
+      const containerId = ids.get(product.containerId)!;
+      for (const layer of product.layers) {
+        await atomService.createLayer(containerId, { ...layer, commit: "bench-import" });
+      }
+      await atomService.createAtomsBatch(containerId, product.atoms, "bench-import");
+    }
+  },
+
+  async bulk(pool, products, ids) {
+    await bulkLoad(pool, products, ids, false);
+  },
+
+  async "bulk-rebuild"(pool, products, ids) {
+    await bulkLoad(pool, products, ids, true);
+  },
+};
+
+async function bulkLoad(pool: Pool, products: Products, ids: Map<string, string>, rebuildIndexes: boolean) {
+  function* layers(): Generator<BulkLayer> {
+    for (const product of products()) {
+      for (const layer of product.layers) {
+        yield { ...layer, containerId: ids.get(product.containerId)! };
+      }
+    }
+  }
+  function* atoms(): Generator<BulkAtom> {
+    for (const product of products()) {
+      for (const atom of product.atoms) {
+        yield { ...atom, containerId: ids.get(product.containerId)! };
+      }
+    }
+  }
+  const result = await new BulkLoadService(pool).load(layers(), atoms(), "bench-import", { rebuildIndexes });
+  if (Object.keys(result.rejected).length > 0) {
+    throw new Error(`Bulk load rejected rows: ${JSON.stringify(result.rejected)}`);
+  }
+}
+
+// ===========================================
+// MEASUREMENTS
+// ===========================================
+
+interface IndexStats {
+  bytes: number;
+  /** Mean avg_leaf_density of the btree indexes (pgstattuple), if available */
+  leafDensity: number | null;
+}
+
+async function walPosition(pool: Pool): Promise<string> {
+  return (await pool.query("SELECT pg_current_wal_lsn() AS lsn")).rows[0].lsn;
+}
+
+async function walBytesSince(pool: Pool, lsn: string): Promise<number> {
+  const result = await pool.query("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), $1) AS bytes", [lsn]);
+  return Number(result.rows[0].bytes);
+}
+
+async function indexStats(pool: Pool, pgstattuple: boolean): Promise<IndexStats> {
+  const indexes = await pool.query(
+    `SELECT s.indexrelname AS name, pg_relation_size(s.indexrelid) AS bytes, am.amname AS method
+     FROM pg_stat_user_indexes s
+     JOIN pg_class c ON c.oid = s.indexrelid
+     JOIN pg_am am ON am.oid = c.relam
+     WHERE s.relname = 'container_atoms'`
+  );
+  const bytes = indexes.rows.reduce((sum, row) => sum + Number(row.bytes), 0);
+  if (!pgstattuple) return { bytes, leafDensity: null };
+
+  const densities: number[] = [];
+  for (const row of indexes.rows.filter((r) => r.method === "btree")) {
+    const stats = await pool.query("SELECT avg_leaf_density FROM pgstatindex($1)", [row.name]);
+    const density = Number(stats.rows[0].avg_leaf_density);
+    if (!Number.isNaN(density)) densities.push(density);
+  }
+  const leafDensity = densities.length > 0 ? densities.reduce((a, b) => a + b, 0) / densities.length : null;
+  return { bytes, leafDensity };
+}
+
+// ===========================================
+// SETUP
+// ===========================================
+
+async function insertContainers(pool: Pool, products: Products): Promise<Map<string, string>> {
+  const ids = new Map<string, string>();
+  let batch: SyntheticProduct[] = [];
+  const flush = async () => {
+    const result = await pool.query(
+      `INSERT INTO containers (container_id, type, namespace, identifier, version, data, meta, visibility)
+       SELECT c.container_id, 'product', c.namespace, c.identifier, 1, c.data, '{}'::jsonb, 'public'
+       FROM jsonb_to_recordset($1::jsonb) AS c(container_id text, namespace text, identifier text, data jsonb)
+       RETURNING id, container_id`,
+      [JSON.stringify(batch.map(({ containerId, namespace, identifier, data }) => ({
+        container_id: containerId, namespace, identifier, data,
+      })))]
+    );
+    for (const row of result.rows) ids.set(row.container_id, row.id);
+    batch = [];
+  };
+  for (const product of products()) {
+    batch.push(product);
+    if (batch.length === CONTAINER_BATCH) await flush();
+  }
+  if (batch.length > 0) await flush();
+  return ids;
+}
+
+async function cleanup(pool: Pool, namespace: string) {
+  await pool.query("DELETE FROM containers WHERE namespace = $1", [namespace]);
+  await pool.query("VACUUM (ANALYZE) container_atoms");
+}
+
+function arg(name: string): string | undefined {
+  const index = process.argv.indexOf(name);
+  return index >= 0 ? process.argv[index + 1] : undefined;
+}
+
+async function main() {
+  const count = parseInt(process.argv.slice(2).find((a) => /^\d+$/.test(a)) || "2000", 10);
+  const strategies = (arg("--strategies") || Object.keys(STRATEGIES).join(",")).split(",");
+  const keep = process.argv.includes("--keep");
+  const [min, max] = (arg("--atoms") || "40-120").split("-").map((n) => parseInt(n, 10));
+  const options: CatalogueOptions = {
+    seed: parseInt(arg("--seed") || "1", 10),
+    atoms: { min, max: max ?? min },
+    etimFeatures: parseInt(arg("--etim-features") || "80", 10),
+    citationRate: parseFloat(arg("--citation-rate") || "0.9"),
+  };
+  for (const name of strategies) {
+    if (!STRATEGIES[name]) throw new Error(`Unknown strategy: ${name}`);
+  }
+
+  const pool = new Pool({ connectionString: process.env.DATABASE_URL, max: 4 });
+  try {
+    const atomService = new AtomService(pool);
+    for (const contributor of CONTRIBUTORS) {
+      await atomService.registerContributor(contributor);
+    }
+    const pgstattuple = (await pool.query("SELECT 1 FROM pg_extension WHERE extname = 'pgstattuple'")).rowCount! > 0;
+
+    let atomCount = 0;
+    let started = performance.now();
+    for (const product of generateCatalogue(count, options)) atomCount += product.atoms.length;
+    const generateMs = performance.now() - started;
+
+    console.log(`${count.toLocaleString()} containers, ${atomCount.toLocaleString()} atoms (seed ${options.seed})`);
+    console.log(`  generate: ${(generateMs / 1000).toFixed(1)} s per pass\n`);
+
+    const header =
+      `${"strategy".padEnd(14)}${"total s".padStart(9)}${"containers/s".padStart(14)}${"atoms/s".padStart(10)}` +
+      `${"WAL MiB".padStart(10)}${"WAL B/atom".padStart(12)}${"index +MiB".padStart(12)}${"leaf density".padStart(14)}`;
+    console.log(header);
+    console.log("-".repeat(header.length));
+
+    for (const name of strategies) {
+      const namespace = `bench-import-${name}`;
+      const products: Products = () => generateCatalogue(count, { ...options, namespace });
+      await cleanup(pool, namespace);
+
+      const indexesBefore = await indexStats(pool, false);
+      const lsn = await walPosition(pool);
+      started = performance.now();
+
+      const ids = await insertContainers(pool, products);
+      await STRATEGIES[name](pool, products, ids);
+
+      const seconds = (performance.now() - started) / 1000;
+      const wal = await walBytesSince(pool, lsn);
+      const indexesAfter = await indexStats(pool, pgstattuple);
+      const density = indexesAfter.leafDensity === null ? "n/a" : `${indexesAfter.leafDensity.toFixed(1)}%`;
+      console.log(
+        `${name.padEnd(14)}${seconds.toFixed(1).padStart(9)}` +
+        `${Math.round(count / seconds).toLocaleString().padStart(14)}` +
+        `${Math.round(atomCount / seconds).toLocaleString().padStart(10)}` +
+        `${(wal / 2 ** 20).toFixed(1).padStart(10)}${Math.round(wal / atomCount).toLocaleString().padStart(12)}` +
+        `${((indexesAfter.bytes - indexesBefore.bytes) / 2 ** 20).toFixed(1).padStart(12)}${density.padStart(14)}`
+      );
+
+      if (!keep) await cleanup(pool, namespace);
+    }
+  } finally {
+    if (!keep) {
+      await pool.query("DELETE FROM contributors WHERE id LIKE 'synthetic-%'");
+    }
+    await pool.end();
+  }
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,187 @@
+/**
+ * Search Benchmark
+ *
+ * Seeds synthetic product containers (default 100,000, 5 atoms each) into a
+ * scratch namespace, then compares the old ILIKE scan over data::text with
+ * the container_search index (migration 013) through ContainerService.
+ *
+ * Usage:
+ *   DATABASE_URL=postgres://... npx tsx scripts/benchmark-search.ts [count] [--keep]
+ *
+ * --keep leaves the seeded containers in place for repeated runs.
+ */
+
+import { Pool } from "pg";
+
+import { ContainerService } from "../apps/api/src/services/containers.js";
+
+const NAMESPACE = "bench-search";
+const CONTRIBUTOR = "bench-search@0711.io";
+const RUNS = 20;
+
+const ETIM_CLASSES = [
+  ["EC011185", "Wärmepumpe"],
+  ["EC010398", "Gas-Brennwertkessel"],
+  ["EC011053", "Warmwasserspeicher"],
+  ["EC002885", "Raumthermostat"],
+];
+
+async function main() {
+  const count = parseInt(process.argv.find((a) => /^\d+$/.test(a)) || "100000", 10);
+  const keep = process.argv.includes("--keep");
+
+  const pool = new Pool({ connectionString: process.env.DATABASE_URL, max: 4 });
+  const db = {
+    async query<T>(sql: string, params?: unknown[]): Promise<T[]> {
+      return (await pool.query(sql, params)).rows;
+    },
+    async queryOne<T>(sql: string, params?: unknown[]): Promise<T | null> {
+      return (await pool.query(sql, params)).rows[0] || null;
+    },
+  };
+  const containerService = new ContainerService(db as any);
+
+  try {
+    const existing = await db.queryOne<{ count: string }>(
+      "SELECT COUNT(*) AS count FROM containers WHERE namespace = $1",
+      [NAMESPACE]
+    );
+    if (parseInt(existing?.count || "0", 10) !== count) {
+      await seed(pool, count);
+    } else {
+      console.log(`Reusing ${count.toLocaleString()} seeded containers`);
+    }
+
+    const sample = `Wärmepumpe ${ETIM_CLASSES[0][0]}`;
+    const rare = `bench-${String(Math.floor(count / 2)).padStart(7, "0")}`;
+
+    console.log(`\nQueries (${RUNS} runs each, ms)`);
+
+    await report("ILIKE scan, common term", () =>
+      containerService.list({ search: "Wärmepumpe", namespace: NAMESPACE, limit: 20 })
+    );
+    await report("ILIKE scan, rare term", () =>
+      containerService.list({ search: rare, namespace: NAMESPACE, limit: 20 })
+    );
+    await report("index, common term (page + count)", () =>
+      containerService.search(sample, { namespace: NAMESPACE, limit: 20 })
+    );
+    await report("index, common term (cursor page)", () =>
+      containerService.search(sample, { namespace: NAMESPACE, limit: 20, cursor: null })
+    );
+    await report("index, rare term", () =>
+      containerService.search(rare, { namespace: NAMESPACE, limit: 20, cursor: null })
+    );
+    await report("index, atom value", () =>
+      containerService.search("R290", { namespace: NAMESPACE, limit: 20, cursor: null })
+    );
+    await report("suggest", () => containerService.suggest("wärmep", { namespace: NAMESPACE }));
+
+    // Streaming the full result set page by page
+    let pages = 0;
+    let rows = 0;
+    let cursor: string | null = null;
+    const started = performance.now();
+    do {
+      const page = await containerService.search(sample, { namespace: NAMESPACE, limit: 100, cursor });
+      cursor = page.nextCursor ?? null;
+      rows += page.containers.length;
+      pages++;
+    } while (cursor && pages < 50);
+    const elapsed = performance.now() - started;
+    console.log(
+      `  ${"index, stream 50 cursor pages".padEnd(36)} ${rows} rows in ${elapsed.toFixed(0)} ms ` +
+      `(${(elapsed / pages).toFixed(1)} ms/page)`
+    );
+
+    // Index maintenance cost of a write
+    const target = await db.queryOne<{ id: string }>(
+      "SELECT id FROM containers WHERE namespace = $1 LIMIT 1",
+      [NAMESPACE]
+    );
+    await report("container update (trigger)", () =>
+      pool.query("UPDATE containers SET data = data || '{\"bench\": true}' WHERE id = $1", [target!.id])
+    );
+  } finally {
+    if (!keep) {
+      await pool.query("DELETE FROM containers WHERE namespace = $1", [NAMESPACE]);
+      await pool.query("DELETE FROM contributors WHERE id = $1", [CONTRIBUTOR]);
+    }
+    await pool.end();
+  }
+}
+
+async function seed(pool: Pool, count: number) {
+  console.log(`Seeding ${count.toLocaleString()} containers...`);
+  await pool.query("DELETE FROM containers WHERE namespace = $1", [NAMESPACE]);
+  await pool.query(
+    `INSERT INTO contributors (id, name, role) VALUES ($1, 'Search Benchmark', 'manufacturer')
+     ON CONFLICT (id) DO NOTHING`,
+    [CONTRIBUTOR]
+  );
+
+  const classes = JSON.stringify(ETIM_CLASSES);
+  let started = performance.now();
+  await pool.query(
+    `INSERT INTO containers (container_id, type, namespace, identifier, version, data, meta, visibility)
+     SELECT
+       '0711:product:' || $1 || ':' || ident || ':v1', 'product', $1, ident, 1,
+       jsonb_build_object(
+         'name', (cls->>1) || ' ' || (i % 40 + 2) || ' kW Serie ' || (i % 997),
+         'description', 'Synthetische Testdaten ' || md5(i::text),
+         'etim_class', cls->>0,
+         'etim_class_name', cls->>1
+       ),
+       '{}'::jsonb, 'public'
+     FROM generate_series(1, $2::int) i,
+       LATERAL (SELECT 'bench-' || lpad(i::text, 7, '0') AS ident) s,
+       LATERAL (SELECT ($3::jsonb)->(i % 4) AS cls) e`,
+    [NAMESPACE, count, classes]
+  );
+  console.log(`  containers: ${(performance.now() - started).toFixed(0)} ms`);
+
+  started = performance.now();
+  await pool.query(
+    `INSERT INTO container_layers (id, container_id, name, type, contributor_id, trust_level, commit_hash)
+     SELECT '001-bench', c.id, 'Benchmark', 'manufacturer', $2, 'high', 'bench'
+     FROM containers c WHERE c.namespace = $1`,
+    [NAMESPACE, CONTRIBUTOR]
+  );
+  await pool.query(
+    `INSERT INTO container_atoms
+       (container_id, layer_id, field_path, value, value_type, unit, source_type, contributor_id, trust_level, commit_hash)
+     SELECT c.id, '001-bench', f.path, f.value, f.type, f.unit, 'manufacturer', $2, 'high', 'bench'
+     FROM containers c,
+       LATERAL (VALUES
+         ('leistung.nennleistung', to_jsonb((hashtext(c.identifier) & 31) + 2), 'number', 'kW'),
+         ('leistung.cop_a7w35', to_jsonb(round(((hashtext(c.identifier) & 255) / 100.0 + 3)::numeric, 2)), 'number', 'W/W'),
+         ('kaeltemittel', to_jsonb(CASE WHEN hashtext(c.identifier) & 1 = 0 THEN 'R290'::text ELSE 'R32' END), 'string', NULL),
+         ('abmessungen.hoehe', to_jsonb((hashtext(c.identifier) & 511) + 600), 'number', 'mm'),
+         ('farbe', to_jsonb('weiß'::text), 'string', NULL)
+       ) f(path, value, type, unit)
+     WHERE c.namespace = $1`,
+    [NAMESPACE, CONTRIBUTOR]
+  );
+  console.log(`  atoms (incl. triggers): ${(performance.now() - started).toFixed(0)} ms`);
+
+  await pool.query("ANALYZE containers");
+  await pool.query("ANALYZE container_search");
+}
+
+async function report(label: string, fn: () => Promise<unknown>) {
+  await fn();  // warm up
+  const times: number[] = [];
+  for (let i = 0; i < RUNS; i++) {
+    const started = performance.now();
+    await fn();
+    times.push(performance.now() - started);
+  }
+  times.sort((a, b) => a - b);
+  const p = (q: number) => times[Math.min(times.length - 1, Math.floor(q * times.length))].toFixed(1);
+  console.log(`  ${label.padEnd(36)} p50 ${p(0.5).padStart(8)}   p95 ${p(0.95).padStart(8)}`);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,318 @@
+/**
+ * Synthetic Product Catalogue
+ *
+ * Seeded generator for product containers shaped like the Bosch imports
+ * (test-containers/container_8738208680.json): core manufacturer data,
+ * dimensions, an ETIM class with its features spread over manufacturer,
+ * ETIM, datasheet-extraction and community layers, and citations on
+ * extracted atoms. The same seed and options always produce the same
+ * catalogue, so import benchmarks are comparable across runs.
+ */
+
+import type { Contributor, DataAtomCitation, DataAtomSource, SourceType, TrustLevel } from "@0711/core";
+
+// ===========================================
+// TYPES
+// ===========================================
+
+export interface CatalogueOptions {
+  /** PRNG seed (default 1) */
+  seed?: number;
+  namespace?: string;
+  /** Atoms per container, drawn uniformly from [min, max] (default 40-120) */
+  atoms?: { min: number; max: number };
+  /** ETIM features per class to draw field paths from (default 80) */
+  etimFeatures?: number;
+  /** Share of datasheet atoms that carry a citation (default 0.9) */
+  citationRate?: number;
+  /** Share of datasheet atoms restating a manufacturer field with another value (default 0.1) */
+  conflictRate?: number;
+  /** Relative weights of the layers atoms beyond the core fields land in */
+  layerMix?: Partial<Record<LayerId, number>>;
+}
+
+export type LayerId = "000-manufacturer" | "001-etim" | "002-datasheet" | "003-community";
+
+export interface SyntheticLayer {
+  id: LayerId;
+  name: string;
+  type: SourceType;
+  contributor_id: string;
+  trust_level: TrustLevel;
+  requires_verification: boolean;
+}
+
+export interface SyntheticAtom {
+  fieldPath: string;
+  fieldName: string;
+  value: unknown;
+  unit?: string;
+  lang?: string;
+  source: DataAtomSource;
+  citation?: DataAtomCitation;
+}
+
+export interface SyntheticProduct {
+  /** "0711:product:<namespace>:<identifier>:v1" */
+  containerId: string;
+  namespace: string;
+  identifier: string;
+  /** containers.data */
+  data: Record<string, unknown>;
+  layers: SyntheticLayer[];
+  atoms: SyntheticAtom[];
+}
+
+export const LAYERS: Record<LayerId, SyntheticLayer> = {
+  "000-manufacturer": {
+    id: "000-manufacturer",
+    name: "Hersteller Original",
+    type: "manufacturer",
+    contributor_id: "synthetic-manufacturer",
+    trust_level: "highest",
+    requires_verification: false,
+  },
+  "001-etim": {
+    id: "001-etim",
+    name: "ETIM Klassifikation",
+    type: "classification",
+    contributor_id: "etim-international",
+    trust_level: "high",
+    requires_verification: false,
+  },
+  "002-datasheet": {
+    id: "002-datasheet",
+    name: "Datenblatt-Extraktion",
+    type: "ai_generated",
+    contributor_id: "0711-audit-pipeline",
+    trust_level: "medium",
+    requires_verification: true,
+  },
+  "003-community": {
+    id: "003-community",
+    name: "Community",
+    type: "community",
+    contributor_id: "synthetic-community",
+    trust_level: "community",
+    requires_verification: true,
+  },
+};
+
+export const CONTRIBUTORS: Array<Omit<Contributor, "created_at" | "stats">> = [
+  { id: "synthetic-manufacturer", name: "Synthetic Thermotechnik GmbH", role: "manufacturer", organization: "Synthetic" },
+  { id: "etim-international", name: "ETIM International", role: "classifier", organization: "ETIM" },
+  { id: "0711-audit-pipeline", name: "0711 Audit Pipeline", role: "ai_agent", organization: "0711 Intelligence" },
+  { id: "synthetic-community", name: "Synthetic Community", role: "user" },
+];
+
+const DEFAULT_LAYER_MIX: Record<LayerId, number> = {
+  "000-manufacturer": 0.35,
+  "001-etim": 0.15,
+  "002-datasheet": 0.45,
+  "003-community": 0.05,
+};
+
+const ETIM_CLASSES = [
+  { code: "EC012034", name: "Luft/Wasser-Wärmepumpe", product: "Luftwärmepumpe" },
+  { code: "EC010398", name: "Gas-Brennwertkessel", product: "Gas-Brennwertgerät" },
+  { code: "EC011053", name: "Warmwasserspeicher", product: "Warmwasserspeicher" },
+  { code: "EC002885", name: "Raumthermostat", product: "Raumregler" },
+  { code: "EC011185", name: "Sole/Wasser-Wärmepumpe", product: "Erdwärmepumpe" },
+];
+
+type FeatureKind = "number" | "enum" | "boolean";
+
+// Names, units and value ranges ETIM features are drawn from
+const FEATURE_VOCABULARY: Array<{ name: string; kind: FeatureKind; unit?: string; range?: [number, number]; values?: string[] }> = [
+  { name: "Nennwärmeleistung", kind: "number", unit: "kW", range: [2, 40] },
+  { name: "Leistungszahl (COP) A7/W35", kind: "number", unit: "W/W", range: [3, 5.5] },
+  { name: "Luftdurchsatz", kind: "number", unit: "m³/h", range: [1500, 6000] },
+  { name: "Schallleistungspegel", kind: "number", unit: "dB(A)", range: [35, 65] },
+  { name: "Maximale Vorlauftemperatur", kind: "number", unit: "°C", range: [55, 75] },
+  { name: "Elektrische Leistungsaufnahme", kind: "number", unit: "kW", range: [0.5, 12] },
+  { name: "Nennspannung", kind: "number", unit: "V", range: [230, 400] },
+  { name: "Speicherinhalt", kind: "number", unit: "l", range: [80, 500] },
+  { name: "Energieeffizienzklasse", kind: "enum", values: ["A+++", "A++", "A+", "A", "B"] },
+  { name: "Kältemittel", kind: "enum", values: ["R290", "R32", "R410A", "R454B"] },
+  { name: "Art der Drehzahlregelung", kind: "enum", values: ["Inverter", "PWM", "Stufenlos", "Keine"] },
+  { name: "Aufstellungsort", kind: "enum", values: ["Innen", "Außen", "Split"] },
+  { name: "Farbe", kind: "enum", values: ["Weiß", "Silber", "Anthrazit"] },
+  { name: "Mit Smart-Grid-Schnittstelle", kind: "boolean" },
+  { name: "Mit WLAN-Modul", kind: "boolean" },
+  { name: "Kühlfunktion", kind: "boolean" },
+];
+
+const DIMENSIONS: Array<[string, string, string, [number, number]]> = [
+  ["breite", "Breite", "mm", [300, 1400]],
+  ["tiefe", "Tiefe", "mm", [250, 800]],
+  ["hoehe", "Höhe", "mm", [400, 1900]],
+  ["gewicht", "Gewicht", "kg", [5, 250]],
+];
+
+const EXTRACTION_METHODS: DataAtomCitation["method"][] = ["ocr", "pdf_parse", "table_extraction"];
+
+// ===========================================
+// RANDOM
+// ===========================================
+
+/**
+ * mulberry32: small, fast and good enough for test data
+ */
+export function createRandom(seed: number): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function pick<T>(random: () => number, items: T[]): T {
+  return items[Math.floor(random() * items.length)];
+}
+
+function between(random: () => number, [min, max]: [number, number], decimals = 0): number {
+  const factor = 10 ** decimals;
+  return Math.round((min + random() * (max - min)) * factor) / factor;
+}
+
+function weighted<T extends string>(random: () => number, weights: Record<T, number>): T {
+  const entries = Object.entries(weights) as Array<[T, number]>;
+  const total = entries.reduce((sum, [, weight]) => sum + weight, 0);
+  let roll = random() * total;
+  for (const [key, weight] of entries) {
+    roll -= weight;
+    if (roll < 0) return key;
+  }
+  return entries[entries.length - 1][0];
+}
+
+// ===========================================
+// GENERATOR
+// ===========================================
+
+interface Feature {
+  code: string;
+  name: string;
+  kind: FeatureKind;
+  unit?: string;
+  range?: [number, number];
+  values?: string[];
+}
+
+/**
+ * Feature pool of an ETIM class; codes are stable per class and index
+ */
+function classFeatures(classIndex: number, count: number): Feature[] {
+  const features: Feature[] = [];
+  for (let i = 0; i < count; i++) {
+    const vocabulary = FEATURE_VOCABULARY[(i + classIndex * 3) % FEATURE_VOCABULARY.length];
+    const round = Math.floor(i / FEATURE_VOCABULARY.length);
+    features.push({
+      ...vocabulary,
+      code: `EF${String(classIndex * 10000 + i + 1).padStart(6, "0")}`,
+      name: round > 0 ? `${vocabulary.name} ${round + 1}` : vocabulary.name,
+    });
+  }
+  return features;
+}
+
+function featureValue(random: () => number, feature: Feature): unknown {
+  switch (feature.kind) {
+    case "number":
+      return between(random, feature.range!, feature.range![1] < 10 ? 2 : 0);
+    case "enum":
+      return pick(random, feature.values!);
+    case "boolean":
+      return random() < 0.5;
+  }
+}
+
+function source(layer: SyntheticLayer): DataAtomSource {
+  return { type: layer.type, contributor_id: layer.contributor_id, layer_id: layer.id };
+}
+
+/**
+ * Generate `count` products. Products are yielded one at a time, so large
+ * catalogues can be streamed into an importer.
+ */
+export function* generateCatalogue(count: number, options: CatalogueOptions = {}): Generator<SyntheticProduct> {
+  const random = createRandom(options.seed ?? 1);
+  const namespace = options.namespace ?? "synthetic";
+  const atomRange = options.atoms ?? { min: 40, max: 120 };
+  const citationRate = options.citationRate ?? 0.9;
+  const conflictRate = options.conflictRate ?? 0.1;
+  const layerMix = { ...DEFAULT_LAYER_MIX, ...options.layerMix };
+  const pools = ETIM_CLASSES.map((_, i) => classFeatures(i, options.etimFeatures ?? 80));
+
+  for (let n = 0; n < count; n++) {
+    const classIndex = Math.floor(random() * ETIM_CLASSES.length);
+    const etimClass = ETIM_CLASSES[classIndex];
+    const identifier = String(8738200000 + n);
+    const series = `${etimClass.product.slice(0, 2).toUpperCase()}${between(random, [3, 9]) * 1000}i`;
+    const name = `${series} ${between(random, [2, 16])} ${pick(random, ["IR", "AR", "OR"])}-S`;
+    const description = `${etimClass.product} ${name} zur ${pick(random, ["Innenaufstellung", "Außenaufstellung"])}`;
+
+    const manufacturer = LAYERS["000-manufacturer"];
+    const atoms: SyntheticAtom[] = [
+      { fieldPath: "name", fieldName: "Bezeichnung", value: name, source: source(manufacturer) },
+      { fieldPath: "description", fieldName: "Beschreibung", value: description, lang: "de", source: source(manufacturer) },
+      { fieldPath: "manufacturer_aid", fieldName: "Bestell-Nr.", value: identifier, source: source(manufacturer) },
+      { fieldPath: "etim.class_code", fieldName: "ETIM Klasse", value: etimClass.code, source: source(LAYERS["001-etim"]) },
+      { fieldPath: "etim.class_name", fieldName: "ETIM Klassenname", value: etimClass.name, lang: "de", source: source(LAYERS["001-etim"]) },
+    ];
+    for (const [key, fieldName, unit, range] of DIMENSIONS) {
+      atoms.push({ fieldPath: `abmessungen.${key}`, fieldName, value: between(random, range), unit, source: source(manufacturer) });
+    }
+
+    // Features without repeats per layer; datasheet atoms may restate manufacturer fields
+    const target = Math.max(atoms.length, Math.floor(between(random, [atomRange.min, atomRange.max])));
+    const pool = pools[classIndex];
+    const used = new Map<LayerId, Set<string>>();
+    const manufacturerFeatures: Feature[] = [];
+    let attempts = 0;
+    while (atoms.length < target && attempts++ < target * 4) {
+      const layerId = weighted(random, layerMix);
+      const layer = LAYERS[layerId];
+      const layerUsed = used.get(layerId) ?? new Set<string>();
+      used.set(layerId, layerUsed);
+
+      const conflict = layerId === "002-datasheet" && manufacturerFeatures.length > 0 && random() < conflictRate;
+      const feature = conflict ? pick(random, manufacturerFeatures) : pick(random, pool);
+      if (layerUsed.has(feature.code)) continue;
+      layerUsed.add(feature.code);
+      if (layerId === "000-manufacturer") manufacturerFeatures.push(feature);
+
+      const value = featureValue(random, feature);
+      const atom: SyntheticAtom = {
+        fieldPath: `etim.${feature.code}`,
+        fieldName: feature.name,
+        value,
+        unit: feature.unit,
+        source: source(layer),
+      };
+      if (layerId === "002-datasheet" && random() < citationRate) {
+        atom.citation = {
+          document: `0711:document:${namespace}:datasheet_${identifier}:v1`,
+          page: between(random, [1, 40]),
+          excerpt: `${feature.name}: ${value}${feature.unit ? ` ${feature.unit}` : ""}`,
+          confidence: between(random, [0.6, 0.99], 3),
+          method: pick(random, EXTRACTION_METHODS),
+        };
+      }
+      atoms.push(atom);
+    }
+
+    const layerIds = new Set(atoms.map((atom) => atom.source.layer_id as LayerId));
+    yield {
+      containerId: `0711:product:${namespace}:${identifier}:v1`,
+      namespace,
+      identifier,
+      data: { name, description, etim_class: etimClass.code, etim_class_name: etimClass.name },
+      layers: (Object.keys(LAYERS) as LayerId[]).filter((id) => layerIds.has(id)).map((id) => LAYERS[id]),
+      atoms,
+    };
+  }
+}
@@ -0,0 +1,52 @@
+/**
+ * Synthetic Catalogue Export
+ *
+ * Writes a seeded synthetic catalogue (scripts/catalogue/generator.ts) as
+ * JSON lines, one product container per line, for fixtures and for
+ * importers outside this repository.
+ *
+ * Usage:
+ *   npx tsx scripts/generate-catalogue.ts [containers] [--seed 1] [--atoms 40-120]
+ *     [--etim-features 80] [--citation-rate 0.9] [--conflict-rate 0.1]
+ *     [--namespace synthetic] [--out catalogue.jsonl]
+ */
+
+import fs from "fs";
+
+import { generateCatalogue } from "./catalogue/generator.js";
+
+function arg(name: string): string | undefined {
+  const index = process.argv.indexOf(name);
+  return index >= 0 ? process.argv[index + 1] : undefined;
+}
+
+async function main() {
+  const count = parseInt(process.argv.slice(2).find((a) => /^\d+$/.test(a)) || "100", 10);
+  const [min, max] = (arg("--atoms") || "40-120").split("-").map((n) => parseInt(n, 10));
+  const out = arg("--out");
+  const stream = out ? fs.createWriteStream(out) : process.stdout;
+
+  let atoms = 0;
+  for (const product of generateCatalogue(count, {
+    seed: parseInt(arg("--seed") || "1", 10),
+    namespace: arg("--namespace"),
+    atoms: { min, max: max ?? min },
+    etimFeatures: parseInt(arg("--etim-features") || "80", 10),
+    citationRate: parseFloat(arg("--citation-rate") || "0.9"),
+    conflictRate: parseFloat(arg("--conflict-rate") || "0.1"),
+  })) {
+    atoms += product.atoms.length;
+    if (!stream.write(JSON.stringify(product) + "\n")) {
+      await new Promise((resolve) => stream.once("drain", resolve));
+    }
+  }
+  if (out) {
+    await new Promise((resolve) => (stream as fs.WriteStream).end(resolve));
+    console.error(`Wrote ${count.toLocaleString()} containers, ${atoms.toLocaleString()} atoms to ${out}`);
+  }
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
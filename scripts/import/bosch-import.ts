@@ -7,9 +7,14 @@
  * - Core manufacturer data (Trust: highest)
  * - ETIM classification (Trust: high)  
  * - AI-enriched citations (Trust: medium → verified after review)
+ * 
+ * Atoms are hashed as they are written and staged for the next
+ * certification batch (POST /api/chain/batch/staged). Container leaves are
+ * staged by scripts/bosch-import.ts, which writes the container data.
  */
 
 import { Pool } from 'pg';
+import { LeafStager } from '@0711/chain';
 import { AtomService } from '../services/atoms';
 import { DataAtomSource, SourceType } from '../types/atom';
 
@@ -17,21 +22,17 @@ import { DataAtomSource, SourceType } from '../types/atom';
 // CONFIGURATION
 // ============================================================================
 
-const BOSCH_DB = {
-  host: 'localhost',
-  port: 5432,
-  database: 'bosch_products',
-  user: 'bosch_user',
-  password: 'bosch_secure_2024',
-};
+function requireEnv(name: string): string {
+  const value = process.env[name];
+  if (!value) {
+    throw new Error(`${name} environment variable is required (PostgreSQL connection string)`);
+  }
+  return value;
+}
 
-const GITCHAIN_DB = {
-  host: 'localhost',
-  port: 5440,
-  database: 'gitchain',
-  user: 'gitchain',
-  password: 'gitchain2026',
-};
+const BOSCH_DB = { connectionString: requireEnv('BOSCH_DATABASE_URL') };
+
+const GITCHAIN_DB = { connectionString: requireEnv('DATABASE_URL') };
 
 // ============================================================================
 // IMPORT FUNCTIONS
@@ -156,7 +157,8 @@ async function main() {
   
   const boschPool = new Pool(BOSCH_DB);
   const gitchainPool = new Pool(GITCHAIN_DB);
-  const atomService = new AtomService(gitchainPool);
+  const stager = new LeafStager();
+  const atomService = new AtomService(gitchainPool, stager);
   
   try {
     // Register contributors
@@ -205,6 +207,7 @@ async function main() {
     const commitHash = 'bosch-import-' + Date.now().toString(36);
     let imported = 0;
     let failed = 0;
+    let staged = 0;
     
     for (const product of productsResult.rows) {
       try {
@@ -233,15 +236,21 @@ async function main() {
         );
         
         imported++;
+        if (stager.size >= 5000) {
+          staged += await stager.flush();
+        }
       } catch (error) {
         console.error(`❌ Failed to import ${product.snr}:`, error);
         failed++;
       }
     }
     
+    staged += await stager.flush();
+    
     console.log('\n============================');
     console.log(`✅ Import complete: ${imported} products`);
     console.log(`❌ Failed: ${failed} products`);
+    console.log(`🔗 Staged ${staged} leaves for certification`);
     
   } finally {
     await boschPool.end();
@@ -0,0 +1,7 @@
+"""
+GitChain SDK benchmarks
+
+Drives the SDK and its integrations against a local stub API that replays
+recorded container payloads. Run `python -m benchmarks --help` from
+sdks/python.
+"""
@@ -0,0 +1,15 @@
+import sys
+
+if sys.argv[1:2] == ["agent"]:
+    from .agent import main
+
+    sys.exit(main(sys.argv[2:]))
+
+if sys.argv[1:2] == ["wire"]:
+    from .wire import main
+
+    sys.exit(main(sys.argv[2:]))
+
+from .run import main
+
+sys.exit(main())
@@ -0,0 +1,582 @@
+"""
+Agent tool-loop benchmark
+
+A scripted fake LLM makes the same tool calls in every conversation:
+inject a few containers, verify one, inject and verify in parallel,
+inject all again, then answer. Each mode runs those calls through one
+integration against the stub API, the way an agent loop would, and every
+turn (model request, tool calls, tool results) is split into:
+
+    network      waiting on the API, including reading the response
+    parsing      JSON encoding/decoding, from_dict, tool call arguments
+    formatting   tool output and prompt fragments rendered by the SDK
+    prompt       system prompt and the next model request
+    dispatch     the rest of the integration: routing calls, threads,
+                 merging and splitting results, framework overhead
+    llm          the fake model's --llm-latency (not GitChain overhead)
+
+Each moment of a turn counts once. When tool calls run on several
+threads, it goes to the first phase in the order above that is active on
+any thread, so the phases add up to the turn latency. LangChain tools
+format their output inline, which shows up as dispatch.
+
+Usage (from sdks/python):
+    python -m benchmarks agent                    # all modes, checked against baselines
+    python -m benchmarks agent --mode 'openai*' --conversations 50 --latency 20
+    python -m benchmarks agent --save-baseline
+"""
+
+import argparse
+import fnmatch
+import functools
+import json
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from gitchain import ContextSession, SystemPromptBuilder
+from gitchain import client as client_module
+from gitchain import openai as openai_integration
+from gitchain import formatter, prompt, session, types, wire
+from gitchain.langchain import LANGCHAIN_AVAILABLE
+from gitchain.openai import GITCHAIN_FUNCTIONS, GitChainFunctionHandler, create_system_prompt
+
+from .run import BASELINES, MIN_LATENCY_DELTA_MS, calibrate, load_baselines, percentile
+from .scenarios import Env, Skip
+from .stub import StubAPI
+
+# In order of precedence where phases overlap across threads
+PHASES = ("network", "parsing", "formatting", "prompt", "llm")
+
+# SDK functions timed as a phase, besides urlopen and the client's json module
+PROBES: Dict[str, List[Tuple[Any, str]]] = {
+    "parsing": [
+        (wire, "loads"),
+        (types.Container, "from_dict"),
+        (types.InjectedContext, "from_dict"),
+        (types.ContainerDelta, "from_dict"),
+        (openai_integration, "_parse_tool_call"),
+    ],
+    "formatting": [
+        (openai_integration, "_format_verification"),
+        (openai_integration, "_batch_verifications"),
+        (types.InjectedContext, "container_blocks"),
+        (prompt.SystemPromptBuilder, "render"),
+        (formatter.ContextFormatter, "format"),
+        (session.ContextSession, "_atom_lines"),
+        (session, "_format_value"),
+    ],
+}
+
+QUESTION = "Which of these heat pumps has the best COP at A7/W35, and is the data blockchain-verified?"
+TOOLS = [{"type": "function", "function": f} for f in GITCHAIN_FUNCTIONS]
+
+
+class Probe:
+    """
+    Records when each thread is in a phase
+
+    Phases nest: entering one pauses the phase already active on the same
+    thread, so every interval belongs to exactly one phase.
+    """
+
+    def __init__(self):
+        self.intervals: List[Tuple[str, float, float]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stack = self._local.__dict__.setdefault("stack", [])
+        now = time.perf_counter()
+        if stack:
+            self._record(stack[-1], now)
+        stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._record(stack.pop(), now)
+            if stack:
+                stack[-1][1] = now
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            with self.phase(name):
+                return fn(*args, **kwargs)
+        return timed
+
+    def breakdown(self, start: float, end: float) -> Dict[str, float]:
+        """Milliseconds per phase between start and end, and clear the record"""
+        with self._lock:
+            intervals, self.intervals = self.intervals, []
+
+        events = []
+        for name, s, e in intervals:
+            s, e = max(s, start), min(e, end)
+            if e > s:
+                rank = PHASES.index(name)
+                events += [(s, 1, rank), (e, -1, rank)]
+        events.sort()
+
+        spent = dict.fromkeys(PHASES + ("dispatch",), 0.0)
+        active = [0] * len(PHASES)
+        cursor = start
+        for at, delta, rank in events:
+            if at > cursor:
+                owner = next((PHASES[r] for r, n in enumerate(active) if n), "dispatch")
+                spent[owner] += at - cursor
+                cursor = at
+            active[rank] += delta
+        spent["dispatch"] += max(end - cursor, 0.0)
+        return {name: seconds * 1000 for name, seconds in spent.items()}
+
+    def _record(self, entry: List[Any], now: float) -> None:
+        with self._lock:
+            self.intervals.append((entry[0], entry[1], now))
+
+
+class _Response:
+    """Response read up front, so reading the body counts as network time"""
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self._body = body
+
+    def read(self) -> bytes:
+        return self._body
+
+    def __enter__(self) -> "_Response":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class _TimedJSON:
+    """Stands in for the json module in gitchain.client"""
+
+    def __init__(self, probe: Probe):
+        self.loads = probe.wrap("parsing", json.loads)
+        self.dumps = probe.wrap("parsing", json.dumps)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(json, name)
+
+
+def _timed_urlopen(probe: Probe, urlopen: Callable) -> Callable:
+    @functools.wraps(urlopen)
+    def timed(*args, **kwargs):
+        with probe.phase("network"):
+            with urlopen(*args, **kwargs) as response:
+                return _Response(response.status, response.read())
+    return timed
+
+
+@contextmanager
+def instrument(probe: Probe) -> Iterator[Probe]:
+    """Time the SDK's network, parsing and formatting while active"""
+    patches: List[Tuple[Any, str, Callable]] = [
+        (client_module, "urlopen", functools.partial(_timed_urlopen, probe)),
+        (client_module, "json", lambda _: _TimedJSON(probe)),
+    ]
+    patches += [
+        (owner, attr, functools.partial(probe.wrap, name))
+        for name, targets in PROBES.items()
+        for owner, attr in targets
+    ]
+
+    originals = []
+    try:
+        for owner, attr, wrap in patches:
+            original = vars(owner)[attr]
+            if isinstance(original, (classmethod, staticmethod)):
+                replacement = type(original)(wrap(original.__func__))
+            else:
+                replacement = wrap(original)
+            originals.append((owner, attr, original))
+            setattr(owner, attr, replacement)
+        yield probe
+    finally:
+        for owner, attr, original in reversed(originals):
+            setattr(owner, attr, original)
+
+
+def script(ids: List[str]) -> List[List[Tuple[str, Dict[str, Any]]]]:
+    """Tool calls of each model turn; the last turn answers"""
+    half = max(len(ids) // 2, 1)
+    return [
+        [("gitchain_inject", {"container_ids": ids[:half]})],
+        [("gitchain_verify", {"container_id": ids[0]})],
+        [
+            ("gitchain_inject", {"container_ids": ids[half:] or ids}),
+            ("gitchain_verify", {"container_id": ids[-1]}),
+        ],
+        [("gitchain_inject", {"container_ids": ids})],
+        [],
+    ]
+
+
+class FakeLLM:
+    """Replays a script as OpenAI-style assistant messages, one per request"""
+
+    def __init__(self, turns: List[List[Tuple[str, Dict[str, Any]]]], latency: float = 0.0):
+        self.turns = turns
+        self.latency = latency
+        self.calls = 0
+
+    def complete(self, request: str) -> Dict[str, Any]:
+        if self.latency:
+            time.sleep(self.latency)
+        turn = self.turns[min(self.calls, len(self.turns) - 1)]
+        self.calls += 1
+        if not turn:
+            return {"role": "assistant", "content": "Based on the verified GitChain data, ..."}
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call_{self.calls}_{n}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(arguments)},
+                }
+                for n, (name, arguments) in enumerate(turn)
+            ],
+        }
+
+
+def request_body(messages: List[Dict[str, Any]]) -> str:
+    """Body an OpenAI-compatible client sends for the next turn"""
+    return json.dumps({"model": "fake", "messages": messages, "tools": TOOLS}, ensure_ascii=False)
+
+
+def _tool_message(call_id: str, content: str) -> Dict[str, str]:
+    return {"role": "tool", "tool_call_id": call_id, "content": content}
+
+
+# Called at the start of every conversation, returns that conversation's tool runner
+ToolRunner = Callable[[List[Dict[str, Any]]], List[Dict[str, str]]]
+Start = Callable[[int], ToolRunner]
+
+
+@dataclass
+class Mode:
+    name: str
+    setup: Callable[[Env], Start]
+    description: str = ""
+
+
+def _openai_tool_calls(env: Env) -> Start:
+    handler = GitChainFunctionHandler(client=env.client())
+    return lambda conversation: handler.handle_tool_calls
+
+
+def _openai_function_call(env: Env) -> Start:
+    handler = GitChainFunctionHandler(client=env.client())
+
+    def run(tool_calls: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        messages = []
+        for tool_call in tool_calls:
+            call_id, name, arguments = openai_integration._parse_tool_call(tool_call)
+            messages.append(_tool_message(call_id, handler.handle_function_call(name, arguments)))
+        return messages
+
+    return lambda conversation: run
+
+
+def _openai_session(env: Env) -> Start:
+    client = env.client()
+    return lambda conversation: GitChainFunctionHandler(session=ContextSession(client)).handle_tool_calls
+
+
+def _langchain_tools(env: Env) -> Start:
+    if not LANGCHAIN_AVAILABLE:
+        raise Skip("langchain not installed")
+    from gitchain.langchain import get_gitchain_tools
+
+    tools = {tool.name: tool for tool in get_gitchain_tools(env.client())}
+
+    def run(tool_calls: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        messages = []
+        for tool_call in tool_calls:
+            call_id, name, arguments = openai_integration._parse_tool_call(tool_call)
+            messages.append(_tool_message(call_id, tools[name].run(arguments)))
+        return messages
+
+    return lambda conversation: run
+
+
+def _langchain_retriever(env: Env) -> Start:
+    if not LANGCHAIN_AVAILABLE:
+        raise Skip("langchain not installed")
+    from gitchain.langchain import GitChainRetriever, GitChainVerifyTool
+
+    client = env.client()
+    verify_tool = GitChainVerifyTool(client=client)
+
+    def run(tool_calls: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        messages = []
+        for tool_call in tool_calls:
+            call_id, name, arguments = openai_integration._parse_tool_call(tool_call)
+            if name == "gitchain_inject":
+                retriever = GitChainRetriever(container_ids=arguments["container_ids"], client=client)
+                documents = retriever.get_relevant_documents(QUESTION)
+                content = "\n\n".join(doc.page_content for doc in documents)
+            else:
+                content = verify_tool.run(arguments)
+            messages.append(_tool_message(call_id, content))
+        return messages
+
+    return lambda conversation: run
+
+
+MODES: List[Mode] = [
+    Mode("openai_tool_calls", _openai_tool_calls, "GitChainFunctionHandler.handle_tool_calls"),
+    Mode("openai_function_call", _openai_function_call, "GitChainFunctionHandler.handle_function_call per call"),
+    Mode("openai_session", _openai_session, "handle_tool_calls with a ContextSession per conversation"),
+    Mode("langchain_tools", _langchain_tools, "GitChainInjectTool and GitChainVerifyTool"),
+    Mode("langchain_retriever", _langchain_retriever, "GitChainRetriever for injects, GitChainVerifyTool"),
+]
+
+
+def converse(
+    run_tools: ToolRunner,
+    builder: SystemPromptBuilder,
+    ids: List[str],
+    probe: Probe,
+    llm_latency: float = 0.0,
+) -> List[Dict[str, float]]:
+    """One scripted conversation; phase milliseconds of every turn"""
+    llm = FakeLLM(script(ids), llm_latency)
+    turns = []
+
+    started = time.perf_counter()
+    with probe.phase("prompt"):
+        system = create_system_prompt(ids[:1], client=builder.client, builder=builder)
+    messages: List[Dict[str, Any]] = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": QUESTION},
+    ]
+
+    while True:
+        with probe.phase("prompt"):
+            request = request_body(messages)
+        with probe.phase("llm"):
+            message = llm.complete(request)
+        messages.append(message)
+        tool_calls = message.get("tool_calls")
+        if tool_calls:
+            messages.extend(run_tools(tool_calls))
+
+        ended = time.perf_counter()
+        turn = probe.breakdown(started, ended)
+        turn["total"] = (ended - started) * 1000
+        turns.append(turn)
+        started = ended
+        if not tool_calls:
+            return turns
+
+
+@dataclass
+class AgentResult:
+    mode: str
+    conversations: int
+    turns: int
+    errors: int
+    turn_p50_ms: float
+    turn_p95_ms: float
+    overhead_ms: float  # Mean per turn, excluding network and llm
+    phases_ms: Dict[str, float] = field(default_factory=dict)  # Mean per turn
+
+
+def measure(mode: Mode, env: Env, conversations: int, llm_latency: float) -> AgentResult:
+    """Run `conversations` scripted conversations through one integration"""
+    start = mode.setup(env)
+    builder = SystemPromptBuilder(env.client())
+    probe = Probe()
+    turns: List[Dict[str, float]] = []
+    errors: List[BaseException] = []
+
+    with instrument(probe):
+        converse(start(-1), builder, env.ids(-1, env.containers), probe, llm_latency)  # warm up
+        for conversation in range(conversations):
+            try:
+                turns += converse(start(conversation), builder, env.ids(conversation, env.containers), probe, llm_latency)
+            except Exception as e:
+                errors.append(e)
+
+    if errors:
+        print(f"  {mode.name}: {len(errors)} errors, first: {errors[0]!r}", file=sys.stderr)
+
+    totals = sorted(t["total"] for t in turns)
+    phases = {
+        name: statistics.fmean(t[name] for t in turns) if turns else 0.0
+        for name in PHASES + ("dispatch",)
+    }
+    return AgentResult(
+        mode=mode.name,
+        conversations=conversations,
+        turns=len(turns),
+        errors=len(errors),
+        turn_p50_ms=percentile(totals, 0.50),
+        turn_p95_ms=percentile(totals, 0.95),
+        overhead_ms=statistics.fmean(t["total"] - t["network"] - t["llm"] for t in turns) if turns else 0.0,
+        phases_ms=phases,
+    )
+
+
+def print_table(results: List[AgentResult]) -> None:
+    columns = PHASES[:-1] + ("dispatch", "llm")
+    header = (
+        f"{'mode':<24}{'turns':>7}{'p50 ms':>9}{'p95 ms':>9}"
+        + "".join(f"{name:>12}" for name in columns)
+        + f"{'overhead':>10}{'err':>5}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.mode:<24}{r.turns:>7}{r.turn_p50_ms:>9.2f}{r.turn_p95_ms:>9.2f}"
+            + "".join(f"{r.phases_ms[name]:>12.3f}" for name in columns)
+            + f"{r.overhead_ms:>10.3f}{r.errors:>5}"
+        )
+    print("\nPhase columns and overhead (everything but network and llm) are mean ms per turn.")
+
+
+def profile_key(args: argparse.Namespace) -> str:
+    atoms = args.atoms if args.atoms is not None else "recorded"
+    return (
+        f"agent atoms={atoms} containers={args.containers} latency={args.latency}ms "
+        f"jitter={args.jitter}ms llm={args.llm_latency}ms"
+    )
+
+
+def save_baselines(path: str, profile: str, results: List[AgentResult], calibration_ms: float) -> None:
+    baselines = load_baselines(path)
+    stored = baselines["profiles"].setdefault(profile, {"results": {}})
+    stored["recorded"] = {
+        "at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        "calibration_ms": round(calibration_ms, 3),
+    }
+    for r in results:
+        stored["results"][r.mode] = {
+            "overhead_ms": round(r.overhead_ms, 3),
+            "turn_p50_ms": round(r.turn_p50_ms, 3),
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions(
+    results: List[AgentResult],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    scale: float = 1.0,
+) -> List[str]:
+    """Integration overhead per turn worse than the baseline, scaled for machine speed"""
+    found = []
+    for r in results:
+        base = baseline.get(r.mode)
+        if base is None:
+            continue
+        if r.errors:
+            found.append(f"{r.mode}: {r.errors} errors")
+        expected = base["overhead_ms"] * scale
+        if r.overhead_ms > expected * (1 + tolerance) and r.overhead_ms - expected > MIN_LATENCY_DELTA_MS:
+            found.append(
+                f"{r.mode}: overhead {r.overhead_ms:.2f} ms/turn > {expected:.2f} ms expected "
+                f"(baseline {base['overhead_ms']:.2f} ms)"
+            )
+    return found
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks agent", description="GitChain agent tool-loop benchmark"
+    )
+    parser.add_argument("--mode", action="append", help="Mode name or glob (repeatable)")
+    parser.add_argument("--list", action="store_true", help="List modes and exit")
+    parser.add_argument("--conversations", type=int, default=20, help="Scripted conversations per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the lowest overhead counts")
+    parser.add_argument("--containers", type=int, default=5, help="Containers per conversation")
+    parser.add_argument("--atoms", type=int, help="Atoms per container (default: as recorded)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub response latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra stub latency in ms")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake model latency per turn in ms")
+    parser.add_argument("--baselines", default=BASELINES, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the baseline")
+    parser.add_argument("--no-check", action="store_true", help="Don't compare with the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.50, help="Allowed relative overhead regression")
+    parser.add_argument("--json", help="Also write results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if args.list:
+        for m in MODES:
+            print(f"{m.name:<24}{m.description}")
+        return 0
+
+    patterns = args.mode or ["*"]
+    selected = [m for m in MODES if any(fnmatch.fnmatch(m.name, p) for p in patterns)]
+    profile = profile_key(args)
+
+    results: List[AgentResult] = []
+    calibrations: List[float] = []
+    with StubAPI(atoms=args.atoms, latency=args.latency / 1000, jitter=args.jitter / 1000) as api:
+        env = Env(url=api.url, containers=args.containers)
+        print(f"Profile: {profile}, {args.conversations} conversations per run\n")
+        for mode in selected:
+            runs = []
+            try:
+                for _ in range(args.repeat):
+                    calibrations.append(calibrate())
+                    runs.append(measure(mode, env, args.conversations, args.llm_latency / 1000))
+            except Skip as e:
+                print(f"  {mode.name}: skipped ({e})", file=sys.stderr)
+                continue
+            results.append(min(runs, key=lambda r: r.overhead_ms))
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"profile": profile, "results": [asdict(r) for r in results]}, f, indent=2)
+
+    if args.save_baseline:
+        save_baselines(args.baselines, profile, results, min(calibrations, default=0.0))
+        print(f"\nBaseline saved for profile: {profile}")
+        return 0
+
+    if args.no_check:
+        return 0
+
+    stored = load_baselines(args.baselines)["profiles"].get(profile)
+    if stored is None:
+        print(f"\nNo baseline for profile '{profile}' (record one with --save-baseline)")
+        return 0
+
+    scale = 1.0
+    if calibrations and stored["recorded"].get("calibration_ms"):
+        scale = min(calibrations) / stored["recorded"]["calibration_ms"]
+
+    found = regressions(results, stored["results"], args.tolerance, scale)
+    if found:
+        print(f"\nREGRESSIONS against baseline recorded {stored['recorded']['at']}:")
+        for line in found:
+            print(f"  {line}")
+        return 1
+
+    print(f"\nNo regressions against baseline recorded {stored['recorded']['at']}")
+    return 0
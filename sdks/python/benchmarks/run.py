@@ -0,0 +1,399 @@
+"""
+Benchmark runner
+
+Usage (from sdks/python):
+    python -m benchmarks                          # all scenarios, checked against baselines
+    python -m benchmarks --scenario 'inject*' --concurrency 1,16 --requests 500
+    python -m benchmarks --atoms 1000 --latency 5 --jitter 5
+    python -m benchmarks --save-baseline          # record results as the new baseline
+
+Each measurement runs --repeat times, in rounds over all scenarios so a
+burst of load on the machine hits one run of many scenarios rather than
+every run of one, and the median run counts. Timings are compared after
+scaling by a reference workload measured alongside (see calibrate()).
+Results that look like timing regressions are measured again and only
+fail the check if the combined runs still regress. Exits with status 1 if
+a result regresses beyond the tolerances against the stored baseline for
+the same profile (atoms, containers per request, latency, jitter).
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .scenarios import SCENARIOS, Env, Operation, Skip
+from .stub import StubAPI, load_payload
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# Differences below these are noise, whatever the relative change
+MIN_LATENCY_DELTA_MS = 0.5
+MIN_ALLOC_DELTA_KIB = 16.0
+
+
+@dataclass
+class Result:
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    throughput: float  # Operations per second
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    alloc_peak_kib: float  # Peak traced allocation per operation
+    retained_kib: float  # Traced memory still held after all operations
+    rss_mib: float  # Process RSS after the scenario
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}@c{self.concurrency}"
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def rss_mib() -> float:
+    """Current resident set size, or peak RSS where /proc is unavailable"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def calibrate(rounds: int = 10) -> float:
+    """
+    Time a fixed CPU-bound workload (JSON round trips of the recorded payload)
+
+    The fastest of all calibrations in a run is stored with the baseline;
+    timings are compared after scaling by the ratio, so a slower machine
+    doesn't read as an SDK regression.
+    """
+    payload = json.dumps(load_payload())
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(50):
+            json.dumps(json.loads(payload))
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def measure(name: str, op: Operation, requests: int, concurrency: int, alloc_requests: int) -> Result:
+    """Time `requests` operations on `concurrency` threads, then trace allocations serially"""
+    for i in range(3):
+        op(i)
+
+    latencies: List[float] = []
+    errors: List[BaseException] = []
+
+    def timed(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            op(i)
+        except Exception as e:
+            errors.append(e)
+            return
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, range(requests)))
+    wall = time.perf_counter() - started
+
+    if errors:
+        print(f"  {name}: {len(errors)} errors, first: {errors[0]!r}", file=sys.stderr)
+
+    peaks: List[float] = []
+    if not alloc_requests:
+        return _result(name, concurrency, requests, errors, latencies, wall, peaks, 0.0)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for i in range(alloc_requests):
+        before, _ = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        try:
+            op(i)
+        except Exception:
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append((peak - before) / 1024)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return _result(name, concurrency, requests, errors, latencies, wall, peaks, max(retained - baseline, 0) / 1024)
+
+
+def _result(
+    name: str,
+    concurrency: int,
+    requests: int,
+    errors: List[BaseException],
+    latencies: List[float],
+    wall: float,
+    peaks: List[float],
+    retained_kib: float,
+) -> Result:
+    latencies.sort()
+    return Result(
+        scenario=name,
+        concurrency=concurrency,
+        requests=requests,
+        errors=len(errors),
+        throughput=len(latencies) / wall if wall else 0.0,
+        mean_ms=statistics.fmean(latencies) if latencies else 0.0,
+        p50_ms=percentile(latencies, 0.50),
+        p95_ms=percentile(latencies, 0.95),
+        p99_ms=percentile(latencies, 0.99),
+        alloc_peak_kib=statistics.median(peaks) if peaks else 0.0,
+        retained_kib=retained_kib,
+        rss_mib=rss_mib(),
+    )
+
+
+def median_of(runs: List[Result]) -> Result:
+    """Median of each timing over runs, keeping the first run's allocation figures"""
+    timings = ("throughput", "mean_ms", "p50_ms", "p95_ms", "p99_ms")
+    return Result(**{
+        **asdict(runs[-1]),
+        **{name: statistics.median(getattr(r, name) for r in runs) for name in timings},
+        "errors": max(r.errors for r in runs),
+        "alloc_peak_kib": runs[0].alloc_peak_kib,
+        "retained_kib": runs[0].retained_kib,
+    })
+
+
+def measure_rounds(
+    ops: Dict[Tuple[str, int], Operation],
+    args: argparse.Namespace,
+    runs: Dict[Tuple[str, int], List[Result]],
+    calibrations: List[float],
+    trace_allocations: bool,
+) -> None:
+    """Append --repeat runs of every operation to `runs`, one round at a time"""
+    for n in range(args.repeat):
+        for (name, concurrency), op in ops.items():
+            calibrations.append(calibrate())
+            alloc_requests = args.alloc_requests if trace_allocations and n == 0 else 0
+            runs.setdefault((name, concurrency), []).append(
+                measure(name, op, args.requests, concurrency, alloc_requests)
+            )
+
+
+def print_table(results: List[Result]) -> None:
+    header = (
+        f"{'scenario':<28}{'conc':>5}{'ops/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'alloc KiB':>11}{'kept KiB':>10}{'RSS MiB':>9}{'err':>5}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.scenario:<28}{r.concurrency:>5}{r.throughput:>10.1f}{r.p50_ms:>9.2f}{r.p95_ms:>9.2f}"
+            f"{r.p99_ms:>9.2f}{r.alloc_peak_kib:>11.1f}{r.retained_kib:>10.1f}{r.rss_mib:>9.1f}{r.errors:>5}"
+        )
+
+
+def profile_key(args: argparse.Namespace) -> str:
+    atoms = args.atoms if args.atoms is not None else "recorded"
+    return f"atoms={atoms} containers={args.containers} latency={args.latency}ms jitter={args.jitter}ms"
+
+
+def load_baselines(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"profiles": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(path: str, profile: str, results: List[Result], calibration_ms: float) -> None:
+    baselines = load_baselines(path)
+    stored = baselines["profiles"].setdefault(profile, {"results": {}})
+    stored["recorded"] = {
+        "at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(terse=True),
+        "calibration_ms": round(calibration_ms, 3),
+    }
+    for r in results:
+        stored["results"][r.key] = {
+            "throughput": round(r.throughput, 1),
+            "p50_ms": round(r.p50_ms, 3),
+            "p95_ms": round(r.p95_ms, 3),
+            "p99_ms": round(r.p99_ms, 3),
+            "alloc_peak_kib": round(r.alloc_peak_kib, 1),
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions(
+    results: List[Result],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    alloc_tolerance: float,
+    scale: float = 1.0,
+) -> List[str]:
+    """
+    Human-readable regressions against one baseline profile
+
+    `scale` is the current reference workload time over the baseline's
+    (>1 when this machine is currently slower).
+    """
+    found = []
+    for r in results:
+        base = baseline.get(r.key)
+        if base is None:
+            continue
+        if r.errors:
+            found.append(f"{r.key}: {r.errors} errors")
+        # With a single core, concurrent workers and the stub mostly measure the scheduler
+        timing = r.concurrency == 1 or (os.cpu_count() or 1) > 1
+        expected_throughput = base["throughput"] / scale
+        expected_p50 = base["p50_ms"] * scale
+        if timing and r.throughput < expected_throughput * (1 - tolerance):
+            found.append(
+                f"{r.key}: throughput {r.throughput:.1f} ops/s < {expected_throughput:.1f} expected (baseline {base['throughput']:.1f})"
+            )
+        # Tail latencies are reported but too noisy on shared machines to gate on
+        if timing and r.p50_ms > expected_p50 * (1 + tolerance) and r.p50_ms - expected_p50 > MIN_LATENCY_DELTA_MS:
+            found.append(f"{r.key}: p50 {r.p50_ms:.2f} ms > {expected_p50:.2f} ms expected (baseline {base['p50_ms']:.2f} ms)")
+        alloc = r.alloc_peak_kib
+        if (
+            alloc > base["alloc_peak_kib"] * (1 + alloc_tolerance)
+            and alloc - base["alloc_peak_kib"] > MIN_ALLOC_DELTA_KIB
+        ):
+            found.append(f"{r.key}: alloc {alloc:.1f} KiB > baseline {base['alloc_peak_kib']:.1f} KiB")
+    return found
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="GitChain SDK benchmarks")
+    parser.add_argument("--scenario", action="append", help="Scenario name or glob (repeatable)")
+    parser.add_argument("--list", action="store_true", help="List scenarios and exit")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated worker counts")
+    parser.add_argument("--requests", type=int, default=200, help="Operations per scenario and concurrency")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the median counts")
+    parser.add_argument("--alloc-requests", type=int, default=20, help="Operations traced for allocations")
+    parser.add_argument("--containers", type=int, default=5, help="Containers per inject request")
+    parser.add_argument("--atoms", type=int, help="Atoms per container (default: as recorded)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub response latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra stub latency in ms")
+    parser.add_argument("--baselines", default=BASELINES, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the baseline")
+    parser.add_argument("--no-check", action="store_true", help="Don't compare with the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.50, help="Allowed relative timing regression")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10, help="Allowed relative allocation growth")
+    parser.add_argument("--json", help="Also write results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if args.list:
+        for s in SCENARIOS:
+            print(f"{s.name:<28}{s.description}")
+        return 0
+
+    patterns = args.scenario or ["*"]
+    selected = [s for s in SCENARIOS if any(fnmatch.fnmatch(s.name, p) for p in patterns)]
+    concurrencies = [int(c) for c in args.concurrency.split(",") if c]
+
+    profile = profile_key(args)
+    stored = None
+    if not (args.save_baseline or args.no_check):
+        stored = load_baselines(args.baselines)["profiles"].get(profile)
+
+    calibrations: List[float] = []
+    runs: Dict[Tuple[str, int], List[Result]] = {}
+    with StubAPI(atoms=args.atoms, latency=args.latency / 1000, jitter=args.jitter / 1000) as api:
+        env = Env(url=api.url, containers=args.containers)
+        print(f"Profile: {profile}, {args.requests} requests per run, {args.repeat} runs\n")
+        ops: Dict[Tuple[str, int], Operation] = {}
+        for scenario in selected:
+            for concurrency in concurrencies:
+                try:
+                    ops[(scenario.name, concurrency)] = scenario.setup(env)
+                except Skip as e:
+                    print(f"  {scenario.name}: skipped ({e})", file=sys.stderr)
+                    break
+        measure_rounds(ops, args, runs, calibrations, trace_allocations=True)
+        results = [median_of(r) for r in runs.values()]
+
+        scale = 1.0
+        if stored is not None and calibrations and stored["recorded"].get("calibration_ms"):
+            scale = min(calibrations) / stored["recorded"]["calibration_ms"]
+
+        # One slow stretch can push a median over the tolerance; a real
+        # regression still shows after measuring again
+        if stored is not None:
+            flagged = {
+                key: op for key, op in ops.items()
+                if regressions([median_of(runs[key])], stored["results"], args.tolerance, float("inf"), scale)
+            }
+            if flagged:
+                print(f"\nMeasuring {len(flagged)} result(s) again to confirm regressions", file=sys.stderr)
+                measure_rounds(flagged, args, runs, calibrations, trace_allocations=False)
+                results = [median_of(r) for r in runs.values()]
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"profile": profile, "results": [asdict(r) for r in results]}, f, indent=2)
+
+    if args.save_baseline:
+        save_baselines(args.baselines, profile, results, min(calibrations, default=0.0))
+        print(f"\nBaseline saved for profile: {profile}")
+        return 0
+
+    if args.no_check:
+        return 0
+
+    if stored is None:
+        print(f"\nNo baseline for profile '{profile}' (record one with --save-baseline)")
+        return 0
+
+    if scale != 1.0:
+        print(f"\nMachine speed relative to baseline: {1 / scale:.2f}x (timings scaled accordingly)")
+
+    found = regressions(results, stored["results"], args.tolerance, args.alloc_tolerance, scale)
+    if found:
+        print(f"\nREGRESSIONS against baseline recorded {stored['recorded']['at']}:")
+        for line in found:
+            print(f"  {line}")
+        return 1
+
+    print(f"\nNo regressions against baseline recorded {stored['recorded']['at']}")
+    return 0
@@ -0,0 +1,167 @@
+"""
+Benchmark scenarios
+
+A scenario sets up SDK objects against the stub API and returns the
+operation to time. Operations take the request number, so concurrent
+workers spread over different container IDs.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+import gitchain
+from gitchain import GitChainClient, SystemPromptBuilder, inject_batch
+from gitchain.langchain import LANGCHAIN_AVAILABLE
+from gitchain.openai import GitChainFunctionHandler
+
+
+class Skip(Exception):
+    """Scenario can't run in this environment (e.g. optional dependency missing)"""
+
+
+@dataclass
+class Env:
+    """What scenarios may use"""
+    url: str
+    containers: int  # Containers per inject request
+    catalogue: int = 1000  # Distinct container IDs cycled through
+
+    def ids(self, i: int, count: int = 1) -> List[str]:
+        return [
+            f"0711:product:bench:{(i * count + n) % self.catalogue:07d}:v1"
+            for n in range(count)
+        ]
+
+    def client(self, **kwargs: Any) -> GitChainClient:
+        return GitChainClient(api_url=self.url, **kwargs)
+
+
+Operation = Callable[[int], Any]
+
+
+@dataclass
+class Scenario:
+    name: str
+    setup: Callable[[Env], Operation]
+    description: str = ""
+
+
+def _get_container(env: Env) -> Operation:
+    client = env.client()
+    return lambda i: client.get_container(env.ids(i)[0])
+
+
+def _get_container_cached(env: Env) -> Operation:
+    client = env.client(cache_ttl=3600)
+    # Small working set, so nearly all reads are hits
+    return lambda i: client.get_container(env.ids(i % 20)[0])
+
+
+def _inject_markdown(env: Env) -> Operation:
+    client = env.client()
+    return lambda i: client.inject(env.ids(i, env.containers))
+
+
+def _inject_json_fields(env: Env) -> Operation:
+    client = env.client()
+    return lambda i: client.inject(
+        env.ids(i, env.containers), verify=False, format="json", fields=["leistung.*", "effizienz.*"]
+    )
+
+
+def _inject_function(env: Env) -> Operation:
+    # The convenience function builds a client per call when given an API key
+    return lambda i: gitchain.inject(env.ids(i, env.containers), api_url=env.url, api_key="bench")
+
+
+def _inject_batch(env: Env) -> Operation:
+    return lambda i: inject_batch(
+        [env.ids(i * 4 + n, env.containers) for n in range(4)], api_url=env.url, api_key="bench"
+    )
+
+
+def _verify(env: Env) -> Operation:
+    # No proof cache, so every call is a request
+    client = env.client(proof_ttl=None)
+    return lambda i: client.verify(env.ids(i)[0])
+
+
+def _verify_cached(env: Env) -> Operation:
+    client = env.client()
+    # Small working set, so nearly all calls are answered from recent proofs
+    return lambda i: client.verify(env.ids(i % 20)[0])
+
+
+def _verify_batch(env: Env) -> Operation:
+    client = env.client(proof_ttl=None)
+    return lambda i: client.verify_batch(env.ids(i, env.containers))
+
+
+def _openai_function_call(env: Env) -> Operation:
+    handler = GitChainFunctionHandler(client=env.client())
+    return lambda i: handler.handle_function_call(
+        "gitchain_inject", {"container_ids": env.ids(i, env.containers)}
+    )
+
+
+def _openai_tool_calls(env: Env) -> Operation:
+    handler = GitChainFunctionHandler(client=env.client())
+
+    def run(i: int) -> Any:
+        ids = env.ids(i, env.containers)
+        calls = [
+            {"id": f"call_{n}", "function": {"name": "gitchain_inject", "arguments": {"container_ids": [cid]}}}
+            for n, cid in enumerate(ids)
+        ]
+        calls.append({"id": "call_verify", "function": {"name": "gitchain_verify", "arguments": {"container_id": ids[0]}}})
+        return handler.handle_tool_calls(calls)
+
+    return run
+
+
+def _system_prompt(env: Env) -> Operation:
+    builder = SystemPromptBuilder(env.client())
+    return lambda i: builder.build(env.ids(i, env.containers))
+
+
+def _langchain_inject_tool(env: Env) -> Operation:
+    if not LANGCHAIN_AVAILABLE:
+        raise Skip("langchain not installed")
+    from gitchain.langchain import GitChainInjectTool
+
+    tool = GitChainInjectTool(client=env.client())
+    return lambda i: tool._run(env.ids(i, env.containers))
+
+
+def _langchain_retriever(env: Env) -> Operation:
+    if not LANGCHAIN_AVAILABLE:
+        raise Skip("langchain not installed")
+    from gitchain.langchain import GitChainRetriever
+
+    client = env.client()
+
+    def run(i: int) -> Any:
+        retriever = GitChainRetriever(container_ids=env.ids(i, env.containers), client=client)
+        return retriever._get_relevant_documents("heat pump efficiency")
+
+    return run
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("get_container", _get_container, "GitChainClient.get_container"),
+    Scenario("get_container_cached", _get_container_cached, "get_container with cache_ttl"),
+    Scenario("inject", _inject_markdown, "GitChainClient.inject, markdown, verified"),
+    Scenario("inject_json_fields", _inject_json_fields, "inject, json, fields projection"),
+    Scenario("inject_function", _inject_function, "gitchain.inject convenience function"),
+    Scenario("inject_batch", _inject_batch, "gitchain.inject_batch, 4 sets"),
+    Scenario("verify", _verify, "GitChainClient.verify"),
+    Scenario("verify_cached", _verify_cached, "verify with proof_ttl"),
+    Scenario("verify_batch", _verify_batch, "GitChainClient.verify_batch"),
+    Scenario("openai_function_call", _openai_function_call, "GitChainFunctionHandler.handle_function_call"),
+    Scenario("openai_tool_calls", _openai_tool_calls, "GitChainFunctionHandler.handle_tool_calls"),
+    Scenario("system_prompt", _system_prompt, "SystemPromptBuilder.build"),
+    Scenario("langchain_inject_tool", _langchain_inject_tool, "GitChainInjectTool"),
+    Scenario("langchain_retriever", _langchain_retriever, "GitChainRetriever"),
+]
+
+BY_NAME: Dict[str, Scenario] = {s.name: s for s in SCENARIOS}
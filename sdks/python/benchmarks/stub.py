@@ -0,0 +1,414 @@
+"""
+Local stub of the GitChain API
+
+Replays a recorded product container for every requested ID, scaled to a
+configurable number of atoms, with configurable latency. Runs in its own
+process so its CPU time and allocations don't show up in client
+measurements.
+
+Example:
+    with StubAPI(atoms=200, latency=0.005) as api:
+        client = GitChainClient(api_url=api.url)
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from gitchain import wire
+from gitchain.types import TRUST_PRIORITY, field_glob_regex, project_fields
+
+PAYLOAD_DIR = os.path.join(os.path.dirname(__file__), "payloads")
+DEFAULT_PAYLOAD = "product_8738208680"
+
+CONTAINER_ID = re.compile(r"^0711:([^:]+):([^:]+):([^:]+)(?::v(\d+))?$")
+
+
+def load_payload(name: str = DEFAULT_PAYLOAD, atoms: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Recorded container and verification payloads
+
+    Args:
+        name: File name in payloads/ without .json
+        atoms: Scale the container to this many atoms by repeating the
+            recorded ones under numbered paths (default: as recorded)
+    """
+    with open(os.path.join(PAYLOAD_DIR, f"{name}.json"), encoding="utf-8") as f:
+        payload = json.load(f)
+
+    container = payload["container"]
+    if atoms is not None:
+        recorded = list(container["atoms"].items())
+        scaled = {}
+        for i in range(atoms):
+            path, atom = recorded[i % len(recorded)]
+            scaled[path if i < len(recorded) else f"{path}_{i // len(recorded)}"] = atom
+        container["atoms"] = scaled
+        container["data"]["specs"] = {path: atom["value"] for path, atom in scaled.items()}
+    return payload
+
+
+def _js(value: Any) -> str:
+    """Value as a JavaScript template literal prints it (numbers and strings as is)"""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def render_markdown(container: Dict[str, Any]) -> str:
+    """Markdown section as rendered by renderMarkdown() in apps/api/src/services/artifacts.ts"""
+    data = container["data"]
+    out = f"# {data.get('name') or container['identifier']}\n\n"
+    out += f"**Container ID:** `{container['id']}`\n"
+    out += f"**Type:** {container['type']}\n"
+    out += f"**Namespace:** {container['namespace']}\n\n"
+    if data.get("description"):
+        out += f"## Description\n{data['description']}\n\n"
+    specs = data.get("specs") or data.get("specifications")
+    if specs:
+        out += "## Specifications\n"
+        for key, value in specs.items():
+            out += f"- **{key}:** {_js(value)}\n"
+        out += "\n"
+    if container.get("atoms"):
+        out += "## Data\n"
+        for path, atom in container["atoms"].items():
+            unit = f" {atom['unit']}" if atom.get("unit") else ""
+            out += f"- **{path}:** {_js(atom.get('value'))}{unit} _({atom.get('trust')})_\n"
+        out += "\n"
+    return out + "---\n\n"
+
+
+def render_json(container: Dict[str, Any]) -> str:
+    """JSON array element as rendered by renderJSON() in apps/api/src/services/artifacts.ts"""
+    data = container["data"]
+    value = {**data, "atoms": container["atoms"]} if container.get("atoms") else data
+    return "\n".join("  " + line for line in json.dumps(value, indent=2).split("\n"))
+
+
+def join_fragments(fragments: List[str], format: str) -> str:
+    """joinFragments() in apps/api/src/services/artifacts.ts"""
+    if format == "json":
+        return "[\n" + ",\n".join(fragments) + "\n]" if fragments else "[]"
+    return "".join(fragments)
+
+
+class Normalizer:
+    """Python port of PayloadNormalizer in apps/api/src/services/atoms.ts"""
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, List[Any]] = {
+            "documents": [], "citations": [], "contributors": [], "units": [], "commits": []
+        }
+        self._indexes: Dict[str, Dict[Any, int]] = {name: {} for name in self.tables}
+
+    def atoms(self, atoms: Dict[str, Any]) -> Tuple[Dict[str, Any], List[int]]:
+        """Atoms with table indexes, and the indexes of the citations they reference"""
+        normalized = {}
+        for path, atom in atoms.items():
+            a = dict(atom)
+            if a.get("unit") is not None:
+                a["unit"] = self._intern("units", a["unit"])
+            if a.get("source"):
+                a["source"] = {**a["source"], "contributor_id": self._intern("contributors", a["source"]["contributor_id"])}
+            if a.get("commit") is not None:
+                a["commit"] = self._intern("commits", a["commit"])
+            if a.get("citation"):
+                a["citation"] = {**a["citation"], "document": self._intern("documents", a["citation"]["document"])}
+            normalized[path] = a
+
+        # citationsFromAtoms(): distinct by document and page
+        refs: Dict[str, Dict[str, Any]] = {}
+        for atom in atoms.values():
+            c = atom.get("citation")
+            if c:
+                refs.setdefault(f"{c['document']}#{c.get('page') or ''}", c)
+        return normalized, [self._citation(c) for c in refs.values()]
+
+    def _citation(self, c: Dict[str, Any]) -> int:
+        key = f"{c['document']}#{c.get('page') or ''}#{c.get('excerpt') or ''}"
+        index = self._indexes["citations"].get(key)
+        if index is None:
+            index = self._indexes["citations"][key] = len(self.tables["citations"])
+            row = {"document": self._intern("documents", c["document"])}
+            row.update({k: v for k, v in (("page", c.get("page")), ("quote", c.get("excerpt"))) if v is not None})
+            self.tables["citations"].append(row)
+        return index
+
+    def _intern(self, table: str, value: Any) -> int:
+        index = self._indexes[table].get(value)
+        if index is None:
+            index = self._indexes[table][value] = len(self.tables[table])
+            self.tables[table].append(value)
+        return index
+
+
+class _Replay:
+    """Builds responses from the recorded payload"""
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.container = payload["container"]
+        self.verification = payload["verify"]
+        # Artifacts are rendered from the container row, which has no atoms
+        self._markdown = render_markdown({k: v for k, v in self.container.items() if k != "atoms"})
+        self._template_id = self.container["id"]
+        self._artifact_ids: Dict[str, str] = {}
+
+    def container_for(self, container_id: str) -> Optional[Dict[str, Any]]:
+        match = CONTAINER_ID.match(container_id)
+        if not match:
+            return None
+        type_, namespace, identifier, version = match.groups()
+        return {
+            **self.container,
+            "id": container_id if version else f"{container_id}:v1",
+            "type": type_,
+            "namespace": namespace,
+            "identifier": identifier,
+            "version": int(version or 1),
+        }
+
+    def get(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """GET /api/containers/{id} response"""
+        container = self.container_for(container_id)
+        return {"data": {"container": container, "role": None, "starred": False}} if container else None
+
+    def bulk(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /api/containers/bulk response"""
+        return {"data": {"containers": [c for c in map(self.container_for, body.get("ids", [])) if c]}}
+
+    def context_hash(self, container_id: str) -> str:
+        h = hashlib.sha256(container_id.encode()).hexdigest()
+        self._artifact_ids[h] = container_id
+        return h
+
+    def fragment(self, container_id: str, format: str) -> str:
+        """Artifact of an unprojected container"""
+        if format == "markdown":
+            return self._markdown.replace(self._template_id, container_id)
+        return render_json({"data": self.container["data"]})
+
+    def atoms(self, fields: Optional[List[str]], min_trust: Optional[str]) -> Dict[str, Any]:
+        """Recorded atoms filtered like AtomService.getAllAtoms(fields, trustMin)"""
+        globs = [field_glob_regex(f) for f in fields or []]
+        max_priority = TRUST_PRIORITY.get(min_trust or "", len(TRUST_PRIORITY))
+        return {
+            path: atom for path, atom in self.container["atoms"].items()
+            if (not globs or any(g.match(path) for g in globs))
+            and TRUST_PRIORITY.get(atom.get("trust"), len(TRUST_PRIORITY) + 1) <= max_priority
+        }
+
+    def inject(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /api/inject response, as built by the route in apps/api/src/index.ts"""
+        fields = body.get("fields")
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+        min_trust = body.get("minTrust")
+        format = body.get("format", "markdown")
+        projected = bool(fields or min_trust)
+
+        containers = []
+        for container_id in body.get("containers", []):
+            c = self.container_for(container_id) if isinstance(container_id, str) else None
+            if c is None:
+                continue
+            if projected:
+                data = project_fields(c["data"], [field_glob_regex(f) for f in fields]) if fields else c["data"]
+                c = {**c, "data": data, "atoms": self.atoms(fields, min_trust)}
+            else:
+                c = {k: v for k, v in c.items() if k != "atoms"}
+            containers.append(c)
+
+        if projected:
+            fragments = [(render_json if format == "json" else render_markdown)(c) for c in containers]
+        else:
+            fragments = [self.fragment(c["id"], format) for c in containers]
+        formatted = join_fragments(fragments, format)
+        is_verified = bool(self.container.get("chain"))
+        verified = bool(body.get("verify", True)) and bool(containers) and is_verified
+
+        def row(c: Dict[str, Any]) -> Dict[str, Any]:
+            out = {k: c[k] for k in ("id", "type", "namespace", "identifier", "version", "data")}
+            if not projected:
+                out["contextHash"] = self.context_hash(c["id"])
+            return out
+
+        if body.get("normalize") is True:
+            normalizer = Normalizer()
+            citations: Dict[int, None] = {}
+            rows = []
+            for c in containers:
+                out = row(c)
+                if c.get("atoms") is not None:
+                    out["atoms"], out["citations"] = normalizer.atoms(c["atoms"])
+                    citations.update(dict.fromkeys(out["citations"]))
+                out["verified"] = is_verified
+                rows.append(out)
+            return {"data": {
+                "normalized": True,
+                "tables": normalizer.tables,
+                "containers": rows,
+                "citations": list(citations),
+                "formatted": formatted,
+                "tokenCount": (len(formatted) + 3) // 4,
+                "verified": verified,
+                "containerCount": len(containers),
+            }}
+
+        rows = []
+        for c in containers:
+            out = row(c)
+            if c.get("atoms") is not None:
+                out["atoms"] = c["atoms"]
+            out["verified"] = is_verified
+            rows.append(out)
+        return {"data": {
+            "containers": rows,
+            "formatted": formatted,
+            "tokenCount": (len(formatted) + 3) // 4,
+            "verified": verified,
+            "containerCount": len(containers),
+        }}
+
+    def artifacts(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /api/artifacts response"""
+        format = body.get("format", "markdown")
+        found = []
+        for h in body.get("hashes", []):
+            if h in self._artifact_ids:
+                content = self.fragment(self._artifact_ids[h], format)
+                found.append({"hash": h, "format": format, "content": content, "tokenCount": (len(content) + 3) // 4})
+        return {"data": {"artifacts": found}}
+
+    def verify(self, hash_or_id: str) -> Dict[str, Any]:
+        return {**self.verification, "containerId": hash_or_id}
+
+    def verify_batch(self, container_ids: List[str]) -> Dict[str, Any]:
+        return {
+            "verified": True,
+            "containers": [{"id": i, "verified": True} for i in container_ids],
+            "proofs": [self._proof(i) for i in container_ids],
+        }
+
+    def _proof(self, container_id: str) -> Dict[str, Any]:
+        chain = self.verification["chain"]
+        return {
+            "containerId": container_id,
+            "verified": True,
+            "network": chain["network"],
+            "batchId": chain["batchId"],
+            "txHash": chain["txHash"],
+            "blockNumber": chain["blockNumber"],
+            "verifiedAt": chain["verifiedAt"],
+        }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load
+    request_queue_size = 128
+
+
+def _serve(conn, payload_name: str, atoms: Optional[int], latency: float, jitter: float, seed: int) -> None:
+    replay = _Replay(load_payload(payload_name, atoms))
+    rng = random.Random(seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path.startswith("/api/containers/"):
+                self._reply(replay.get(path[len("/api/containers/"):]))
+            elif path.startswith("/api/verify/"):
+                self._reply(replay.verify(path[len("/api/verify/"):]))
+            else:
+                self._reply(None)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            path = self.path.split("?")[0]
+            if path == "/api/inject":
+                self._reply(replay.inject(body))
+            elif path == "/api/containers/bulk":
+                self._reply(replay.bulk(body))
+            elif path == "/api/artifacts":
+                self._reply(replay.artifacts(body))
+            elif path == "/api/verify/batch":
+                self._reply(replay.verify_batch(body.get("containers", [])))
+            else:
+                self._reply(None)
+
+        def _reply(self, result: Optional[Dict[str, Any]]) -> None:
+            delay = latency + (rng.uniform(0, jitter) if jitter else 0)
+            if delay:
+                time.sleep(delay)
+            status = 200 if result is not None else 404
+            result = result if result is not None else {"error": "Not found"}
+            if wire.MSGPACK_AVAILABLE and wire.MSGPACK_TYPE in (self.headers.get("Accept") or ""):
+                content_type, body = wire.MSGPACK_TYPE, wire.dumps_msgpack(result)
+            else:
+                content_type, body = "application/json", json.dumps(result).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = _Server(("127.0.0.1", 0), Handler)
+    conn.send(server.server_address[1])
+    server.serve_forever()
+
+
+class StubAPI:
+    """Stub API server running in a child process"""
+
+    def __init__(
+        self,
+        payload: str = DEFAULT_PAYLOAD,
+        atoms: Optional[int] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            payload: Recorded payload in payloads/
+            atoms: Atoms per container (default: as recorded)
+            latency: Seconds added to every response
+            jitter: Up to this many seconds added on top, uniformly random
+            seed: Seed for the jitter
+        """
+        self.args = (payload, atoms, latency, jitter, seed)
+        self.port: Optional[int] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "StubAPI":
+        parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child, *self.args), daemon=True)
+        self._process.start()
+        self.port = parent.recv()
+        return self
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self) -> "StubAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,77 @@
+"""
+Wire format benchmark
+
+Compares JSON and MessagePack for the responses the SDK negotiates the
+binary format on: a single container, inject (plain and normalized) and
+batch verification. Bodies are encoded the way the API does, then each is
+measured for size and `gitchain.wire.loads` decode time. No server is
+involved.
+
+Usage (from sdks/python, needs msgpack installed):
+    python -m benchmarks wire
+    python -m benchmarks wire --atoms 2000 --containers 50
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from typing import Any, Dict, List, Optional, Tuple
+
+from gitchain import wire
+
+from .stub import _Replay, load_payload
+
+
+def responses(atoms: Optional[int], containers: int) -> List[Tuple[str, Dict[str, Any]]]:
+    replay = _Replay(load_payload(atoms=atoms))
+    ids = [f"0711:product:bosch:{i}:v1" for i in range(containers)]
+    return [
+        ("container", replay.container_for(ids[0]) or {}),
+        # Only projected injects carry atoms, which is what normalization shares
+        ("inject", replay.inject({"containers": ids, "format": "json", "fields": ["*"]})),
+        ("inject_normalized", replay.inject({"containers": ids, "format": "json", "fields": ["*"], "normalize": True})),
+        ("verify_batch", replay.verify_batch(ids)),
+    ]
+
+
+def decode_ms(body: bytes, number: int, repeat: int) -> float:
+    """Best average decode time of `repeat` runs"""
+    return min(timeit.repeat(lambda: wire.loads(body), number=number, repeat=repeat)) / number * 1000
+
+
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks wire", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--atoms", type=int, default=500, help="Atoms per container")
+    parser.add_argument("--containers", type=int, default=10, help="Containers per inject/verify")
+    parser.add_argument("--number", type=int, default=20, help="Decodes per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs (best is reported)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if not wire.MSGPACK_AVAILABLE:
+        print("msgpack is not installed (pip install gitchain[msgpack])", file=sys.stderr)
+        return 1
+
+    print(f"{args.atoms} atoms per container, {args.containers} containers per inject/verify\n")
+    header = (
+        f"{'response':<20}{'JSON KiB':>10}{'msgpack KiB':>13}{'ratio':>7}"
+        f"{'JSON ms':>10}{'msgpack ms':>12}{'speedup':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, response in responses(args.atoms, args.containers):
+        as_json = json.dumps(response).encode()
+        as_msgpack = wire.dumps_msgpack(response)
+        assert wire.loads(as_msgpack) == wire.loads(as_json), name
+
+        json_ms = decode_ms(as_json, args.number, args.repeat)
+        msgpack_ms = decode_ms(as_msgpack, args.number, args.repeat)
+        print(
+            f"{name:<20}{len(as_json) / 1024:>10.1f}{len(as_msgpack) / 1024:>13.1f}"
+            f"{len(as_json) / len(as_msgpack):>6.2f}x"
+            f"{json_ms:>10.3f}{msgpack_ms:>12.3f}{json_ms / msgpack_ms:>8.2f}x"
+        )
+    return 0
@@ -19,16 +19,44 @@ Example:
     )
 """
 
+from .cache import ContainerCache
 from .client import GitChainClient
+from .formatter import ContextFormatter, format_context
 from .inject import inject, inject_batch
-from .types import Container, InjectedContext, Citation, ChainProof
+from .mirror import LocalMirror
+from .prompt import SystemPromptBuilder
+from .scheduler import RateLimitScheduler
+from .session import ContextSession
+from .shared_cache import SharedCache
+from .types import (
+    Container,
+    ContainerDelta,
+    ContextArtifact,
+    InjectedContext,
+    Citation,
+    ChainProof,
+    SearchHit,
+)
+from .webhooks import WebhookListener
 
 __version__ = "0.1.0"
 __all__ = [
     "GitChainClient",
     "inject",
     "inject_batch",
+    "RateLimitScheduler",
+    "ContainerCache",
+    "SharedCache",
+    "LocalMirror",
+    "ContextSession",
+    "SystemPromptBuilder",
+    "ContextFormatter",
+    "format_context",
+    "WebhookListener",
     "Container",
+    "ContainerDelta",
+    "ContextArtifact",
+    "SearchHit",
     "InjectedContext",
     "Citation",
     "ChainProof",
@@ -0,0 +1,195 @@
+"""
+In-memory container cache and background refresher
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+_VERSION_SUFFIX = re.compile(r":(v\d+|latest)$")
+
+
+def container_base_id(container_id: str) -> str:
+    """Container ID without its version suffix (":v3", ":latest")"""
+    return _VERSION_SUFFIX.sub("", container_id)
+
+
+@dataclass
+class CacheEntry:
+    """Cached value with expiry and access bookkeeping"""
+    value: Any
+    expires_at: float
+    hits: int = 0
+    last_access: float = 0.0
+
+
+class ContainerCache:
+    """
+    Thread-safe TTL cache keyed by container ID
+
+    Counts hits per entry so a refresher can keep frequently used entries
+    warm and let cold ones expire.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                del self._entries[key]
+                return None
+            entry.hits += 1
+            entry.last_access = now
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, keeping the hit count of an entry being refreshed"""
+        now = time.monotonic()
+        expires_at = now + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.value = value
+                entry.expires_at = expires_at
+                return
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[key] = CacheEntry(value=value, expires_at=expires_at, last_access=now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, container_id: str) -> List[str]:
+        """
+        Drop every version of a container (including ":latest" aliases)
+
+        Returns:
+            Removed keys
+        """
+        base = container_base_id(container_id)
+        with self._lock:
+            keys = [k for k in self._entries if container_base_id(k) == base]
+            for key in keys:
+                del self._entries[key]
+        return keys
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def expiring(self, within: float, min_hits: int = 1) -> List[str]:
+        """
+        Keys expiring within `within` seconds that were used at least
+        `min_hits` times since they were last stored, hottest first
+
+        Hit counts of the returned keys are reset so each refresh cycle
+        measures fresh access frequency.
+        """
+        deadline = time.monotonic() + within
+        with self._lock:
+            due = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if entry.expires_at <= deadline and entry.hits >= min_hits
+            ]
+            due.sort(key=lambda item: item[1].hits, reverse=True)
+            for _, entry in due:
+                entry.hits = 0
+            return [key for key, _ in due]
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used one"""
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            oldest = min(self._entries, key=lambda k: self._entries[k].last_access)
+            del self._entries[oldest]
+
+
+class CacheRefresher:
+    """
+    Background thread that refreshes hot cache entries before they expire
+
+    Example:
+        refresher = client.start_refresher(interval=30, refresh_ahead=60)
+        ...
+        refresher.stop()
+    """
+
+    def __init__(
+        self,
+        cache: ContainerCache,
+        fetch: Callable[[List[str]], Any],
+        interval: float = 30,
+        refresh_ahead: float = 60,
+        min_hits: int = 1,
+        max_per_cycle: int = 500,
+    ):
+        """
+        Args:
+            cache: Cache to keep warm
+            fetch: Bulk fetch function that stores results in the cache
+            interval: Seconds between refresh cycles
+            refresh_ahead: Refresh entries expiring within this many seconds
+            min_hits: Minimum hits since the last refresh to stay warm
+            max_per_cycle: Upper bound of entries refreshed per cycle
+        """
+        self.cache = cache
+        self.fetch = fetch
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.min_hits = min_hits
+        self.max_per_cycle = max_per_cycle
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "CacheRefresher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="gitchain-cache-refresher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh_once(self) -> int:
+        """Run one refresh cycle, returning the number of entries refreshed"""
+        keys = self.cache.expiring(self.refresh_ahead, self.min_hits)[: self.max_per_cycle]
+        if keys:
+            self.fetch(keys)
+        return len(keys)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh_once()
+            except Exception:
+                # Keep refreshing; failed entries simply expire
+                pass
@@ -3,11 +3,30 @@ GitChain API Client
 """
 
 import json
-from typing import Optional, List, Dict, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Optional, List, Dict, Any, Deque, Iterable, Iterator, Union
+from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError
 
-from .types import Container, InjectedContext
+from .cache import CacheRefresher, ContainerCache, container_base_id
+from .formatter import ContextFormatter
+from .mirror import LocalMirror
+from .scheduler import RateLimitScheduler, parse_retry_after
+from .shared_cache import SharedCache
+from .types import (
+    ChainProof,
+    Container,
+    ContainerDelta,
+    ContextArtifact,
+    InjectedContext,
+    SearchHit,
+    estimate_tokens,
+)
+from . import wire
 
 
 class GitChainClient:
@@ -25,10 +44,76 @@ class GitChainClient:
         api_url: str = "https://api.gitchain.0711.io",
         api_key: Optional[str] = None,
         timeout: int = 30,
+        scheduler: Optional[RateLimitScheduler] = None,
+        priority: Union[int, str] = "interactive",
+        max_retries: int = 3,
+        cache_ttl: Optional[float] = None,
+        cache_size: int = 1024,
+        proof_ttl: Optional[float] = 60,
+        shared_cache: Optional[Union[str, SharedCache]] = None,
+        binary: bool = True,
     ):
+        """
+        Args:
+            api_url: API endpoint
+            api_key: API key for authentication
+            timeout: Request timeout in seconds
+            scheduler: Optional rate-limit scheduler shared between clients
+            priority: Default priority class when a scheduler is set
+            max_retries: Retries after a 429 response when a scheduler is set
+            cache_ttl: Cache containers in memory for this many seconds
+                (default: no cache)
+            cache_size: Maximum number of cached containers (and proofs)
+            proof_ttl: Answer verify() from proofs returned by inject and
+                verify calls in the last this many seconds (None: always
+                ask the API)
+            shared_cache: SharedCache, or path of its database file, to
+                share fetched containers with other processes on the host
+            binary: Ask for MessagePack responses when msgpack is installed
+        """
         self.api_url = api_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
+        self.scheduler = scheduler
+        self.default_priority = priority
+        self.max_retries = max_retries
+        self.cache: Optional[ContainerCache] = (
+            ContainerCache(ttl=cache_ttl, max_entries=cache_size)
+            if cache_ttl is not None
+            else None
+        )
+        self.proof_cache: Optional[ContainerCache] = (
+            ContainerCache(ttl=proof_ttl, max_entries=cache_size)
+            if proof_ttl
+            else None
+        )
+        # Artifacts never change for a hash, so they are kept until evicted
+        self.artifact_cache = ContainerCache(ttl=float("inf"), max_entries=cache_size)
+        self.shared_cache: Optional[SharedCache] = (
+            SharedCache(shared_cache, ttl=cache_ttl or 300)
+            if isinstance(shared_cache, str)
+            else shared_cache
+        )
+        self.mirror: Optional[LocalMirror] = None
+        self.formatter = ContextFormatter()
+        self.binary = binary
+
+    @contextmanager
+    def priority(self, priority: Union[int, str]) -> Iterator[None]:
+        """
+        Send requests made inside the block at the given priority
+
+        No-op when the client has no scheduler.
+
+        Example:
+            with client.priority("batch"):
+                client.inject(container_ids)
+        """
+        if self.scheduler is None:
+            yield
+            return
+        with self.scheduler.priority(priority):
+            yield
 
     def inject(
         self,
@@ -37,6 +122,8 @@ class GitChainClient:
         format: str = "markdown",
         include_citations: bool = True,
         max_tokens: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        min_trust: Optional[str] = None,
     ) -> InjectedContext:
         """
         Inject verified context from containers
@@ -47,51 +134,667 @@ class GitChainClient:
             format: Output format (markdown, json, yaml)
             include_citations: Include source citations (default: True)
             max_tokens: Maximum tokens for output
+            fields: Only include these field_path globs (e.g. ["leistung.*"])
+            min_trust: Only include atoms at or above this trust level
 
         Returns:
             InjectedContext with verified data
         """
+        if not verify and self.mirror is not None and self.mirror.is_fresh():
+            local = self.mirror.inject(containers, format, fields, min_trust, include_citations, max_tokens)
+            if local is not None:
+                return local
+
         data = {
             "containers": containers,
             "verify": verify,
             "format": format,
             "includeCitations": include_citations,
+            "normalize": True,
         }
         if max_tokens:
             data["maxTokens"] = max_tokens
+        if fields:
+            data["fields"] = fields
+        if min_trust:
+            data["minTrust"] = min_trust
 
         response = self._request("POST", "/api/inject", data)
-        return InjectedContext.from_dict(response)
+        context = InjectedContext.from_dict(_unwrap(response))
+        if verify and self.proof_cache is not None:
+            for proof in context.proofs:
+                self._remember_proof(proof.container_id, _verification(proof))
+        return context
 
-    def get_container(self, container_id: str) -> Optional[Container]:
+    def get_artifacts(
+        self, hashes: Iterable[str], format: str = "markdown"
+    ) -> Dict[str, ContextArtifact]:
+        """
+        Pre-rendered context of containers by their `context_hash`
+
+        Artifacts are immutable, so each is fetched once per client.
+
+        Args:
+            hashes: Context hashes, e.g. from `Container.context_hash`
+            format: markdown or json
+
+        Returns:
+            Found artifacts keyed by hash
+        """
+        found: Dict[str, ContextArtifact] = {}
+        missing = []
+        for h in dict.fromkeys(hashes):
+            artifact = self.artifact_cache.get(f"{format}:{h}")
+            if artifact is not None:
+                found[h] = artifact
+            else:
+                missing.append(h)
+
+        for chunk in _chunks(missing, 200):
+            response = self._request("POST", "/api/artifacts", {"hashes": chunk, "format": format})
+            for a in _unwrap(response).get("artifacts", []):
+                artifact = ContextArtifact.from_dict(a)
+                self.artifact_cache.set(f"{format}:{artifact.hash}", artifact)
+                found[artifact.hash] = artifact
+        return found
+
+    def get_container(
+        self,
+        container_id: str,
+        fields: Optional[List[str]] = None,
+        min_trust: Optional[str] = None,
+    ) -> Optional[Container]:
         """
         Get a single container by ID
 
         Args:
             container_id: Container ID (e.g., "0711:product:bosch:7736606982:v3")
+            fields: Only include these field_path globs (e.g. ["leistung.*"])
+            min_trust: Only include atoms at or above this trust level
 
         Returns:
             Container or None if not found
         """
+        if self.mirror is not None and self.mirror.is_fresh():
+            local = self.mirror.get(container_id, fields, min_trust)
+            if local is not None:
+                return local
+
+        projected = bool(fields or min_trust)
+        if self.cache is not None and not projected:
+            cached = self.cache.get(container_id)
+            if cached is not None:
+                return cached
+
+        path = f"/api/containers/{container_id}"
+        params = {}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if min_trust:
+            params["minTrust"] = min_trust
+        if params:
+            path += f"?{urlencode(params)}"
+
         try:
-            response = self._request("GET", f"/api/containers/{container_id}")
-            return Container.from_dict(response)
+            if self.shared_cache is not None and not projected:
+                payload = self.shared_cache.get_or_fill(
+                    container_id, lambda: _cache_payload(_container_row(self._request("GET", path)))
+                )
+                row = wire.loads(payload)
+            else:
+                row = _container_row(self._request("GET", path))
+            container = Container.from_dict(row)
         except HTTPError as e:
             if e.code == 404:
                 return None
             raise
 
-    def verify(self, hash_or_id: str) -> Dict[str, Any]:
+        if self.cache is not None and not projected:
+            self.cache.set(container_id, container)
+        return container
+
+    def diff(
+        self,
+        container_id: str,
+        from_version: Optional[int] = None,
+        to_version: Optional[int] = None,
+    ) -> ContainerDelta:
+        """
+        Get only what changed between two versions of a container
+
+        Args:
+            container_id: Any version's container ID
+            from_version: Base version (default: the one before `to_version`)
+            to_version: Target version (default: latest)
+
+        Returns:
+            ContainerDelta with added, changed and removed atoms and citations
+        """
+        params = {}
+        if from_version is not None:
+            params["from"] = from_version
+        if to_version is not None:
+            params["to"] = to_version
+        path = f"/api/containers/{container_id}/diff"
+        if params:
+            path += f"?{urlencode(params)}"
+        return ContainerDelta.from_dict(_unwrap(self._request("GET", path)))
+
+    def update(
+        self,
+        container: Container,
+        to_version: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        min_trust: Optional[str] = None,
+    ) -> ContainerDelta:
+        """
+        Move a container to a newer version in place, fetching only the delta
+
+        Example:
+            container = client.get_container("0711:product:bosch:7736606982:v3")
+            client.update(container)  # container is now v4
+
+        Args:
+            container: Container to update (modified in place)
+            to_version: Target version (default: latest)
+            fields: Projection the container was read with (get_container)
+            min_trust: Projection the container was read with (get_container)
+
+        Returns:
+            The applied delta, projected like the container
+        """
+        old_id = container.id
+        delta = self.diff(old_id, container.version, to_version).project(fields, min_trust)
+        delta.apply(container)
+
+        if self.cache is not None and container.atoms is None:
+            self.cache.delete(old_id)
+            self.cache.set(container.id, container)
+        return delta
+
+    def prefetch(
+        self,
+        container_ids: List[str],
+        chunk_size: int = 50,
+        max_workers: int = 4,
+    ) -> List[Container]:
+        """
+        Warm the container cache in bulk
+
+        Container IDs are fetched through POST /api/containers/bulk in
+        chunks of `chunk_size` (at most 100), with at most `max_workers`
+        requests in flight. Requires a client created with `cache_ttl` or
+        `shared_cache`.
+
+        Example:
+            client = GitChainClient(api_key="...", cache_ttl=600)
+            client.prefetch(hot_container_ids)
+            client.get_container(hot_container_ids[0])  # served from memory
+
+        Args:
+            container_ids: Container IDs to fetch
+            chunk_size: Container IDs per request
+            max_workers: Concurrent requests
+
+        Returns:
+            Fetched containers
+        """
+        if self.cache is None and self.shared_cache is None:
+            raise ValueError("prefetch() requires a client created with cache_ttl or shared_cache")
+
+        return self._fetch_containers(list(dict.fromkeys(container_ids)), chunk_size, max_workers)
+
+    def get_containers(
+        self,
+        container_ids: List[str],
+        chunk_size: int = 50,
+        max_workers: int = 4,
+    ) -> List[Container]:
+        """
+        Get several containers, fetching only those not cached
+
+        Cached containers (`cache_ttl`, `shared_cache`) are served locally;
+        the rest are fetched in bulk like prefetch() and cached.
+
+        Args:
+            container_ids: Container IDs (with a version or ":latest")
+            chunk_size: Container IDs per request
+            max_workers: Concurrent requests
+
+        Returns:
+            Found containers in the order of `container_ids`
+        """
+        ids = list(dict.fromkeys(container_ids))
+        found: Dict[str, Container] = {}
+        missing = []
+        for container_id in ids:
+            container = self.cache.get(container_id) if self.cache is not None else None
+            if container is None and self.shared_cache is not None:
+                payload = self.shared_cache.get(container_id)
+                if payload is not None:
+                    container = Container.from_dict(wire.loads(payload))
+                    if self.cache is not None:
+                        self.cache.set(container_id, container)
+            if container is not None:
+                found[container_id] = container
+            else:
+                missing.append(container_id)
+
+        if missing:
+            fetched = self._fetch_containers(missing, chunk_size, max_workers)
+            by_id = {c.id: c for c in fetched}
+            by_base = {container_base_id(c.id): c for c in fetched}
+            for container_id in missing:
+                container = by_id.get(container_id)
+                if container is None and container_id.endswith(":latest"):
+                    # Resolved server-side, so it comes back with its version
+                    container = by_base.get(container_base_id(container_id))
+                if container is not None:
+                    found[container_id] = container
+
+        return [found[i] for i in ids if i in found]
+
+    def render(
+        self,
+        containers: List[str],
+        verify: bool = True,
+        format: str = "markdown",
+        include_citations: bool = True,
+        max_tokens: Optional[int] = None,
+    ) -> InjectedContext:
+        """
+        Like inject(), but formatted locally from structured containers
+
+        Containers are fetched once (see get_containers()) and rendered by
+        the client's ContextFormatter, the Python port of the inject
+        package's formatter. With a container cache, asking for markdown
+        and JSON of the same containers costs one fetch.
+
+        Args:
+            containers: List of container IDs
+            verify: Verify blockchain proofs (answered from recent proofs
+                when possible)
+            format: Output format (markdown, json, yaml)
+            include_citations: Include source citations
+            max_tokens: Maximum tokens for output
+
+        Returns:
+            InjectedContext with locally formatted output
+        """
+        found = self.get_containers(containers)
+        proofs: List[ChainProof] = []
+        verified = False
+        if verify and found:
+            result = self.verify_batch([c.id for c in found])
+            proofs = [ChainProof.from_dict(p) for p in result.get("proofs") or []]
+            verified = bool(result.get("verified"))
+
+        formatted = self.formatter.format(
+            found,
+            format=format,
+            include_citations=include_citations,
+            include_proofs=verify,
+            max_tokens=max_tokens,
+            proofs=proofs,
+        )
+        return InjectedContext(
+            containers=found,
+            citations=[c for container in found for c in container.citations],
+            proofs=proofs,
+            formatted=formatted,
+            token_count=estimate_tokens(formatted),
+            verified=verified,
+            verified_at=max((p.verified_at or "" for p in proofs), default=""),
+        )
+
+    def _fetch_containers(
+        self,
+        container_ids: List[str],
+        chunk_size: int = 50,
+        max_workers: int = 4,
+    ) -> List[Container]:
+        """Fetch containers through POST /api/containers/bulk in concurrent chunks and cache them"""
+        chunks = [container_ids[i:i + chunk_size] for i in range(0, len(container_ids), chunk_size)]
+        priority = self._current_priority()
+
+        def fetch(chunk: List[str]) -> List[Container]:
+            with self.priority(priority):
+                response = self._request("POST", "/api/containers/bulk", {"ids": chunk})
+            rows = _unwrap(response).get("containers", [])
+            containers = [Container.from_dict(row) for row in rows]
+            # Missing containers are skipped server-side, so key by returned ID
+            for row, container in zip(rows, containers):
+                if self.cache is not None:
+                    self.cache.set(container.id, container)
+                if self.shared_cache is not None:
+                    self.shared_cache.set(container.id, _cache_payload(row))
+            return containers
+
+        if len(chunks) == 1:
+            return fetch(chunks[0])
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, chunks))
+        return [c for chunk in results for c in chunk]
+
+    def write_many(
+        self,
+        containers: Iterable[Dict[str, Any]],
+        message: Optional[str] = None,
+        chunk_size: int = 1000,
+        max_workers: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """
+        Write containers in bulk through POST /api/batch
+
+        Containers are read from the iterable lazily and sent in chunks of
+        `chunk_size` (the server maximum), with at most `max_workers`
+        requests in flight. The server writes each chunk's containers of a
+        namespace in one commit and registers the chunk as one batch.
+
+        Example:
+            results = client.write_many(
+                {"type": "product", "namespace": "bosch", "identifier": pid, "data": data}
+                for pid, data in catalogue
+            )
+
+        Args:
+            containers: Dicts with type, namespace, identifier, data and
+                optional meta (name, description, author)
+            message: Commit message (default: generated per commit)
+            chunk_size: Containers per request
+            max_workers: Concurrent requests
+
+        Returns:
+            One result per container, in input order: id, version,
+            commitHash and the chunk's batch (merkleRoot, batchId, txHash)
+        """
+        priority = self._current_priority()
+
+        def write(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            data: Dict[str, Any] = {"containers": chunk}
+            if message:
+                data["message"] = message
+            with self.priority(priority):
+                response = self._request("POST", "/api/batch", data)
+            batch = response.get("batch") or {}
+            return [{**result, "batch": batch} for result in response.get("containers", [])]
+
+        results: List[Dict[str, Any]] = []
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk in _chunks(containers, chunk_size):
+                if len(pending) >= max_workers:
+                    results.extend(pending.popleft().result())
+                pending.append(executor.submit(write, chunk))
+            while pending:
+                results.extend(pending.popleft().result())
+        return results
+
+    def iter_containers(
+        self,
+        type: Optional[str] = None,
+        namespace: Optional[str] = None,
+        search: Optional[str] = None,
+        visibility: Optional[str] = None,
+        updated_since: Optional[str] = None,
+        page_size: int = 100,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        prefetch: bool = True,
+    ) -> Iterator[Container]:
+        """
+        Iterate over all matching containers
+
+        Uses cursor pagination, so deep pages are as cheap as the first one.
+        While the caller consumes a page, the next one is fetched in the
+        background; at most two pages are held in memory.
+
+        Example:
+            for container in client.iter_containers(namespace="bosch"):
+                sync(container)
+
+        Args:
+            type: Filter by container type
+            namespace: Filter by namespace
+            search: Full-text filter on data and identifier
+            visibility: Filter by visibility
+            updated_since: Only containers updated at or after this ISO timestamp
+            page_size: Containers per request (server maximum: 100)
+            order_by: "created_at" or "updated_at"
+            order_dir: "asc" or "desc"
+            prefetch: Fetch the next page in the background
+
+        Yields:
+            Container objects
+        """
+        rows = self._iter_container_rows(
+            type=type,
+            namespace=namespace,
+            search=search,
+            visibility=visibility,
+            updatedSince=updated_since,
+            limit=page_size,
+            orderBy=order_by,
+            orderDir=order_dir,
+            prefetch=prefetch,
+        )
+        for row in rows:
+            yield Container.from_dict(row)
+
+    def search(
+        self,
+        query: str,
+        type: Optional[str] = None,
+        namespace: Optional[str] = None,
+        page_size: int = 50,
+        prefetch: bool = True,
+    ) -> Iterator[SearchHit]:
+        """
+        Search containers, best match first
+
+        Matches names, identifiers, descriptions, ETIM classes and atom
+        values, and yields the latest version of each matching container.
+        Results stream page by page; stop iterating to stop fetching.
+
+        Example:
+            for hit in client.search("wärmepumpe 8 kw", namespace="bosch"):
+                print(hit.container.id, hit.score)
+
+        Args:
+            query: Search words; supports "quoted phrases", or, -excluded
+            type: Filter by container type
+            namespace: Filter by namespace
+            page_size: Results per request (server maximum: 100)
+            prefetch: Fetch the next page in the background
+
+        Yields:
+            SearchHit objects (container and relevance score)
+        """
+        rows = self._iter_rows(
+            "/api/search",
+            q=query,
+            type=type,
+            namespace=namespace,
+            limit=page_size,
+            prefetch=prefetch,
+        )
+        for row in rows:
+            yield SearchHit(container=Container.from_dict(row), score=float(row.get("score") or 0))
+
+    def _iter_container_rows(self, prefetch: bool = True, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Raw GET /api/containers rows, page by page (see iter_containers)"""
+        return self._iter_rows("/api/containers", prefetch=prefetch, **filters)
+
+    def _iter_rows(self, path: str, prefetch: bool = True, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Rows of a cursor-paginated GET endpoint, page by page"""
+        params = {k: v for k, v in filters.items() if v is not None}
+        priority = self._current_priority()
+
+        def fetch(cursor: Optional[str]) -> Dict[str, Any]:
+            query = urlencode({**params, "cursor": cursor or ""})
+            with self.priority(priority):
+                return self._request("GET", f"{path}?{query}")
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            response = fetch(None)
+            while True:
+                cursor = response.get("meta", {}).get("nextCursor")
+                pending = executor.submit(fetch, cursor) if executor and cursor else None
+
+                yield from response.get("data", [])
+
+                if not cursor:
+                    return
+                response = pending.result() if pending else fetch(cursor)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def replicate(
+        self,
+        path: str = "gitchain.db",
+        namespaces: Optional[List[str]] = None,
+        types: Optional[List[str]] = None,
+        max_staleness: float = 60,
+        history: bool = False,
+        prune_interval: Optional[float] = 3600,
+    ) -> LocalMirror:
+        """
+        Mirror namespaces into a local SQLite database and read from it
+
+        Runs the initial sync, then serves get_container() and unverified
+        inject() locally while the last sync is at most `max_staleness`
+        seconds old. Call `start()` on the returned mirror to keep it synced.
+
+        Args:
+            path: SQLite database file
+            namespaces: Namespaces to replicate (default: all visible)
+            types: Container types to replicate (default: all)
+            max_staleness: Staleness bound for local reads in seconds
+            history: Also replicate commit history
+            prune_interval: Seconds between checks for containers deleted
+                upstream (None: only on `sync(full=True)`)
+
+        Returns:
+            The attached LocalMirror
+        """
+        mirror = LocalMirror(
+            self,
+            path,
+            namespaces=namespaces,
+            types=types,
+            max_staleness=max_staleness,
+            history=history,
+            prune_interval=prune_interval,
+        )
+        mirror.sync()
+        self.mirror = mirror
+        return mirror
+
+    def start_refresher(
+        self,
+        interval: float = 30,
+        refresh_ahead: float = 60,
+        min_hits: int = 1,
+    ) -> CacheRefresher:
+        """
+        Start a background thread that refreshes hot entries before expiry
+
+        Entries used at least `min_hits` times since their last refresh and
+        expiring within `refresh_ahead` seconds are refetched in bulk,
+        hottest first. Unused entries are left to expire.
+
+        Args:
+            interval: Seconds between refresh cycles
+            refresh_ahead: Refresh window before expiry in seconds
+            min_hits: Minimum accesses since the last refresh
+
+        Returns:
+            The running refresher (call `stop()` to end it)
+        """
+        if self.cache is None:
+            raise ValueError("start_refresher() requires a client created with cache_ttl")
+
+        return CacheRefresher(
+            self.cache,
+            fetch=lambda ids: self.prefetch(ids),
+            interval=interval,
+            refresh_ahead=refresh_ahead,
+            min_hits=min_hits,
+        ).start()
+
+    def verify(self, hash_or_id: str, refresh: bool = False) -> Dict[str, Any]:
         """
         Verify a container or content hash
 
+        Containers verified by an inject or verify call within `proof_ttl`
+        are answered locally, with `verified`, `containerId` and `chain`.
+
         Args:
             hash_or_id: Container ID or content hash
+            refresh: Ask the API even if a recent proof is known
 
         Returns:
             Verification result with blockchain proof
         """
-        return self._request("GET", f"/api/verify/{hash_or_id}")
+        if self.proof_cache is not None and not refresh:
+            known = self.proof_cache.get(hash_or_id)
+            if known is not None:
+                return {**known, "chain": dict(known["chain"])}
+
+        result = self._request("GET", f"/api/verify/{hash_or_id}")
+        self._remember_proof(hash_or_id, result)
+        return result
+
+    def verify_batch(self, container_ids: List[str], refresh: bool = False) -> Dict[str, Any]:
+        """
+        Verify several containers in one request
+
+        Answered locally if recent proofs of all containers are known.
+
+        Args:
+            container_ids: Container IDs
+            refresh: Ask the API even if recent proofs are known
+
+        Returns:
+            Overall result with per-container `containers` and `proofs`
+        """
+        if self.proof_cache is not None and not refresh:
+            known = [self.proof_cache.get(i) for i in container_ids]
+            if container_ids and all(known):
+                return {
+                    "verified": True,
+                    "containers": [{"id": i, "verified": True} for i in container_ids],
+                    "proofs": [
+                        {"containerId": i, "verified": True, **k["chain"]}
+                        for i, k in zip(container_ids, known)
+                    ],
+                }
+
+        result = self._request("POST", "/api/verify/batch", {"containers": container_ids})
+        if self.proof_cache is not None:
+            for proof in result.get("proofs") or []:
+                if proof.get("containerId"):
+                    # Batch proofs carry the chain fields at the top level
+                    self._remember_proof(proof["containerId"], {"verified": proof.get("verified"), "chain": proof})
+        return result
+
+    def _remember_proof(self, container_id: str, result: Dict[str, Any]) -> None:
+        """Keep a positive verification result for verify()"""
+        if self.proof_cache is None or not result.get("verified") or not result.get("chain"):
+            return
+        self.proof_cache.set(container_id, {
+            "verified": True,
+            "containerId": container_id,
+            "chain": {k: result["chain"].get(k) for k in _CHAIN_FIELDS},
+        })
+
+    def _current_priority(self) -> Union[int, str]:
+        """Priority of the calling thread, for requests made from worker threads"""
+        if self.scheduler is None:
+            return self.default_priority
+        return self.scheduler.current_priority(self.default_priority)
 
     def _request(
         self,
@@ -100,25 +803,100 @@ class GitChainClient:
         data: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Make HTTP request to API"""
+        return wire.loads(self._send(method, path, data))
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        """Make HTTP request to API, returning the raw response body"""
         url = f"{self.api_url}{path}"
         
-        headers = {"Content-Type": "application/json"}
+        headers = {"Content-Type": "application/json", "Accept": wire.accept_header(self.binary)}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
         body = json.dumps(data).encode() if data else None
-        request = Request(url, data=body, headers=headers, method=method)
+        rate_key = self.api_key or "anonymous"
 
-        try:
-            with urlopen(request, timeout=self.timeout) as response:
-                return json.loads(response.read())
-        except HTTPError as e:
-            error_body = e.read().decode()
+        attempt = 0
+        while True:
+            if self.scheduler:
+                self.scheduler.acquire(
+                    rate_key, self.scheduler.current_priority(self.default_priority)
+                )
+
+            request = Request(url, data=body, headers=headers, method=method)
             try:
-                error_data = json.loads(error_body)
+                with urlopen(request, timeout=self.timeout) as response:
+                    result = response.read()
+                if self.scheduler:
+                    self.scheduler.feedback(rate_key, response.status)
+                return result
+            except HTTPError as e:
+                if self.scheduler:
+                    retry_after = parse_retry_after(e.headers.get("Retry-After"))
+                    self.scheduler.feedback(rate_key, e.code, retry_after)
+                    if e.code == 429 and attempt < self.max_retries:
+                        attempt += 1
+                        continue
+                error_body = e.read()
+                try:
+                    error_data = wire.loads(error_body)
+                except ValueError:
+                    raise Exception(f"HTTP {e.code}: {error_body.decode(errors='replace')}")
                 raise Exception(error_data.get("error", f"HTTP {e.code}"))
-            except json.JSONDecodeError:
-                raise Exception(f"HTTP {e.code}: {error_body}")
+
+
+# Fields of the `chain` object in GET /api/verify/{id} responses
+_CHAIN_FIELDS = ("network", "batchId", "txHash", "blockNumber", "verifiedAt")
+
+
+def _verification(proof: ChainProof) -> Dict[str, Any]:
+    """Verify response for a proof returned by inject"""
+    return {
+        "verified": proof.verified,
+        "chain": {
+            "network": proof.network,
+            "batchId": proof.batch_id,
+            "txHash": proof.tx_hash,
+            "blockNumber": proof.block_number,
+            "verifiedAt": proof.verified_at,
+        },
+    }
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Consecutive lists of up to `size` items, read lazily"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _unwrap(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip the {"data": ...} envelope of sendSuccess() responses"""
+    if isinstance(response, dict) and set(response) <= {"data", "meta"} and "data" in response:
+        return response["data"]
+    return response
+
+
+def _container_row(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Container row of a GET /api/containers/{id} response ({"data": {"container": ...}})"""
+    data = _unwrap(response)
+    return data.get("container", data) if isinstance(data, dict) else data
+
+
+def _cache_payload(row: Dict[str, Any]) -> bytes:
+    """
+    Shared cache entry of a container: its row as JSON, whether it came from
+    GET /api/containers/{id} or POST /api/containers/bulk
+    """
+    return json.dumps(row).encode()
 
 
 # Default client instance
@@ -128,9 +906,12 @@ _default_client: Optional[GitChainClient] = None
 def get_client(
     api_url: str = "https://api.gitchain.0711.io",
     api_key: Optional[str] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
 ) -> GitChainClient:
     """Get or create default client instance"""
     global _default_client
-    if _default_client is None or api_key:
-        _default_client = GitChainClient(api_url=api_url, api_key=api_key)
+    if _default_client is None or api_key or scheduler:
+        _default_client = GitChainClient(
+            api_url=api_url, api_key=api_key, scheduler=scheduler
+        )
     return _default_client
@@ -0,0 +1,365 @@
+"""
+Local context formatter
+
+Python port of formatContext() in packages/inject/src/formatter.ts. Renders
+markdown, JSON or YAML from already fetched `Container` objects, so one
+structured fetch per container serves every output format an agent asks
+for. Rendered per-container fragments are memoized by content hash.
+
+Unlike formatContext(), atoms of projected reads (fields / min_trust) are
+rendered after the data.
+
+Example:
+    containers = client.get_containers(container_ids)
+    markdown = format_context(containers, format="markdown")
+    as_json = format_context(containers, format="json")  # no second fetch
+"""
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .types import ChainProof, Container
+
+FORMATS = ("markdown", "json", "yaml")
+
+
+def _js(value: Any) -> str:
+    """Value as JavaScript template literals print it"""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, float) and math.isfinite(value) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _js_numbers(value: Any) -> Any:
+    """Integral floats as ints, so json.dumps prints numbers like JSON.stringify"""
+    if isinstance(value, float) and math.isfinite(value) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {k: _js_numbers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_js_numbers(v) for v in value]
+    return value
+
+
+def _meta(container: Container) -> Dict[str, Any]:
+    """ContainerMeta with the API's field names"""
+    meta = container.meta
+    out: Dict[str, Any] = {"name": meta.name}
+    if meta.description is not None:
+        out["description"] = meta.description
+    out.update(createdAt=meta.created_at, updatedAt=meta.updated_at, author=meta.author)
+    if meta.tags:
+        out["tags"] = meta.tags
+    return out
+
+
+def _citations(container: Container) -> List[Dict[str, Any]]:
+    out = []
+    for c in container.citations:
+        citation: Dict[str, Any] = {"documentId": c.document_id}
+        if c.page is not None:
+            citation["page"] = c.page
+        if c.quote is not None:
+            citation["quote"] = c.quote
+        citation["confidence"] = c.confidence
+        out.append(citation)
+    return out
+
+
+def _chain(container: Container, proof: Optional[ChainProof]) -> Optional[Dict[str, Any]]:
+    """Container's chain proof, or one built from a verify result"""
+    if container.chain:
+        return container.chain
+    if proof is not None and proof.verified:
+        chain: Dict[str, Any] = {"network": proof.network, "batchId": proof.batch_id}
+        if proof.tx_hash:
+            chain["txHash"] = proof.tx_hash
+        return chain
+    return None
+
+
+def _atom_value(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(_js_numbers(value), ensure_ascii=False)
+    return _js(value)
+
+
+def _markdown_data(data: Any, lines: List[str], indent: int) -> None:
+    prefix = "  " * indent
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, (dict, list)):
+                lines.append(f"{prefix}-")
+                _markdown_data(item, lines, indent + 1)
+            else:
+                lines.append(f"{prefix}- {_js(item)}")
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, (dict, list)):
+                lines.append(f"{prefix}**{key}:**")
+                _markdown_data(value, lines, indent + 1)
+            else:
+                lines.append(f"{prefix}**{key}:** {_js(value)}")
+    else:
+        lines.append(f"{prefix}{_js(data)}")
+
+
+def _yaml_data(data: Any, lines: List[str], indent: int) -> None:
+    prefix = " " * indent
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, (dict, list)):
+                lines.append(f"{prefix}-")
+                _yaml_data(item, lines, indent + 2)
+            else:
+                lines.append(f"{prefix}- {_js(item)}")
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, (dict, list)):
+                lines.append(f"{prefix}{key}:")
+                _yaml_data(value, lines, indent + 2)
+            elif isinstance(value, str):
+                lines.append(f'{prefix}{key}: "{value}"')
+            else:
+                lines.append(f"{prefix}{key}: {_js(value)}")
+
+
+def render_markdown(
+    container: Container, include_citations: bool, chain: Optional[Dict[str, Any]]
+) -> str:
+    """Markdown section of one container (formatMarkdown)"""
+    lines = [
+        f"## {container.meta.name}",
+        "",
+        f"**ID:** `{container.id}`",
+        f"**Type:** {container.type} | **Version:** v{container.version}",
+        "",
+    ]
+
+    if container.data is not None:
+        lines += ["### Data", ""]
+        _markdown_data(container.data, lines, 0)
+        lines.append("")
+
+    if container.atoms:
+        lines += ["### Atoms", ""]
+        for path, atom in container.atoms.items():
+            unit = f" {atom['unit']}" if atom.get("unit") else ""
+            trust = f" _({atom['trust']})_" if atom.get("trust") else ""
+            lines.append(f"- **{path}:** {_atom_value(atom.get('value'))}{unit}{trust}")
+        lines.append("")
+
+    if include_citations and container.citations:
+        lines += ["### Sources", ""]
+        for c in container.citations:
+            page = f" (p.{c.page})" if c.page else ""
+            lines.append(f"- {c.document_id}{page} [{c.confidence}]")
+        lines.append("")
+
+    if chain:
+        lines += ["### Blockchain Proof", ""]
+        lines.append(f"- **Network:** {_js(chain.get('network'))}")
+        lines.append(f"- **Batch:** {_js(chain.get('batchId'))}")
+        if chain.get("txHash"):
+            lines.append(f"- **TX:** `{chain['txHash']}`")
+        lines.append("")
+
+    lines += ["---", ""]
+    return "\n".join(lines)
+
+
+def render_json(
+    container: Container, include_citations: bool, chain: Optional[Dict[str, Any]]
+) -> str:
+    """Array element of one container (formatJSON), indented for the array"""
+    out: Dict[str, Any] = {
+        "id": container.id,
+        "type": container.type,
+        "version": container.version,
+        "meta": _meta(container),
+        "data": container.data,
+    }
+    if container.atoms is not None:
+        out["atoms"] = container.atoms
+    if include_citations and container.citations:
+        out["citations"] = _citations(container)
+    if chain:
+        out["chain"] = chain
+    text = json.dumps(_js_numbers(out), indent=2, ensure_ascii=False)
+    return "\n".join("  " + line for line in text.split("\n"))
+
+
+def render_yaml(
+    container: Container, include_citations: bool, chain: Optional[Dict[str, Any]]
+) -> str:
+    """YAML list item of one container (formatYAML)"""
+    lines = [
+        f'- id: "{container.id}"',
+        f"  type: {container.type}",
+        f"  version: {container.version}",
+        f'  name: "{container.meta.name}"',
+    ]
+
+    if container.data is not None:
+        lines.append("  data:")
+        _yaml_data(container.data, lines, 4)
+
+    if container.atoms:
+        lines.append("  atoms:")
+        _yaml_data(container.atoms, lines, 4)
+
+    if include_citations and container.citations:
+        lines.append("  citations:")
+        for c in container.citations:
+            lines.append(f'    - document: "{c.document_id}"')
+            if c.page:
+                lines.append(f"      page: {c.page}")
+            lines.append(f"      confidence: {c.confidence}")
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+_RENDERERS = {"markdown": render_markdown, "json": render_json, "yaml": render_yaml}
+
+
+def fragment_hash(
+    container: Container, format: str, include_citations: bool, chain: Optional[Dict[str, Any]]
+) -> str:
+    """SHA-256 over the format options and everything a fragment renders"""
+    payload = {
+        "format": format,
+        "citations": _citations(container) if include_citations else None,
+        "id": container.id,
+        "type": container.type,
+        "version": container.version,
+        "meta": _meta(container),
+        "data": container.data,
+        "atoms": container.atoms,
+        "chain": chain,
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ContextFormatter:
+    """
+    Renders containers like the inject API, memoizing per-container fragments
+
+    Fragments are keyed by content hash, so a container rendered once is
+    reused across calls, conversations and container sets until its
+    content changes.
+    """
+
+    def __init__(self, max_fragments: int = 4096):
+        """
+        Args:
+            max_fragments: Rendered fragments kept in memory
+        """
+        self.max_fragments = max_fragments
+        self.hits = 0
+        self.misses = 0
+        self._fragments: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def format(
+        self,
+        containers: List[Container],
+        format: str = "markdown",
+        include_citations: bool = True,
+        include_proofs: bool = False,
+        max_tokens: Optional[int] = None,
+        proofs: Optional[List[ChainProof]] = None,
+    ) -> str:
+        """
+        Render containers into LLM-ready context (formatContext)
+
+        Args:
+            containers: Containers in output order
+            format: markdown, json or yaml (unknown formats render markdown)
+            include_citations: Include source citations
+            include_proofs: Include blockchain proofs (markdown and JSON)
+            max_tokens: Truncate to about this many tokens
+            proofs: Verify results for containers without their own chain
+
+        Returns:
+            Formatted context
+        """
+        if format not in FORMATS:
+            format = "markdown"
+        by_id = {p.container_id: p for p in proofs or []}
+
+        fragments = []
+        for container in containers:
+            chain = _chain(container, by_id.get(container.id)) if include_proofs else None
+            fragments.append(self.fragment(container, format, include_citations, chain))
+
+        if format == "json":
+            output = "[\n" + ",\n".join(fragments) + "\n]" if fragments else "[]"
+        elif format == "yaml":
+            output = "\n".join(fragments)
+        else:
+            header = f"# Verified Context\n\n> {len(containers)} container(s) | Verified by GitChain\n"
+            output = "\n".join([header] + fragments)
+
+        if max_tokens:
+            max_chars = max_tokens * 4
+            if len(output) > max_chars:
+                output = output[:max_chars] + "\n\n[...truncated]"
+        return output
+
+    def fragment(
+        self,
+        container: Container,
+        format: str,
+        include_citations: bool = True,
+        chain: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Memoized fragment of one container"""
+        key = fragment_hash(container, format, include_citations, chain)
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        fragment = _RENDERERS[format](container, include_citations, chain)
+        with self._lock:
+            self._fragments[key] = fragment
+            while len(self._fragments) > self.max_fragments:
+                self._fragments.popitem(last=False)
+        return fragment
+
+
+_default_formatter = ContextFormatter()
+
+
+def format_context(
+    containers: List[Container],
+    format: str = "markdown",
+    include_citations: bool = True,
+    include_proofs: bool = False,
+    max_tokens: Optional[int] = None,
+    proofs: Optional[List[ChainProof]] = None,
+) -> str:
+    """Render containers with the shared default ContextFormatter"""
+    return _default_formatter.format(
+        containers,
+        format=format,
+        include_citations=include_citations,
+        include_proofs=include_proofs,
+        max_tokens=max_tokens,
+        proofs=proofs,
+    )
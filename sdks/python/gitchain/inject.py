@@ -2,9 +2,11 @@
 Convenience functions for context injection
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 from .client import get_client
+from .scheduler import RateLimitScheduler
 from .types import InjectedContext
 
 
@@ -14,8 +16,11 @@ def inject(
     format: str = "markdown",
     include_citations: bool = True,
     max_tokens: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    min_trust: Optional[str] = None,
     api_url: str = "https://api.gitchain.0711.io",
     api_key: Optional[str] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
 ) -> InjectedContext:
     """
     Inject verified context from containers
@@ -34,19 +39,24 @@ def inject(
         format: Output format (markdown, json, yaml)
         include_citations: Include source citations (default: True)
         max_tokens: Maximum tokens for output
+        fields: Only include these field_path globs (e.g. ["leistung.*"])
+        min_trust: Only include atoms at or above this trust level
         api_url: API endpoint
         api_key: API key for authentication
+        scheduler: Optional rate-limit scheduler (interactive priority)
 
     Returns:
         InjectedContext with verified data
     """
-    client = get_client(api_url=api_url, api_key=api_key)
+    client = get_client(api_url=api_url, api_key=api_key, scheduler=scheduler)
     return client.inject(
         containers=containers,
         verify=verify,
         format=format,
         include_citations=include_citations,
         max_tokens=max_tokens,
+        fields=fields,
+        min_trust=min_trust,
     )
 
 
@@ -56,6 +66,8 @@ def inject_batch(
     format: str = "markdown",
     api_url: str = "https://api.gitchain.0711.io",
     api_key: Optional[str] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
+    max_workers: int = 4,
 ) -> List[InjectedContext]:
     """
     Inject multiple container sets in parallel
@@ -72,12 +84,18 @@ def inject_batch(
         format: Output format
         api_url: API endpoint
         api_key: API key
+        scheduler: Optional rate-limit scheduler; requests run at batch
+            priority so interactive calls sharing the key go first
+        max_workers: Number of concurrent requests
 
     Returns:
         List of InjectedContext results
     """
-    client = get_client(api_url=api_url, api_key=api_key)
-    return [
-        client.inject(containers=containers, verify=verify, format=format)
-        for containers in container_lists
-    ]
+    client = get_client(api_url=api_url, api_key=api_key, scheduler=scheduler)
+
+    def run(containers: List[str]) -> InjectedContext:
+        with client.priority("batch"):
+            return client.inject(containers=containers, verify=verify, format=format)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run, container_lists))
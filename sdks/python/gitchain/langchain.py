@@ -20,6 +20,10 @@ except ImportError:
     BaseTool = object
     BaseRetriever = object
     BaseModel = object
+    Document = None
+
+    def Field(default=None, **kwargs):
+        return default
 
 
 def _check_langchain():
@@ -61,11 +65,13 @@ class GitChainInjectTool(BaseTool):
     
     def _run(self, container_ids: List[str], verify: bool = True) -> str:
         """Execute the inject tool."""
-        context = self.client.inject(
-            containers=container_ids,
-            verify=verify,
-            format="markdown"
-        )
+        # Rendered locally, so the retriever and this tool share one fetch
+        with self.client.priority("interactive"):
+            context = self.client.render(
+                containers=container_ids,
+                verify=verify,
+                format="markdown"
+            )
         
         result = context.formatted
         if context.verified:
@@ -106,18 +112,19 @@ class GitChainVerifyTool(BaseTool):
     
     def _run(self, container_id: str) -> str:
         """Execute the verify tool."""
-        result = self.client.verify(container_id)
+        with self.client.priority("interactive"):
+            result = self.client.verify(container_id)
         
         if result.get("verified"):
             chain = result.get("chain", {})
             return (
                 f"✅ Container verified\n"
-                f"Network: {chain.get(network, unknown)}\n"
-                f"Batch: {chain.get(batchId, unknown)}\n"
-                f"TX: {chain.get(txHash, pending)}"
+                f"Network: {chain.get('network', 'unknown')}\n"
+                f"Batch: {chain.get('batchId', 'unknown')}\n"
+                f"TX: {chain.get('txHash', 'pending')}"
             )
         else:
-            return f"❌ Container not verified: {result.get(reason, unknown)}"
+            return f"❌ Container not verified: {result.get('reason', 'unknown')}"
     
     async def _arun(self, container_id: str) -> str:
         """Async version."""
@@ -146,11 +153,12 @@ class GitChainRetriever(BaseRetriever):
     
     def _get_relevant_documents(self, query: str) -> List[Document]:
         """Retrieve documents from GitChain containers."""
-        context = self.client.inject(
-            containers=self.container_ids,
-            verify=self.verify,
-            format="json"
-        )
+        with self.client.priority("interactive"):
+            context = self.client.render(
+                containers=self.container_ids,
+                verify=self.verify,
+                format="json"
+            )
         
         documents = []
         for container in context.containers:
@@ -0,0 +1,508 @@
+"""
+Local SQLite mirror of GitChain namespaces
+
+Replicates selected namespaces and types into an embedded database so
+agents can read containers and atoms without a network hop. An initial
+snapshot is followed by incremental catch-up on `updated_at`; changed
+containers get their atoms (and optionally commit history) refetched.
+Deleted containers never show up in that catch-up, so every
+`prune_interval` seconds the IDs in scope are compared with upstream.
+
+Example:
+    client = GitChainClient(api_key="...")
+    mirror = client.replicate("gitchain.db", namespaces=["bosch"], max_staleness=60)
+    mirror.start(interval=30)
+
+    client.get_container("0711:product:bosch:7736606982:v3")  # local read
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .formatter import FORMATS
+from .types import (
+    TRUST_PRIORITY,
+    Container,
+    InjectedContext,
+    estimate_tokens,
+    field_glob_regex,
+    project_fields,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS containers (
+    container_id TEXT PRIMARY KEY,
+    uuid TEXT,
+    type TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    version INTEGER,
+    content_hash TEXT,
+    updated_at TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_containers_scope ON containers(namespace, type);
+CREATE INDEX IF NOT EXISTS idx_containers_uuid ON containers(uuid);
+
+CREATE TABLE IF NOT EXISTS atoms (
+    container_id TEXT NOT NULL,
+    field_path TEXT NOT NULL,
+    value TEXT,
+    unit TEXT,
+    trust TEXT,
+    trust_priority INTEGER,
+    atom TEXT NOT NULL,
+    PRIMARY KEY (container_id, field_path)
+);
+CREATE INDEX IF NOT EXISTS idx_atoms_field ON atoms(field_path, trust_priority);
+
+CREATE TABLE IF NOT EXISTS commits (
+    commit_hash TEXT PRIMARY KEY,
+    container_id TEXT NOT NULL,
+    version INTEGER,
+    parent_hash TEXT,
+    message TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_commits_container ON commits(container_id, version);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL
+);
+"""
+
+# Server-side maximum for POST /api/containers/bulk
+_BULK_CHUNK = 100
+
+
+class LocalMirror:
+    """
+    SQLite replica of containers and atoms for a set of namespaces/types
+
+    Reads are only served while the last successful sync is at most
+    `max_staleness` seconds old; otherwise callers fall back to the API.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        path: str = "gitchain.db",
+        namespaces: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None,
+        max_staleness: float = 60,
+        history: bool = False,
+        max_workers: int = 4,
+        prune_interval: Optional[float] = 3600,
+    ):
+        """
+        Args:
+            client: GitChainClient used for syncing
+            path: SQLite database file (":memory:" for tests)
+            namespaces: Namespaces to replicate (default: all visible)
+            types: Container types to replicate (default: all)
+            max_staleness: Seconds after the last sync during which reads
+                are served locally
+            history: Also replicate commit history of changed containers
+            max_workers: Concurrent atom/history requests during sync
+            prune_interval: Seconds between listings of all IDs in scope to
+                drop containers deleted upstream (None: only on `full=True`)
+        """
+        self.client = client
+        self.path = path
+        self.namespaces = list(namespaces) if namespaces else [None]
+        self.types = list(types) if types else [None]
+        self.max_staleness = max_staleness
+        self.history = history
+        self.max_workers = max_workers
+        self.prune_interval = prune_interval
+        self._pruned_at: Dict[str, float] = {}
+
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _scopes(self) -> List[Tuple[Optional[str], Optional[str]]]:
+        return [(ns, t) for ns in self.namespaces for t in self.types]
+
+    @staticmethod
+    def _scope_key(namespace: Optional[str], type: Optional[str]) -> str:
+        return f"{namespace or '*'}/{type or '*'}"
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Bring the mirror up to date
+
+        The first sync (or `full=True`) takes a snapshot and drops local
+        containers that no longer exist upstream; later syncs only fetch
+        containers updated since the previous watermark, and drop deleted
+        ones once `prune_interval` has passed since the last check.
+
+        Returns:
+            Number of containers whose content changed
+        """
+        with self._sync_lock:
+            changed = 0
+            for namespace, type in self._scopes():
+                changed += self._sync_scope(namespace, type, full)
+            return changed
+
+    def _sync_scope(self, namespace: Optional[str], type: Optional[str], full: bool) -> int:
+        scope = self._scope_key(namespace, type)
+        started = time.time()
+        with self._lock:
+            state = self._db.execute(
+                "SELECT watermark FROM sync_state WHERE scope = ?", (scope,)
+            ).fetchone()
+        watermark = state["watermark"] if state and not full else None
+        snapshot = watermark is None
+
+        rows = self.client._iter_container_rows(
+            namespace=namespace,
+            type=type,
+            updatedSince=watermark,
+            orderBy="updated_at",
+            orderDir="asc",
+            limit=100,
+        )
+
+        seen: List[str] = []
+        pending: List[str] = []
+        changed = 0
+        for row in rows:
+            container_id = row.get("container_id") or row["id"]
+            seen.append(container_id)
+            if self._upsert_container(row):
+                pending.append(container_id)
+            if row.get("updated_at") and (watermark is None or row["updated_at"] > watermark):
+                watermark = row["updated_at"]
+            if len(pending) >= _BULK_CHUNK * self.max_workers:
+                changed += self._fetch_details(pending)
+                pending = []
+        changed += self._fetch_details(pending)
+
+        # Deletions don't move updated_at, so compare all IDs in scope
+        prune = snapshot or (
+            self.prune_interval is not None
+            and started - self._pruned_at.get(scope, 0) >= self.prune_interval
+        )
+        if prune and not snapshot:
+            seen = [
+                row.get("container_id") or row["id"]
+                for row in self.client._iter_container_rows(namespace=namespace, type=type, limit=100)
+            ]
+
+        with self._lock, self._db:
+            if prune:
+                self._prune(namespace, type, set(seen))
+                self._pruned_at[scope] = started
+            self._db.execute(
+                "INSERT INTO sync_state (scope, watermark, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(scope) DO UPDATE SET watermark = excluded.watermark, "
+                "synced_at = excluded.synced_at",
+                (scope, watermark, started),
+            )
+        return changed
+
+    def _upsert_container(self, row: Dict[str, Any]) -> bool:
+        """Store a listing row; True if its content changed"""
+        container_id = row.get("container_id") or row["id"]
+        with self._lock, self._db:
+            existing = self._db.execute(
+                "SELECT content_hash FROM containers WHERE container_id = ?", (container_id,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO containers "
+                "(container_id, uuid, type, namespace, identifier, version, content_hash, updated_at, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    container_id,
+                    row.get("id") if row.get("container_id") else None,
+                    row["type"],
+                    row["namespace"],
+                    row["identifier"],
+                    row.get("version"),
+                    row.get("content_hash"),
+                    row.get("updated_at"),
+                    json.dumps(row),
+                ),
+            )
+        return existing is None or existing["content_hash"] != row.get("content_hash")
+
+    def _fetch_details(self, container_ids: List[str]) -> int:
+        """Refetch atoms (and history) for changed containers"""
+        if not container_ids:
+            return 0
+        chunks = [
+            container_ids[i:i + _BULK_CHUNK]
+            for i in range(0, len(container_ids), _BULK_CHUNK)
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for response in executor.map(self._fetch_atoms, chunks):
+                self._store_atoms(response)
+            if self.history:
+                for container_id, commits in executor.map(self._fetch_history, container_ids):
+                    self._store_history(container_id, commits)
+        return len(container_ids)
+
+    def _fetch_atoms(self, container_ids: List[str]) -> Dict[str, Any]:
+        # Bulk reads, unlike POST /api/inject, don't count towards inject_count
+        return self.client._request("POST", "/api/containers/bulk", {
+            "ids": container_ids,
+            "fields": ["*"],
+        })
+
+    def _fetch_history(self, container_id: str) -> Tuple[str, List[Dict[str, Any]]]:
+        from .client import _unwrap  # client imports this module
+
+        response = self.client._request("GET", f"/api/containers/{container_id}/history")
+        return container_id, _unwrap(response) or []
+
+    def _store_atoms(self, response: Dict[str, Any]) -> None:
+        from .client import _unwrap  # client imports this module
+
+        with self._lock, self._db:
+            for container in _unwrap(response).get("containers", []):
+                container_id = container.get("container_id") or container["id"]
+                self._db.execute("DELETE FROM atoms WHERE container_id = ?", (container_id,))
+                self._db.executemany(
+                    "INSERT INTO atoms (container_id, field_path, value, unit, trust, trust_priority, atom) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            container_id,
+                            field_path,
+                            json.dumps(atom.get("value")),
+                            atom.get("unit"),
+                            atom.get("trust"),
+                            TRUST_PRIORITY.get(atom.get("trust"), len(TRUST_PRIORITY) + 1),
+                            json.dumps(atom),
+                        )
+                        for field_path, atom in (container.get("atoms") or {}).items()
+                    ],
+                )
+
+    def _store_history(self, container_id: str, commits: List[Dict[str, Any]]) -> None:
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO commits "
+                "(commit_hash, container_id, version, parent_hash, message, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        c["commit_hash"],
+                        container_id,
+                        c.get("version"),
+                        c.get("parent_hash"),
+                        c.get("message"),
+                        c.get("created_at"),
+                    )
+                    for c in commits
+                    if c.get("commit_hash")
+                ],
+            )
+
+    def _prune(self, namespace: Optional[str], type: Optional[str], seen: set) -> None:
+        """Drop containers in scope that were not listed upstream"""
+        query = "SELECT container_id FROM containers WHERE 1 = 1"
+        params: List[Any] = []
+        if namespace:
+            query += " AND namespace = ?"
+            params.append(namespace)
+        if type:
+            query += " AND type = ?"
+            params.append(type)
+        gone = [(r["container_id"],) for r in self._db.execute(query, params) if r["container_id"] not in seen]
+        self._db.executemany("DELETE FROM atoms WHERE container_id = ?", gone)
+        self._db.executemany("DELETE FROM commits WHERE container_id = ?", gone)
+        self._db.executemany("DELETE FROM containers WHERE container_id = ?", gone)
+
+    def start(self, interval: float = 30) -> "LocalMirror":
+        """Keep syncing in a background thread every `interval` seconds"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(interval,), name="gitchain-mirror", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.sync()
+            except Exception:
+                # Reads fall back to the API once the mirror goes stale
+                pass
+
+    def close(self) -> None:
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @property
+    def synced_at(self) -> Optional[float]:
+        """Start time of the oldest scope's last successful sync"""
+        with self._lock:
+            rows = self._db.execute("SELECT scope, synced_at FROM sync_state").fetchall()
+        synced = {r["scope"]: r["synced_at"] for r in rows}
+        times = [synced.get(self._scope_key(ns, t)) for ns, t in self._scopes()]
+        if not times or any(t is None for t in times):
+            return None
+        return min(times)
+
+    def is_fresh(self) -> bool:
+        """Whether local reads are within the staleness bound"""
+        synced_at = self.synced_at
+        return synced_at is not None and time.time() - synced_at <= self.max_staleness
+
+    def get(
+        self,
+        container_id: str,
+        fields: Optional[List[str]] = None,
+        min_trust: Optional[str] = None,
+    ) -> Optional[Container]:
+        """
+        Read a container from the mirror (regardless of staleness)
+
+        Args:
+            container_id: Container ID
+            fields: Only include these field_path globs
+            min_trust: Only include atoms at or above this trust level
+
+        Returns:
+            Container, or None if not mirrored
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT record FROM containers WHERE container_id = ?", (container_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        record = json.loads(row["record"])
+        if fields or min_trust:
+            if fields:
+                record["data"] = project_fields(record.get("data") or {}, [field_glob_regex(f) for f in fields])
+            record["atoms"] = self.atoms(container_id, fields, min_trust)
+        return Container.from_dict(record)
+
+    def atoms(
+        self,
+        container_id: str,
+        fields: Optional[List[str]] = None,
+        min_trust: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Mirrored atoms of a container, keyed by field_path"""
+        query = "SELECT field_path, atom FROM atoms WHERE container_id = ?"
+        params: List[Any] = [container_id]
+        if min_trust:
+            if min_trust not in TRUST_PRIORITY:
+                raise ValueError(f"Invalid min_trust: {min_trust}")
+            query += " AND trust_priority <= ?"
+            params.append(TRUST_PRIORITY[min_trust])
+        if fields:
+            query += " AND (" + " OR ".join("field_path GLOB ?" for _ in fields) + ")"
+            params.extend(fields)
+        query += " ORDER BY field_path"
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return {r["field_path"]: json.loads(r["atom"]) for r in rows}
+
+    def commits(self, container_id: str) -> List[Dict[str, Any]]:
+        """Mirrored commits of a container, newest first (requires history=True)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM commits WHERE container_id = ? ORDER BY version DESC, created_at DESC",
+                (container_id,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def iter_containers(
+        self,
+        namespace: Optional[str] = None,
+        type: Optional[str] = None,
+    ) -> Iterator[Container]:
+        """Iterate over mirrored containers"""
+        query = "SELECT record FROM containers WHERE 1 = 1"
+        params: List[Any] = []
+        if namespace:
+            query += " AND namespace = ?"
+            params.append(namespace)
+        if type:
+            query += " AND type = ?"
+            params.append(type)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY container_id", params).fetchall()
+        for row in rows:
+            yield Container.from_dict(json.loads(row["record"]))
+
+    def inject(
+        self,
+        container_ids: List[str],
+        format: str = "markdown",
+        fields: Optional[List[str]] = None,
+        min_trust: Optional[str] = None,
+        include_citations: bool = True,
+        max_tokens: Optional[int] = None,
+    ) -> Optional[InjectedContext]:
+        """
+        Build unverified context from mirrored containers
+
+        Rendered by the client's ContextFormatter, like
+        GitChainClient.render(), not by the inject API's renderer.
+
+        Returns:
+            InjectedContext, or None if a container is not mirrored or the
+            format is not supported locally
+        """
+        if format not in FORMATS:
+            return None
+        containers = []
+        for container_id in container_ids:
+            container = self.get(container_id, fields, min_trust)
+            if container is None:
+                return None
+            containers.append(container)
+
+        formatted = self.client.formatter.format(
+            containers,
+            format=format,
+            include_citations=include_citations,
+            max_tokens=max_tokens,
+        )
+        return InjectedContext(
+            containers=containers,
+            citations=[c for container in containers for c in container.citations],
+            proofs=[],
+            formatted=formatted,
+            token_count=estimate_tokens(formatted),
+            verified=False,
+            verified_at="",
+        )
@@ -4,8 +4,13 @@ OpenAI integration for GitChain
 Provides function definitions and helpers for using GitChain with OpenAI API.
 """
 
-from typing import List, Optional, Dict, Any
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
+from .cache import container_base_id
 from .client import GitChainClient
+from .prompt import PROMPT_HEADER, SystemPromptBuilder
+from .session import ContextSession
 from .types import InjectedContext
 
 
@@ -49,10 +54,21 @@ GITCHAIN_FUNCTIONS = [
 
 
 class GitChainFunctionHandler:
-    """Handler for GitChain OpenAI function calls."""
+    """Handler for GitChain OpenAI function calls.
+
+    Pass a ContextSession to return only new or changed context on
+    repeated gitchain_inject calls within a conversation. The call's
+    `verify` argument (default true, as in the function definition)
+    applies to the session turn.
+    """
     
-    def __init__(self, client: Optional[GitChainClient] = None):
-        self.client = client or GitChainClient()
+    def __init__(
+        self,
+        client: Optional[GitChainClient] = None,
+        session: Optional[ContextSession] = None,
+    ):
+        self.client = client or (session.client if session else GitChainClient())
+        self.session = session
     
     def handle_function_call(
         self,
@@ -72,11 +88,15 @@ class GitChainFunctionHandler:
         container_ids = arguments.get("container_ids", [])
         verify = arguments.get("verify", True)
         
-        context = self.client.inject(
-            containers=container_ids,
-            verify=verify,
-            format="markdown"
-        )
+        if self.session is not None:
+            return self.session.turn(container_ids, verify=verify).formatted
+        
+        with self.client.priority("interactive"):
+            context = self.client.inject(
+                containers=container_ids,
+                verify=verify,
+                format="markdown"
+            )
         
         return context.formatted
     
@@ -84,28 +104,207 @@ class GitChainFunctionHandler:
         """Handle gitchain_verify function call."""
         container_id = arguments.get("container_id", "")
         
-        result = self.client.verify(container_id)
+        with self.client.priority("interactive"):
+            result = self.client.verify(container_id)
+        
+        return _format_verification(result)
+    
+    def handle_tool_calls(self, tool_calls: List[Any]) -> List[Dict[str, str]]:
+        """
+        Handle all tool calls of one assistant message together.
+        
+        All gitchain_inject calls are merged into one deduplicated inject
+        (per `verify` flag), all gitchain_verify calls into one batch
+        verification, and both run concurrently. Results are split back
+        per tool call.
+        
+        Example:
+            message = response.choices[0].message
+            messages.append(message)
+            messages.extend(handler.handle_tool_calls(message.tool_calls))
+        
+        Args:
+            tool_calls: OpenAI tool call objects or dicts
+        
+        Returns:
+            Tool messages ({"role": "tool", "tool_call_id", "content"}),
+            in the order of `tool_calls`
+        """
+        calls = [_parse_tool_call(tc) for tc in tool_calls]
+        results: Dict[str, str] = {}
+        
+        inject_groups: Dict[bool, List[Tuple[str, List[str]]]] = {}
+        verify_calls: List[Tuple[str, str]] = []
+        for call_id, name, arguments in calls:
+            if name == "gitchain_inject":
+                verify = bool(arguments.get("verify", True))
+                inject_groups.setdefault(verify, []).append(
+                    (call_id, list(arguments.get("container_ids", [])))
+                )
+            elif name == "gitchain_verify":
+                verify_calls.append((call_id, arguments.get("container_id", "")))
+            else:
+                results[call_id] = f"Unknown function: {name}"
+        
+        if self.session is not None and len(inject_groups) > 1:
+            # One session turn per message, verified if any call asked for it
+            inject_groups = {True: inject_groups[False] + inject_groups[True]}
+        
+        priority = self.client._current_priority()
+        
+        def run(fn, *args) -> Dict[str, str]:
+            with self.client.priority(priority):
+                return fn(*args)
+        
+        jobs = [(self._merged_inject, verify, group) for verify, group in inject_groups.items()]
+        if verify_calls:
+            jobs.append((self._merged_verify, verify_calls))
+        
+        with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as executor:
+            for partial in executor.map(lambda job: run(*job), jobs):
+                results.update(partial)
+        
+        return [
+            {"role": "tool", "tool_call_id": call_id, "content": results[call_id]}
+            for call_id, _, _ in calls
+        ]
+    
+    def _merged_inject(self, verify: bool, group: List[Tuple[str, List[str]]]) -> Dict[str, str]:
+        """One inject for several gitchain_inject calls, split per call."""
+        container_ids = list(dict.fromkeys(i for _, ids in group for i in ids))
+        try:
+            if self.session is not None:
+                # A session emits each container once: the first call gets the
+                # merged delta, the others point to it
+                formatted = self.session.turn(container_ids, verify=verify).formatted
+                first_id = group[0][0]
+                return {
+                    call_id: formatted if call_id == first_id
+                    else f"Included in the result of tool call {first_id}."
+                    for call_id, _ in group
+                }
+            
+            context = self.client.inject(containers=container_ids, verify=verify, format="markdown")
+        except Exception as e:
+            return {call_id: f"Error: {e}" for call_id, _ in group}
+        
+        if len(group) == 1:
+            return {group[0][0]: context.formatted}
+        
+        blocks = context.container_blocks()
+        if blocks is None:
+            # Sections can't be attributed, fall back to one inject per call
+            return {
+                call_id: self._handle_inject({"container_ids": ids, "verify": verify})
+                for call_id, ids in group
+            }
         
-        if result.get("verified"):
-            chain = result.get("chain", {})
-            return (
-                f"Verified: Yes\n"
-                f"Network: {chain.get(network)}\n"
-                f"Batch: {chain.get(batchId)}\n"
-                f"Transaction: {chain.get(txHash, pending)}"
+        by_base = {container_base_id(cid): block for cid, block in blocks.items()}
+        return {
+            call_id: "".join(
+                blocks.get(i) or by_base.get(container_base_id(i), "") for i in dict.fromkeys(ids)
             )
+            for call_id, ids in group
+        }
+    
+    def _merged_verify(self, verify_calls: List[Tuple[str, str]]) -> Dict[str, str]:
+        """One batch verification for several gitchain_verify calls."""
+        container_ids = list(dict.fromkeys(
+            cid for _, cid in verify_calls if cid.startswith("0711:")
+        ))
+        results: Dict[str, str] = {}
+        batch: Optional[Dict[str, Any]] = None
+        try:
+            if container_ids:
+                batch = self.client.verify_batch(container_ids)
+        except Exception as e:
+            batch = {"error": str(e)}
+        
+        by_id = _batch_verifications(batch, container_ids) if batch is not None else {}
+        for call_id, hash_or_id in verify_calls:
+            if hash_or_id in by_id:
+                results[call_id] = by_id[hash_or_id]
+            else:
+                # Content hashes are not part of batch verification
+                try:
+                    results[call_id] = self._handle_verify({"container_id": hash_or_id})
+                except Exception as e:
+                    results[call_id] = f"Error: {e}"
+        return results
+
+
+def _parse_tool_call(tool_call: Any) -> Tuple[str, str, Dict[str, Any]]:
+    """(id, function name, parsed arguments) of an OpenAI tool call object or dict"""
+    if isinstance(tool_call, dict):
+        call_id = tool_call["id"]
+        function = tool_call["function"]
+        name, arguments = function["name"], function.get("arguments") or "{}"
+    else:
+        call_id = tool_call.id
+        name, arguments = tool_call.function.name, tool_call.function.arguments or "{}"
+    if isinstance(arguments, str):
+        try:
+            arguments = json.loads(arguments)
+        except json.JSONDecodeError:
+            arguments = {}
+    return call_id, name, arguments
+
+
+def _format_verification(result: Dict[str, Any]) -> str:
+    """Tool output for a verification result."""
+    if result.get("verified"):
+        chain = result.get("chain") or {}
+        return (
+            f"Verified: Yes\n"
+            f"Network: {chain.get('network')}\n"
+            f"Batch: {chain.get('batchId')}\n"
+            f"Transaction: {chain.get('txHash', 'pending')}"
+        )
+    else:
+        return f"Verified: No\nReason: {result.get('reason', 'unknown')}"
+
+
+def _batch_verifications(batch: Dict[str, Any], container_ids: List[str]) -> Dict[str, str]:
+    """Tool output per container of a POST /api/verify/batch result."""
+    if "error" in batch:
+        return {container_id: f"Error: {batch['error']}" for container_id in container_ids}
+    entries = {c.get("id"): c for c in batch.get("containers", [])}
+    proofs = {p.get("containerId"): p for p in batch.get("proofs", [])}
+    
+    results = {}
+    for container_id in container_ids:
+        entry = entries.get(container_id)
+        proof = proofs.get(container_id)
+        if entry is None:
+            result = {"verified": False, "reason": "Container not found"}
+        elif not entry.get("verified") or proof is None:
+            result = {"verified": False, "reason": (proof or {}).get("reason", "Not anchored on chain")}
         else:
-            return f"Verified: No\nReason: {result.get(reason, unknown)}"
+            result = {"verified": True, "chain": proof}
+        results[container_id] = _format_verification(result)
+    return results
 
 
 def create_system_prompt(
     container_ids: List[str],
     client: Optional[GitChainClient] = None,
-    verify: bool = True
+    verify: bool = True,
+    session: Optional[ContextSession] = None,
+    builder: Optional[SystemPromptBuilder] = None,
 ) -> str:
     """
     Create a system prompt with injected GitChain context.
     
+    The prompt is byte-stable for the same containers (canonical order,
+    verification details last), so provider-side prompt caching applies.
+    Rendered fragments are reused through the client's ContextFormatter.
+    
+    With a session, only the first call injects the full context; later
+    calls return a short update with new or changed containers and atoms.
+    Append each update as another system message instead of replacing the
+    first prompt, which the update builds on. The session's client is
+    used, and `verify` applies to the containers new in this turn.
+    
     Example:
         prompt = create_system_prompt(["0711:product:bosch:7736606982:v3"])
         
@@ -116,23 +315,33 @@ def create_system_prompt(
                 {"role": "user", "content": "What is the COP?"}
             ]
         )
-    """
-    client = client or GitChainClient()
-    
-    context = client.inject(
-        containers=container_ids,
-        verify=verify,
-        format="markdown"
-    )
-    
-    prompt = (
-        "You have access to the following verified product data:\n\n"
-        f"{context.formatted}\n\n"
-    )
+        
+        # With a session, append later turns instead of replacing the prompt
+        session = ContextSession(client)
+        messages = [{"role": "system", "content": create_system_prompt(first_ids, session=session)}]
+        ...
+        messages.append({"role": "system", "content": create_system_prompt(later_ids, session=session)})
     
-    if context.verified:
-        prompt += "All data above is verified on blockchain and can be cited.\n"
-    else:
-        prompt += "Note: Some data could not be verified.\n"
+    Raises:
+        ValueError: If a session is combined with another client or a builder
+    """
+    if session is not None:
+        if client is not None and client is not session.client:
+            raise ValueError("session uses its own client; pass the client to ContextSession")
+        if builder is not None:
+            raise ValueError("builder is not used with a session")
+        first = not session.turns
+        turn = session.turn(container_ids, verify=verify)
+        if first:
+            header = PROMPT_HEADER
+        else:
+            header = "Updates to the product data provided earlier:\n\n"
+        footer = (
+            "All data above is verified on blockchain and can be cited.\n"
+            if verify and turn.verified
+            else "Note: Some data could not be verified.\n"
+        )
+        return f"{header}{turn.formatted}\n\n{footer}"
     
-    return prompt
+    builder = builder or SystemPromptBuilder(client, verify=verify)
+    return builder.build(container_ids)
@@ -0,0 +1,127 @@
+"""
+Byte-stable system prompt builder
+
+LLM providers cache prompts by prefix, so the same container set must
+render to the same bytes on every call. SystemPromptBuilder puts
+containers in canonical order (by container ID, with sorted data keys,
+atoms and citations), renders them through the client's ContextFormatter,
+which memoizes fragments by content hash, and puts volatile parts
+(verification status and timestamps) last.
+
+Example:
+    builder = SystemPromptBuilder(client)
+    prompt = builder.build(["0711:product:bosch:7736606982:v3", "0711:product:bosch:8738208680:v1"])
+"""
+
+from dataclasses import replace
+from typing import Any, List, Optional
+
+from .client import GitChainClient, get_client
+from .types import ChainProof, Container
+
+PROMPT_HEADER = "You have access to the following verified product data:\n\n"
+
+
+def _sorted_keys(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _sorted_keys(value[k]) for k in sorted(value)}
+    if isinstance(value, list):
+        return [_sorted_keys(v) for v in value]
+    return value
+
+
+def canonical(container: Container) -> Container:
+    """Copy of a container with sorted data keys, atoms and citations"""
+    return replace(
+        container,
+        data=_sorted_keys(container.data),
+        atoms=_sorted_keys(container.atoms),
+        citations=sorted(container.citations, key=lambda c: (c.document_id, c.page or 0, c.quote or "")),
+    )
+
+
+def render_verification(container_ids: List[str], proofs: List[ChainProof], verified: bool) -> str:
+    """Volatile verification section, kept at the end of the prompt"""
+    by_id = {p.container_id: p for p in proofs}
+    lines = ["## Verification"]
+    for container_id in container_ids:
+        proof = by_id.get(container_id)
+        if proof is None:
+            continue
+        if proof.verified:
+            lines.append(
+                f"- `{container_id}`: verified (batch {proof.batch_id}, tx {proof.tx_hash}, at {proof.verified_at})"
+            )
+        else:
+            lines.append(f"- `{container_id}`: not verified ({proof.reason or 'unknown'})")
+    out = "\n".join(lines) + "\n\n" if len(lines) > 1 else ""
+
+    if verified:
+        out += "All data above is verified on blockchain and can be cited.\n"
+    else:
+        out += "Note: Some data could not be verified.\n"
+    return out
+
+
+class SystemPromptBuilder:
+    """
+    Builds prefix-cache-friendly system prompts
+
+    The stable part (header and container fragments) only changes when a
+    container's content changes; verification details follow at the end.
+    Fragments use the client's ContextFormatter layout and cache.
+    """
+
+    def __init__(
+        self,
+        client: Optional[GitChainClient] = None,
+        verify: bool = True,
+        fields: Optional[List[str]] = None,
+        min_trust: Optional[str] = None,
+        header: str = PROMPT_HEADER,
+    ):
+        """
+        Args:
+            client: GitChain client (default: shared default client)
+            verify: Verify blockchain proofs
+            fields: Only include these field_path globs
+            min_trust: Only include atoms at or above this trust level
+            header: Text preceding the container fragments
+        """
+        self.client = client or get_client()
+        self.verify = verify
+        self.fields = fields
+        self.min_trust = min_trust
+        self.header = header
+
+    def build(self, container_ids: List[str]) -> str:
+        """
+        Fetch containers and render the system prompt
+
+        Args:
+            container_ids: Container IDs (order and duplicates don't matter)
+
+        Returns:
+            System prompt text
+        """
+        with self.client.priority("interactive"):
+            context = self.client.inject(
+                containers=sorted(set(container_ids)),
+                verify=self.verify,
+                format="json",
+                fields=self.fields,
+                min_trust=self.min_trust,
+            )
+        return self.render(context.containers, context.proofs, context.verified)
+
+    def render(
+        self,
+        containers: List[Container],
+        proofs: Optional[List[ChainProof]] = None,
+        verified: bool = False,
+    ) -> str:
+        """Render already fetched containers"""
+        ordered = sorted({c.id: c for c in containers}.values(), key=lambda c: c.id)
+        formatter = self.client.formatter
+        stable = self.header + "".join(formatter.fragment(canonical(c), "markdown") + "\n" for c in ordered)
+        return stable + render_verification([c.id for c in ordered], proofs or [], verified)
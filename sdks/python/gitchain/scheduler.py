@@ -0,0 +1,234 @@
+"""
+Client-side rate-limit scheduler
+
+Shares one API key's rate budget between interactive agents and batch jobs:
+a token bucket per key, strict priority classes, fair queueing between
+threads within a class, and an adaptive rate driven by 429/Retry-After.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
+
+# Priority classes - lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+PRIORITIES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "batch": PRIORITY_BATCH,
+}
+
+
+def _resolve_priority(priority: Union[int, str]) -> int:
+    if isinstance(priority, str):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        return PRIORITIES[priority]
+    return priority
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available (0 if available now)"""
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class _KeyState:
+    """Per-key bucket, wait queue and fairness bookkeeping"""
+
+    def __init__(self, rate: float, burst: float):
+        self.bucket = TokenBucket(rate, burst)
+        self.cond = threading.Condition()
+        self.queue: List[list] = []
+        self.blocked_until = 0.0
+        # Start-time fair queueing: a thread's next request is tagged after
+        # its previous one, so one busy thread cannot starve the others.
+        self.virtual_time = 0.0
+        self.thread_tags: Dict[int, float] = {}
+
+
+class RateLimitScheduler:
+    """
+    Schedules API requests against per-key rate limits
+
+    Requests wait for a token from their key's bucket. Interactive requests
+    are always dispatched before batch requests; requests of the same class
+    are interleaved fairly across threads. A 429 response halves the rate
+    and pauses the key for `Retry-After` seconds, successes grow it back
+    additively up to `max_rate`.
+
+    Example:
+        scheduler = RateLimitScheduler(rate=20)
+        client = GitChainClient(api_key="...", scheduler=scheduler)
+
+        with client.priority("batch"):
+            client.inject(["0711:product:bosch:7736606982:v3"])
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+    ):
+        """
+        Args:
+            rate: Initial requests per second per key
+            burst: Bucket size (default: same as rate)
+            min_rate: Lower bound for the adaptive rate
+            max_rate: Upper bound for the adaptive rate (default: rate)
+            increase: Rate added after each successful request
+            decrease: Factor applied to the rate after a 429
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase = increase
+        self.decrease = decrease
+        self._states: Dict[str, _KeyState] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._seq = itertools.count()
+
+    def _state(self, key: str) -> _KeyState:
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = _KeyState(self.rate, self.burst)
+                self._states[key] = state
+            return state
+
+    @contextmanager
+    def priority(self, priority: Union[int, str]) -> Iterator[None]:
+        """Run requests made by the current thread at the given priority"""
+        previous = getattr(self._local, "priority", None)
+        self._local.priority = _resolve_priority(priority)
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def current_priority(self, default: Union[int, str] = PRIORITY_INTERACTIVE) -> int:
+        """Priority set by the innermost `priority()` block, or `default`"""
+        priority = getattr(self._local, "priority", None)
+        return priority if priority is not None else _resolve_priority(default)
+
+    def acquire(
+        self,
+        key: str,
+        priority: Union[int, str] = PRIORITY_INTERACTIVE,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Block until a request for `key` may be sent
+
+        Args:
+            key: Rate-limit key (usually the API key)
+            priority: Priority class name or value
+            timeout: Maximum seconds to wait
+
+        Raises:
+            TimeoutError: If no slot became free within `timeout`
+        """
+        state = self._state(key)
+        thread_id = threading.get_ident()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with state.cond:
+            tag = max(state.virtual_time, state.thread_tags.get(thread_id, 0.0)) + 1
+            state.thread_tags[thread_id] = tag
+            entry = [_resolve_priority(priority), tag, next(self._seq)]
+            heapq.heappush(state.queue, entry)
+
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait: Optional[float] = None
+                    if state.queue[0] is entry:
+                        wait = max(state.blocked_until - now, state.bucket.delay(now))
+                        if wait <= 0:
+                            heapq.heappop(state.queue)
+                            state.bucket.take()
+                            state.virtual_time = tag
+                            state.cond.notify_all()
+                            return
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            raise TimeoutError(f"Rate limit slot for {key} not available")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    state.cond.wait(wait)
+            except BaseException:
+                if entry in state.queue:
+                    state.queue.remove(entry)
+                    heapq.heapify(state.queue)
+                    state.cond.notify_all()
+                raise
+
+    def feedback(self, key: str, status: int, retry_after: Optional[float] = None) -> None:
+        """
+        Adapt the key's rate to a response
+
+        Args:
+            key: Rate-limit key the request was sent with
+            status: HTTP status code of the response
+            retry_after: Parsed `Retry-After` header in seconds, if any
+        """
+        state = self._state(key)
+        with state.cond:
+            bucket = state.bucket
+            bucket.refill(time.monotonic())
+            if status == 429:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                bucket.tokens = min(bucket.tokens, 0.0)
+                pause = retry_after if retry_after is not None else 1 / bucket.rate
+                state.blocked_until = max(state.blocked_until, time.monotonic() + pause)
+            elif status < 400:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+            state.cond.notify_all()
+
+    def current_rate(self, key: str) -> float:
+        """Current adaptive rate for `key` in requests per second"""
+        return self._state(key).bucket.rate
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,261 @@
+"""
+Differential context for multi-turn conversations
+
+A ContextSession remembers which containers were already injected into a
+conversation. Later turns only fetch and emit containers that are new or
+changed, as compact delta blocks, instead of re-injecting everything.
+
+Example:
+    session = ContextSession(client)
+
+    first = session.turn(["0711:product:bosch:7736606982:v3"])
+    messages.append({"role": "system", "content": first.formatted})
+
+    later = session.turn(["0711:product:bosch:7736606982:v4", "0711:product:bosch:8738208680:v1"])
+    messages.append({"role": "system", "content": later.formatted})
+    print(later.tokens_saved)
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import container_base_id
+from .client import GitChainClient
+from .types import Container, estimate_tokens
+
+
+@dataclass
+class SessionTurn:
+    """Context emitted for one conversation turn"""
+    formatted: str
+    new: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    # Everything emitted came from a verified inject (or verify was off)
+    verified: bool = False
+    tokens_emitted: int = 0
+    tokens_full: int = 0  # Tokens a full re-injection of this turn would cost
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.tokens_full - self.tokens_emitted, 0)
+
+
+@dataclass
+class _Entry:
+    container: Container
+    tokens: int
+
+
+def _changed_keys(before: Dict[str, Any], after: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Keys added or changed in `after`, and keys removed from `before`"""
+    changed = {
+        k: v for k, v in after.items()
+        if k not in before or json.dumps(before[k], sort_keys=True) != json.dumps(v, sort_keys=True)
+    }
+    return changed, [k for k in before if k not in after]
+
+
+def _format_value(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+class ContextSession:
+    """
+    Tracks injected context across the turns of one conversation
+
+    Containers are matched by ID without version, so moving from ":v3" to
+    ":v4" emits only the version delta. Containers requested again at the
+    same version are not re-emitted unless `refresh=True` finds in-place
+    changes.
+    """
+
+    def __init__(
+        self,
+        client: Optional[GitChainClient] = None,
+        verify: bool = True,
+        fields: Optional[List[str]] = None,
+        min_trust: Optional[str] = None,
+    ):
+        """
+        Args:
+            client: GitChain client (default: new client)
+            verify: Verify blockchain proofs of injected containers
+            fields: Only include these field_path globs
+            min_trust: Only include atoms at or above this trust level
+        """
+        self.client = client or GitChainClient()
+        self.verify = verify
+        self.fields = fields
+        self.min_trust = min_trust
+        self.turns: List[SessionTurn] = []
+        self._entries: Dict[str, _Entry] = {}
+
+    @property
+    def total_tokens_saved(self) -> int:
+        return sum(t.tokens_saved for t in self.turns)
+
+    def reset(self) -> None:
+        """Forget everything, e.g. after the conversation was truncated"""
+        self._entries.clear()
+        self.turns.clear()
+
+    def forget(self, container_id: str) -> None:
+        """Re-emit a container in full the next time it is requested"""
+        self._entries.pop(container_base_id(container_id), None)
+
+    def turn(
+        self,
+        container_ids: List[str],
+        refresh: bool = False,
+        verify: Optional[bool] = None,
+    ) -> SessionTurn:
+        """
+        Context for the next turn
+
+        Args:
+            container_ids: Containers relevant to this turn
+            refresh: Also check containers at an already injected version
+                for in-place updates
+            verify: Verify new containers (default: the session's setting)
+
+        Returns:
+            SessionTurn with the formatted delta and token accounting
+        """
+        verify = self.verify if verify is None else verify
+        new_ids, upgrades, same = [], [], []
+        for container_id in dict.fromkeys(container_ids):
+            entry = self._entries.get(container_base_id(container_id))
+            if entry is None:
+                new_ids.append(container_id)
+            elif entry.container.id != container_id:
+                upgrades.append((entry, container_id))
+            else:
+                same.append(entry)
+
+        result = SessionTurn(formatted="", verified=not verify)
+        blocks: List[str] = []
+
+        if new_ids:
+            blocks.append(self._inject_new(new_ids, verify, result))
+            result.tokens_full += estimate_tokens(blocks[-1])
+
+        for entry, container_id in upgrades:
+            block = self._upgrade(entry, container_id)
+            result.changed.append(container_id)
+            if block:
+                blocks.append(block)
+
+        if refresh and same:
+            blocks.extend(self._refresh(same, result))
+        else:
+            result.unchanged.extend(e.container.id for e in same)
+
+        # Version deltas and refreshed containers are not verified
+        if result.changed:
+            result.verified = not verify
+
+        if result.unchanged:
+            blocks.append("Unchanged, see earlier context: " + ", ".join(f"`{i}`" for i in result.unchanged) + "\n")
+
+        result.formatted = "\n".join(b for b in blocks if b)
+        result.tokens_emitted = estimate_tokens(result.formatted)
+        result.tokens_full += sum(entry.tokens for entry, _ in upgrades) + sum(e.tokens for e in same)
+        self.turns.append(result)
+        return result
+
+    def _inject_new(self, container_ids: List[str], verify: bool, result: SessionTurn) -> str:
+        with self.client.priority("interactive"):
+            context = self.client.inject(
+                containers=container_ids,
+                verify=verify,
+                format="markdown",
+                fields=self.fields,
+                min_trust=self.min_trust,
+            )
+        result.verified = context.verified or not verify
+
+        blocks = context.container_blocks()
+        share = estimate_tokens(context.formatted) // max(len(context.containers), 1)
+        for container in context.containers:
+            tokens = estimate_tokens(blocks[container.id]) if blocks else share
+            self._entries[container_base_id(container.id)] = _Entry(container, tokens)
+            result.new.append(container.id)
+        return context.formatted
+
+    def _upgrade(self, entry: _Entry, container_id: str) -> str:
+        container = entry.container
+        old_id = container.id
+        with self.client.priority("interactive"):
+            delta = self.client.diff(old_id, container.version, _version_of(container_id))
+
+        # Same projection as the injected container; removals only of what
+        # this conversation has seen
+        delta = delta.project(self.fields, self.min_trust)
+        delta.data_removed = [k for k in delta.data_removed if k in container.data]
+        if container.atoms is not None:
+            delta.atoms_removed = [p for p in delta.atoms_removed if p in container.atoms]
+        delta.apply(container)
+
+        lines = [f"- **{k}:** {_format_value(v)}" for k, v in delta.data_set.items()]
+        lines += [f"- removed **{k}**" for k in delta.data_removed]
+        lines += self._atom_lines({**delta.atoms_added, **delta.atoms_changed}, delta.atoms_removed)
+        lines += [f"- new source: {c.document_id}" + (f", p. {c.page}" if c.page else "") for c in delta.citations_added]
+        if not lines:
+            return f"### `{container_id}` (was `{old_id}`): no changes\n"
+
+        block = "\n".join([f"### `{container_id}` (updated from `{old_id}`)"] + lines) + "\n"
+        entry.tokens += estimate_tokens(block)
+        return block
+
+    def _refresh(self, entries: List[_Entry], result: SessionTurn) -> List[str]:
+        ids = [e.container.id for e in entries]
+        with self.client.priority("interactive"):
+            context = self.client.inject(
+                containers=ids,
+                verify=False,
+                format="json",
+                fields=self.fields,
+                min_trust=self.min_trust,
+            )
+        fresh = {c.id: c for c in context.containers}
+
+        blocks = []
+        for entry in entries:
+            container = fresh.get(entry.container.id)
+            if container is None:
+                result.unchanged.append(entry.container.id)
+                continue
+            data_set, data_removed = _changed_keys(entry.container.data, container.data)
+            atoms_set, atoms_removed = _changed_keys(entry.container.atoms or {}, container.atoms or {})
+            if not (data_set or data_removed or atoms_set or atoms_removed):
+                result.unchanged.append(container.id)
+                continue
+
+            lines = [f"### `{container.id}` (updated)"]
+            lines += [f"- **{k}:** {_format_value(v)}" for k, v in data_set.items()]
+            lines += [f"- removed **{k}**" for k in data_removed]
+            lines += self._atom_lines(atoms_set, atoms_removed)
+            block = "\n".join(lines) + "\n"
+            blocks.append(block)
+
+            entry.container = container
+            entry.tokens += estimate_tokens(block)
+            result.changed.append(container.id)
+        return blocks
+
+    @staticmethod
+    def _atom_lines(atoms: Dict[str, Any], removed: List[str]) -> List[str]:
+        lines = []
+        for path, atom in atoms.items():
+            unit = f" {atom['unit']}" if atom.get("unit") else ""
+            trust = f" _({atom['trust']})_" if atom.get("trust") else ""
+            lines.append(f"- **{path}:** {_format_value(atom.get('value'))}{unit}{trust}")
+        lines += [f"- removed **{path}**" for path in removed]
+        return lines
+
+
+def _version_of(container_id: str) -> Optional[int]:
+    version = container_id.rsplit(":", 1)[-1]
+    return int(version[1:]) if version[:1] == "v" and version[1:].isdigit() else None
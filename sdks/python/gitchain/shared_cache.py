@@ -0,0 +1,220 @@
+"""
+Container cache shared by all processes on a host
+
+Multi-worker deployments (gunicorn, uvicorn) run one client per process.
+A `SharedCache` keeps raw container payloads in one SQLite file that every
+worker opens, so each container is fetched once per host instead of once
+per worker. Reads go through SQLite's memory-mapped I/O, i.e. straight from
+the page cache the workers share. When several workers miss the same
+container at once, one of them fetches it while the others wait for its
+result.
+
+Example:
+    client = GitChainClient(api_key="...", shared_cache="/dev/shm/gitchain-cache.db")
+    client.get_container("0711:product:bosch:7736606982:v3")  # fetched once per host
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from .cache import container_base_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    container_id TEXT PRIMARY KEY,
+    base_id TEXT NOT NULL,
+    version INTEGER,
+    payload BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_base ON entries(base_id);
+CREATE INDEX IF NOT EXISTS idx_entries_stored ON entries(stored_at);
+
+CREATE TABLE IF NOT EXISTS fills (
+    container_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+_VERSION = re.compile(r":v(\d+)$")
+
+# Expired rows are purged every this many writes
+_PURGE_EVERY = 256
+
+
+class SharedCache:
+    """
+    Cross-process TTL cache of raw container payloads, keyed by container ID
+
+    Safe to use from several threads and processes, and across fork():
+    each process and thread opens its own connection.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 300,
+        max_entries: int = 100_000,
+        fill_timeout: float = 10,
+        mmap_size: int = 256 * 1024 * 1024,
+    ):
+        """
+        Args:
+            path: SQLite database file, ideally on tmpfs (e.g. /dev/shm)
+            ttl: Seconds a payload is served after it was stored
+            max_entries: Upper bound of cached containers; oldest go first
+            fill_timeout: Seconds to wait for another process fetching the
+                same container before fetching it ourselves
+            mmap_size: Bytes of the database file read through mmap
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.fill_timeout = fill_timeout
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._writes = 0
+        self._db().executescript(SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        """Connection of the calling thread, reopened after fork()"""
+        pid = os.getpid()
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != pid:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=OFF")
+            db.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.db = db
+            self._local.pid = pid
+        return db
+
+    def get(self, container_id: str) -> Optional[bytes]:
+        """Return the cached payload, or None if missing or expired"""
+        row = self._db().execute(
+            "SELECT payload FROM entries WHERE container_id = ? AND expires_at > ?",
+            (container_id, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, container_id: str, payload: bytes, ttl: Optional[float] = None) -> None:
+        """Store a raw payload for all processes"""
+        now = time.time()
+        match = _VERSION.search(container_id)
+        self._db().execute(
+            "INSERT OR REPLACE INTO entries "
+            "(container_id, base_id, version, payload, stored_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                container_id,
+                container_base_id(container_id),
+                int(match.group(1)) if match else None,
+                payload,
+                now,
+                now + (ttl if ttl is not None else self.ttl),
+            ),
+        )
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            self.purge()
+
+    def get_or_fill(self, container_id: str, fetch: Callable[[], bytes]) -> bytes:
+        """
+        Return the cached payload, fetching it on a miss
+
+        Only one process fetches a given container at a time. The others
+        wait up to `fill_timeout` for its result and only fetch themselves
+        if it does not arrive (e.g. the fetch failed).
+
+        Args:
+            container_id: Container ID
+            fetch: Returns the raw payload from the API
+
+        Returns:
+            Raw payload
+        """
+        deadline = time.monotonic() + self.fill_timeout
+        delay = 0.005
+        while True:
+            payload = self.get(container_id)
+            if payload is not None:
+                return payload
+            if self._claim(container_id):
+                try:
+                    payload = fetch()
+                    self.set(container_id, payload)
+                    return payload
+                finally:
+                    self._release(container_id)
+            if time.monotonic() >= deadline:
+                return fetch()
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    def _owner(self) -> str:
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def _claim(self, container_id: str) -> bool:
+        """Take the fill lease of a container unless another live one exists"""
+        now = time.time()
+        cursor = self._db().execute(
+            "INSERT INTO fills (container_id, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(container_id) DO UPDATE SET owner = excluded.owner, "
+            "expires_at = excluded.expires_at WHERE fills.expires_at <= ?",
+            (container_id, self._owner(), now + self.fill_timeout, now),
+        )
+        return cursor.rowcount == 1
+
+    def _release(self, container_id: str) -> None:
+        self._db().execute(
+            "DELETE FROM fills WHERE container_id = ? AND owner = ?",
+            (container_id, self._owner()),
+        )
+
+    def delete(self, container_id: str) -> None:
+        self._db().execute("DELETE FROM entries WHERE container_id = ?", (container_id,))
+
+    def invalidate(self, container_id: str) -> int:
+        """
+        Drop every version of a container (including ":latest" aliases)
+
+        Returns:
+            Number of removed entries
+        """
+        cursor = self._db().execute(
+            "DELETE FROM entries WHERE base_id = ?", (container_base_id(container_id),)
+        )
+        return cursor.rowcount
+
+    def purge(self) -> int:
+        """
+        Drop expired entries, then the oldest ones above `max_entries`
+
+        Returns:
+            Number of removed entries
+        """
+        db = self._db()
+        removed = db.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),)).rowcount
+        removed += db.execute(
+            "DELETE FROM entries WHERE container_id IN ("
+            "SELECT container_id FROM entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        return removed
+
+    def clear(self) -> None:
+        self._db().execute("DELETE FROM entries")
+
+    def __contains__(self, container_id: str) -> bool:
+        return self.get(container_id) is not None
+
+    def __len__(self) -> int:
+        return self._db().execute(
+            "SELECT COUNT(*) FROM entries WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
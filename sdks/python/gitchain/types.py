@@ -2,11 +2,65 @@
 Type definitions for GitChain Python SDK
 """
 
-from dataclasses import dataclass, field
+import re
+from dataclasses import dataclass, field, replace
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
+# Atom trust levels, most trusted first (mirrors TRUST_PRIORITY in @0711/core)
+TRUST_PRIORITY: Dict[str, int] = {
+    "highest": 1,
+    "high": 2,
+    "certified": 3,
+    "verified": 4,
+    "medium": 5,
+    "customer": 6,
+    "generated": 7,
+    "community": 8,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token, as in @0711/inject)"""
+    return (len(text) + 3) // 4
+
+
+_CONTAINER_ID = re.compile(r"^0711:(\w+):([^:]+):([^:]+):v(\d+)$")
+
+
+def parse_container_id(container_id: str) -> Optional[Dict[str, Any]]:
+    """type, namespace, identifier and version of a versioned container ID (parseContainerId)"""
+    match = _CONTAINER_ID.match(container_id)
+    if match is None:
+        return None
+    return {
+        "type": match.group(1),
+        "namespace": match.group(2),
+        "identifier": match.group(3),
+        "version": int(match.group(4)),
+    }
+
+
+def field_glob_regex(glob: str) -> "re.Pattern[str]":
+    """field_path glob ("leistung.*") as regex, same rules as the API"""
+    return re.compile("^" + re.escape(glob).replace(r"\*", ".*").replace(r"\?", ".") + "$")
+
+
+def project_fields(data: Dict[str, Any], globs: List["re.Pattern[str]"], prefix: str = "") -> Dict[str, Any]:
+    """Python port of projectFields() in apps/api/src/services/atoms.ts"""
+    result: Dict[str, Any] = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if any(g.match(path) for g in globs):
+            result[key] = value
+        elif isinstance(value, dict):
+            nested = project_fields(value, globs, path)
+            if nested:
+                result[key] = nested
+    return result
+
+
 @dataclass
 class Citation:
     """Source citation for a data point"""
@@ -28,6 +82,20 @@ class ChainProof:
     verified_at: Optional[str] = None
     reason: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, p: Dict[str, Any]) -> "ChainProof":
+        """Create ChainProof from an inject or batch verify proof"""
+        return cls(
+            container_id=p["containerId"],
+            verified=bool(p.get("verified")),
+            network=p.get("network"),
+            batch_id=p.get("batchId"),
+            tx_hash=p.get("txHash"),
+            block_number=p.get("blockNumber"),
+            verified_at=p.get("verifiedAt"),
+            reason=p.get("reason"),
+        )
+
 
 @dataclass
 class ContainerMeta:
@@ -53,17 +121,30 @@ class Container:
     citations: List[Citation] = field(default_factory=list)
     chain: Optional[Dict[str, Any]] = None
     git: Optional[Dict[str, Any]] = None
+    atoms: Optional[Dict[str, Any]] = None  # Only set for fields/min_trust reads
+    # Pre-rendered context of the container (inject responses), see ContextArtifact
+    context_hash: Optional[str] = field(default=None, compare=False)
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "Container":
-        """Create Container from API response dict"""
+        """Create Container from API response dict
+
+        Also accepts container rows as returned by GET /api/containers,
+        where `id` is the UUID and `container_id` the GitChain ID. Inject
+        rows of servers that only send the ID get type, namespace,
+        identifier and version from it.
+        """
+        container_id = d.get("container_id") or d["id"]
+        parsed = parse_container_id(container_id) or {}
+        m = d.get("meta") or {}
+        data = d.get("data") or {}
         meta = ContainerMeta(
-            name=d["meta"]["name"],
-            created_at=d["meta"]["createdAt"],
-            updated_at=d["meta"]["updatedAt"],
-            author=d["meta"]["author"],
-            description=d["meta"].get("description"),
-            tags=d["meta"].get("tags", []),
+            name=m.get("name") or data.get("name") or d.get("identifier") or parsed.get("identifier", ""),
+            created_at=m.get("createdAt", d.get("created_at", "")),
+            updated_at=m.get("updatedAt", d.get("updated_at", "")),
+            author=m.get("author", d.get("created_by") or ""),
+            description=m.get("description", d.get("description")),
+            tags=m.get("tags", []),
         )
         citations = [
             Citation(
@@ -75,16 +156,108 @@ class Container:
             for c in d.get("citations", [])
         ]
         return cls(
-            id=d["id"],
-            type=d["type"],
-            namespace=d["namespace"],
-            identifier=d["identifier"],
-            version=d["version"],
+            id=container_id,
+            type=d.get("type") or parsed.get("type", ""),
+            namespace=d.get("namespace") or parsed.get("namespace", ""),
+            identifier=d.get("identifier") or parsed.get("identifier", ""),
+            version=d.get("version") or parsed.get("version", 0),
             meta=meta,
-            data=d.get("data", {}),
+            data=data,
             citations=citations,
             chain=d.get("chain"),
             git=d.get("git"),
+            atoms=d.get("atoms"),
+            context_hash=d.get("contextHash"),
+        )
+
+
+@dataclass
+class SearchHit:
+    """Search result"""
+    container: Container
+    score: float  # Relevance, higher is better; only comparable within one search
+
+
+class NormalizedTables:
+    """
+    Shared tables of a normalized inject response (`"normalize": true`)
+
+    Citations are built once per table row, on first reference, and shared
+    by every container citing them. Atom references are resolved in place
+    when the container is built, so `Container.atoms` is always expanded.
+    """
+
+    def __init__(self, tables: Dict[str, Any]):
+        self.documents: List[str] = tables.get("documents") or []
+        self.contributors: List[str] = tables.get("contributors") or []
+        self.units: List[str] = tables.get("units") or []
+        self.commits: List[str] = tables.get("commits") or []
+        self._rows: List[Dict[str, Any]] = tables.get("citations") or []
+        self._citations: List[Optional[Citation]] = [None] * len(self._rows)
+
+    def citation(self, index: int) -> Citation:
+        citation = self._citations[index]
+        if citation is None:
+            row = self._rows[index]
+            citation = self._citations[index] = Citation(
+                document_id=self.documents[row["document"]],
+                page=row.get("page"),
+                quote=row.get("quote"),
+                confidence=row.get("confidence", "confirmed"),
+            )
+        return citation
+
+    def atoms(self, atoms: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Resolve units, contributors, commits and cited documents of atoms in place"""
+        for atom in (atoms or {}).values():
+            unit = atom.get("unit")
+            if unit is not None:
+                atom["unit"] = self.units[unit]
+            commit = atom.get("commit")
+            if commit is not None:
+                atom["commit"] = self.commits[commit]
+            source = atom.get("source")
+            if source:
+                source["contributor_id"] = self.contributors[source["contributor_id"]]
+            citation = atom.get("citation")
+            if citation:
+                citation["document"] = self.documents[citation["document"]]
+        return atoms
+
+    def row(self, d: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalized inject row in the regular response shape"""
+        citations = [self.citation(i) for i in d.get("citations") or []]
+        return {
+            **d,
+            "atoms": self.atoms(d.get("atoms")),
+            "citations": [
+                {"documentId": c.document_id, "page": c.page, "quote": c.quote, "confidence": c.confidence}
+                for c in citations
+            ],
+        }
+
+    def container(self, d: Dict[str, Any]) -> Container:
+        """Container from a normalized inject row, atoms resolved"""
+        container = Container.from_dict({**d, "atoms": self.atoms(d.get("atoms")), "citations": []})
+        container.citations = [self.citation(i) for i in d.get("citations") or []]
+        return container
+
+
+@dataclass
+class ContextArtifact:
+    """Inject context of one container, pre-rendered when it was written"""
+    hash: str
+    format: str
+    content: str
+    token_count: int
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ContextArtifact":
+        return cls(
+            hash=d["hash"],
+            format=d.get("format", "markdown"),
+            content=d.get("content", ""),
+            token_count=d.get("tokenCount", 0),
         )
 
 
@@ -98,39 +271,211 @@ class InjectedContext:
     token_count: int
     verified: bool
     verified_at: str
+    _proofs_by_id: Optional[Dict[str, ChainProof]] = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "InjectedContext":
-        """Create InjectedContext from API response dict"""
-        containers = [Container.from_dict(c) for c in d.get("containers", [])]
-        citations = [
-            Citation(
-                document_id=c["documentId"],
-                page=c.get("page"),
-                quote=c.get("quote"),
-                confidence=c.get("confidence", "confirmed"),
-            )
-            for c in d.get("citations", [])
-        ]
-        proofs = [
-            ChainProof(
-                container_id=p["containerId"],
-                verified=p["verified"],
-                network=p.get("network"),
-                batch_id=p.get("batchId"),
-                tx_hash=p.get("txHash"),
-                block_number=p.get("blockNumber"),
-                verified_at=p.get("verifiedAt"),
-                reason=p.get("reason"),
-            )
-            for p in d.get("proofs", [])
-        ]
+        """Create InjectedContext from API response dict
+
+        Also accepts normalized responses (shared `tables` referenced by
+        index), see NormalizedTables.
+        """
+        if d.get("normalized"):
+            tables = NormalizedTables(d.get("tables") or {})
+            containers = [tables.container(c) for c in d.get("containers", [])]
+            citations = [tables.citation(i) for i in d.get("citations", [])]
+        else:
+            containers = [Container.from_dict(c) for c in d.get("containers", [])]
+            citations = [
+                Citation(
+                    document_id=c["documentId"],
+                    page=c.get("page"),
+                    quote=c.get("quote"),
+                    confidence=c.get("confidence", "confirmed"),
+                )
+                for c in d.get("citations", [])
+            ]
+        proofs = [ChainProof.from_dict(p) for p in d.get("proofs", [])]
+        formatted = d.get("formatted", "")
         return cls(
             containers=containers,
             citations=citations,
             proofs=proofs,
-            formatted=d.get("formatted", ""),
-            token_count=d.get("tokenCount", 0),
+            formatted=formatted,
+            token_count=d.get("tokenCount") or estimate_tokens(formatted),
             verified=d.get("verified", False),
             verified_at=d.get("verifiedAt", ""),
         )
+
+    def proof(self, container_id: str) -> Optional[ChainProof]:
+        """Proof of a container by its exact ID, or None (indexed on first use)"""
+        if self._proofs_by_id is None:
+            self._proofs_by_id = {p.container_id: p for p in self.proofs}
+        return self._proofs_by_id.get(container_id)
+
+    def container_blocks(self) -> Optional[Dict[str, str]]:
+        """
+        Split markdown `formatted` into per-container sections
+
+        Sections are cut at each container's heading and ID line, in
+        `containers` order, so rules or headings inside a description don't
+        shift the split. Both the inject API layout ("# name" /
+        "**Container ID:**") and the local formatter's ("## name" /
+        "**ID:**") are recognized.
+
+        Returns:
+            Sections keyed by container ID, or None if they can't be matched
+            to `containers` (e.g. non-markdown output)
+        """
+        for heading, label in (("# ", "**Container ID:**"), ("## ", "**ID:**")):
+            blocks = self._split_sections(heading, label)
+            if blocks is not None:
+                return blocks
+        return None
+
+    def _split_sections(self, heading: str, label: str) -> Optional[Dict[str, str]]:
+        text = self.formatted
+        starts: List[int] = []
+        pos = 0
+        for c in self.containers:
+            marker = text.find(f"\n\n{label} `{c.id}`\n", pos)
+            if marker < 0:
+                return None
+            start = text.rfind("\n", 0, marker) + 1
+            if not text.startswith(heading, start):
+                return None
+            starts.append(start)
+            pos = marker + 1
+        ends = starts[1:] + [len(text)]
+        return {c.id: text[start:end] for c, start, end in zip(self.containers, starts, ends)}
+
+
+@dataclass
+class ContainerDelta:
+    """Changes between two versions of a container"""
+    container_id: str
+    from_version: int
+    to_version: int
+    content_hash: Optional[str] = None
+    data_set: Dict[str, Any] = field(default_factory=dict)
+    data_removed: List[str] = field(default_factory=list)
+    atoms_added: Dict[str, Any] = field(default_factory=dict)
+    atoms_changed: Dict[str, Any] = field(default_factory=dict)
+    atoms_removed: List[str] = field(default_factory=list)
+    citations_added: List[Citation] = field(default_factory=list)
+    citations_removed: List[Citation] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.data_set or self.data_removed
+            or self.atoms_added or self.atoms_changed or self.atoms_removed
+            or self.citations_added or self.citations_removed
+        )
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ContainerDelta":
+        """Create ContainerDelta from GET /api/containers/:id/diff response"""
+        data = d.get("data") or {}
+        atoms = d.get("atoms") or {}
+        citations = d.get("citations") or {}
+
+        def to_citation(c: Dict[str, Any]) -> Citation:
+            return Citation(document_id=c["documentId"], page=c.get("page"), quote=c.get("quote"))
+
+        return cls(
+            container_id=d["containerId"],
+            from_version=d["fromVersion"],
+            to_version=d["toVersion"],
+            content_hash=d.get("contentHash"),
+            data_set=data.get("set", {}),
+            data_removed=data.get("removed", []),
+            atoms_added=atoms.get("added", {}),
+            atoms_changed=atoms.get("changed", {}),
+            atoms_removed=atoms.get("removed", []),
+            citations_added=[to_citation(c) for c in citations.get("added", [])],
+            citations_removed=[to_citation(c) for c in citations.get("removed", [])],
+        )
+
+    def project(
+        self, fields: Optional[List[str]] = None, min_trust: Optional[str] = None
+    ) -> "ContainerDelta":
+        """
+        The delta as seen through an inject projection
+
+        Keeps data and atoms matching the `fields` globs and atoms at or
+        above `min_trust`, as POST /api/inject with fields / minTrust would.
+        A changed atom that falls below `min_trust` is reported as removed.
+
+        Args:
+            fields: Only include these field_path globs
+            min_trust: Only include atoms at or above this trust level
+
+        Returns:
+            Projected copy (self if there is nothing to filter)
+        """
+        if not fields and not min_trust:
+            return self
+        if min_trust and min_trust not in TRUST_PRIORITY:
+            raise ValueError(f"Invalid min_trust: {min_trust}")
+        globs = [field_glob_regex(f) for f in fields or []]
+
+        def selected(path: str) -> bool:
+            return not globs or any(g.match(path) for g in globs)
+
+        def trusted(atom: Dict[str, Any]) -> bool:
+            priority = TRUST_PRIORITY.get(atom.get("trust"), len(TRUST_PRIORITY) + 1)
+            return not min_trust or priority <= TRUST_PRIORITY[min_trust]
+
+        atoms_added = {p: a for p, a in self.atoms_added.items() if selected(p) and trusted(a)}
+        atoms_changed = {p: a for p, a in self.atoms_changed.items() if selected(p) and trusted(a)}
+        atoms_removed = [p for p in self.atoms_removed if selected(p)]
+        atoms_removed += [p for p, a in self.atoms_changed.items() if selected(p) and not trusted(a)]
+
+        # Citations reach the context through the atoms that reference them
+        cited = {
+            (a["citation"].get("document"), a["citation"].get("page"))
+            for a in {**atoms_added, **atoms_changed}.values() if a.get("citation")
+        }
+        return replace(
+            self,
+            data_set=project_fields(self.data_set, globs) if globs else dict(self.data_set),
+            data_removed=[
+                k for k in self.data_removed
+                if selected(k) or any(f.startswith(f"{k}.") for f in fields or [])
+            ],
+            atoms_added=atoms_added,
+            atoms_changed=atoms_changed,
+            atoms_removed=atoms_removed,
+            citations_added=[c for c in self.citations_added if (c.document_id, c.page) in cited],
+        )
+
+    def apply(self, container: Container) -> Container:
+        """
+        Apply the delta to `container` in place and return it
+
+        For a container read with fields / min_trust, apply the delta's
+        project() with the same arguments.
+        """
+        for key in self.data_removed:
+            container.data.pop(key, None)
+        container.data.update(self.data_set)
+
+        if container.atoms is not None:
+            for path in self.atoms_removed:
+                container.atoms.pop(path, None)
+            container.atoms.update(self.atoms_added)
+            container.atoms.update(self.atoms_changed)
+
+        removed = {(c.document_id, c.page) for c in self.citations_removed}
+        container.citations = [
+            c for c in container.citations if (c.document_id, c.page) not in removed
+        ]
+        known = {(c.document_id, c.page) for c in container.citations}
+        container.citations.extend(
+            c for c in self.citations_added if (c.document_id, c.page) not in known
+        )
+
+        container.id = self.container_id
+        container.version = self.to_version
+        return container
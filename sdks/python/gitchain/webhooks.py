@@ -0,0 +1,206 @@
+"""
+Webhook receiver for cache invalidation
+
+Verifies GitChain webhook deliveries (HMAC-SHA256 in X-GitChain-Signature)
+and drops or refreshes cached containers as update events arrive, so
+caches can run with long TTLs.
+
+Example:
+    client = GitChainClient(api_key="...", cache_ttl=3600)
+    listener = WebhookListener(secret="whsec...", client=client, refresh=True)
+    listener.serve(port=8711)
+"""
+
+import hashlib
+import hmac
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from .cache import ContainerCache
+
+SIGNATURE_HEADER = "X-GitChain-Signature"
+
+# Events after which cached copies of a container are stale
+INVALIDATING_EVENTS = ("container.created", "container.updated", "container.deleted", "batch.registered")
+
+
+class WebhookSignatureError(ValueError):
+    """Delivery signature does not match the webhook secret"""
+
+
+def verify_signature(body: bytes, signature: str, secret: str) -> bool:
+    """Check the hex HMAC-SHA256 signature of a raw webhook body"""
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature or "")
+
+
+@dataclass
+class WebhookEvent:
+    """Verified webhook delivery"""
+    event: str
+    payload: Dict[str, Any]
+    timestamp: str
+
+    @property
+    def container_ids(self) -> List[str]:
+        """Container IDs referenced by the payload"""
+        ids = self.payload.get("containerIds") or []
+        for key in ("containerId", "container_id"):
+            if self.payload.get(key):
+                ids = [self.payload[key], *ids]
+        return [i for i in ids if isinstance(i, str)]
+
+
+class WebhookListener:
+    """
+    Receives webhook deliveries and invalidates cache entries
+
+    Subscribe its URL through POST /api/webhooks. `container.*` payloads
+    carry `containerId` and reach every subscriber that can read the
+    container; `batch.registered` payloads carry `containerIds` and only
+    reach the user who registered the batch. Other caches (e.g. inject
+    results or proofs) can subscribe with `on()`.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        client: Any = None,
+        caches: Optional[List[ContainerCache]] = None,
+        refresh: bool = False,
+        tolerance: float = 300,
+    ):
+        """
+        Args:
+            secret: Webhook secret returned when the webhook was created
+            client: GitChainClient whose cache to maintain
+            caches: Additional container caches to invalidate
+            refresh: Refetch updated containers that were cached instead
+                of waiting for the next read
+            tolerance: Reject deliveries older than this many seconds
+        """
+        self.secret = secret
+        self.client = client
+        self.caches = list(caches or [])
+        if client is not None and getattr(client, "cache", None) is not None:
+            self.caches.append(client.cache)
+        self.proof_cache: Optional[ContainerCache] = getattr(client, "proof_cache", None)
+        self.shared_cache = getattr(client, "shared_cache", None)
+        self.refresh = refresh
+        self.tolerance = tolerance
+        self._handlers: Dict[str, List[Callable[[WebhookEvent], None]]] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def on(self, event: str, handler: Callable[[WebhookEvent], None]) -> None:
+        """Call `handler` for `event` ("*" for all events)"""
+        self._handlers.setdefault(event, []).append(handler)
+
+    def handle(self, body: bytes, signature: str) -> WebhookEvent:
+        """
+        Verify and apply a delivery
+
+        Use this directly when receiving webhooks in an existing web app.
+
+        Args:
+            body: Raw request body
+            signature: Value of the X-GitChain-Signature header
+
+        Returns:
+            The verified event
+
+        Raises:
+            WebhookSignatureError: If the signature is invalid
+            ValueError: If the body or timestamp is invalid
+        """
+        if not verify_signature(body, signature, self.secret):
+            raise WebhookSignatureError("Invalid webhook signature")
+
+        try:
+            data = json.loads(body)
+            event = WebhookEvent(
+                event=data["event"],
+                payload=data.get("payload") or {},
+                timestamp=data["timestamp"],
+            )
+            sent_at = datetime.fromisoformat(event.timestamp.replace("Z", "+00:00"))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise ValueError("Malformed webhook body")
+
+        age = (datetime.now(timezone.utc) - sent_at).total_seconds()
+        if abs(age) > self.tolerance:
+            raise ValueError("Webhook timestamp outside tolerance")
+
+        if event.event in INVALIDATING_EVENTS:
+            self._invalidate(event)
+
+        for handler in self._handlers.get(event.event, []) + self._handlers.get("*", []):
+            handler(event)
+        return event
+
+    def _invalidate(self, event: WebhookEvent) -> None:
+        stale = []
+        for container_id in event.container_ids:
+            for cache in self.caches:
+                stale.extend(cache.invalidate(container_id))
+            if self.proof_cache is not None:
+                self.proof_cache.invalidate(container_id)
+            if self.shared_cache is not None:
+                self.shared_cache.invalidate(container_id)
+
+        if self.refresh and stale and self.client is not None and event.event != "container.deleted":
+            # Refetch outside the delivery request so the sender isn't held up
+            threading.Thread(
+                target=self._refetch, args=(list(dict.fromkeys(stale)),), daemon=True
+            ).start()
+
+    def _refetch(self, container_ids: List[str]) -> None:
+        try:
+            self.client.prefetch(container_ids)
+        except Exception:
+            # Entries stay invalidated and are fetched on next read
+            pass
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8711, path: str = "/") -> "WebhookListener":
+        """Start a background HTTP server receiving deliveries on `path`"""
+        listener = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path.split("?")[0] != path:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                try:
+                    listener.handle(body, self.headers.get(SIGNATURE_HEADER, ""))
+                    self.send_response(204)
+                except WebhookSignatureError:
+                    self.send_response(401)
+                except ValueError:
+                    self.send_response(400)
+                except Exception:
+                    self.send_response(500)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(
+            target=self._server.serve_forever, name="gitchain-webhooks", daemon=True
+        ).start()
+        return self
+
+    @property
+    def port(self) -> Optional[int]:
+        return self._server.server_address[1] if self._server else None
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,78 @@
+"""
+Wire format of API responses
+
+With `msgpack` installed (pip install gitchain[msgpack]) the client asks
+for MessagePack instead of JSON text. Hex hashes arrive as raw bytes in
+extension types and are restored to the same hex strings, so decoded
+responses are identical to their JSON counterparts.
+
+Bodies are recognized by their first byte, so raw payloads kept in caches
+decode correctly whichever format they were fetched in.
+"""
+
+import json
+import re
+from typing import Any
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+MSGPACK_TYPE = "application/msgpack"
+
+# Extension types of hex strings without and with "0x" prefix
+HEX_EXT = 1
+PREFIXED_HEX_EXT = 2
+
+_HEX_HASH = re.compile(r"^(0x)?((?:[0-9a-f]{2}){16,})$")
+
+
+def accept_header(binary: bool = True) -> str:
+    """Accept header for responses the client can decode"""
+    if binary and MSGPACK_AVAILABLE:
+        return f"{MSGPACK_TYPE}, application/json;q=0.9"
+    return "application/json"
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == HEX_EXT:
+        return data.hex()
+    if code == PREFIXED_HEX_EXT:
+        return "0x" + data.hex()
+    return msgpack.ExtType(code, data)
+
+
+def is_msgpack(body: bytes) -> bool:
+    # JSON text starts with ASCII; MessagePack maps and arrays do not
+    return bool(body) and body[0] >= 0x80
+
+
+def loads(body: bytes) -> Any:
+    """Decode a JSON or MessagePack response body"""
+    if is_msgpack(body):
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("MessagePack response, but msgpack is not installed")
+        return msgpack.unpackb(body, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+    return json.loads(body)
+
+
+def _pack_hashes(value: Any) -> Any:
+    kind = type(value)
+    if kind is dict:
+        return {k: _pack_hashes(v) for k, v in value.items()}
+    if kind is list or kind is tuple:
+        return [_pack_hashes(v) for v in value]
+    if kind is str and len(value) >= 32:
+        match = _HEX_HASH.match(value)
+        if match:
+            code = PREFIXED_HEX_EXT if match.group(1) else HEX_EXT
+            return msgpack.ExtType(code, bytes.fromhex(match.group(2)))
+    return value
+
+
+def dumps_msgpack(value: Any) -> bytes:
+    """Encode a JSON-serializable value the way the API does"""
+    return msgpack.packb(_pack_hashes(value), use_bin_type=True)
@@ -0,0 +1,44 @@
+"""
+GitChainClient.get_containers() against POST /api/containers/bulk
+(apps/api/src/routes/containers.ts)
+"""
+
+from gitchain import GitChainClient
+
+LATEST = "0711:product:bosch:8738208680:latest"
+V2 = "0711:product:bosch:8738208680:v2"
+
+
+def row(container_id):
+    _, type, namespace, identifier, version = container_id.split(":")
+    return {
+        "id": f"uuid-{identifier}",
+        "container_id": container_id,
+        "type": type,
+        "namespace": namespace,
+        "identifier": identifier,
+        "version": int(version[1:]),
+        "data": {"name": "Compress 7000i AW"},
+    }
+
+
+def client_with(containers):
+    client = GitChainClient(api_url="http://localhost:1", binary=False)
+    # getManyByContainerId resolves ":latest" and matches other IDs exactly
+    client._request = lambda method, path, data=None: {  # type: ignore[assignment]
+        "data": {"containers": [containers[i] for i in data["ids"] if i in containers]}
+    }
+    return client
+
+
+def test_latest_maps_to_the_resolved_version():
+    client = client_with({LATEST: row(V2)})
+
+    (container,) = client.get_containers([LATEST])
+    assert container.id == V2
+
+
+def test_unversioned_ids_are_not_resolved():
+    client = client_with({LATEST: row(V2), V2: row(V2)})
+
+    assert [c.id for c in client.get_containers(["0711:product:bosch:8738208680", V2])] == [V2]
@@ -0,0 +1,134 @@
+"""
+GitChainClient.inject() against the response shapes of POST /api/inject
+(apps/api/src/index.ts)
+"""
+
+import copy
+from typing import Any, Dict
+
+import pytest
+
+from gitchain import GitChainClient
+
+CONTAINER_ID = "0711:product:bosch:8738208680:v1"
+
+FORMATTED = (
+    "# Compress 7000i AW\n\n"
+    f"**Container ID:** `{CONTAINER_ID}`\n"
+    "**Type:** product\n"
+    "**Namespace:** bosch\n\n"
+    "---\n\n"
+)
+
+# sendSuccess() envelope with the rows the route builds, "normalize": true
+NORMALIZED = {
+    "data": {
+        "normalized": True,
+        "tables": {
+            "documents": ["0711:document:bosch:bodbsp_8738208680:v1"],
+            "citations": [{"document": 0, "page": 2}],
+            "contributors": ["bosch"],
+            "units": ["kW"],
+            "commits": ["9f2c61e0b4d7a8c3e5f1a2b4c6d8e0f1a3b5c7d9"],
+        },
+        "containers": [{
+            "id": CONTAINER_ID,
+            "type": "product",
+            "namespace": "bosch",
+            "identifier": "8738208680",
+            "version": 1,
+            "data": {"name": "Compress 7000i AW"},
+            "atoms": {
+                "leistung.nennleistung": {
+                    "value": 8,
+                    "unit": 0,
+                    "trust": "highest",
+                    "source": {"type": "manufacturer", "contributor_id": 0, "layer_id": "000-core"},
+                    "commit": 0,
+                    "citation": {"document": 0, "page": 2},
+                },
+            },
+            "citations": [0],
+            "verified": True,
+        }],
+        "citations": [0],
+        "formatted": FORMATTED,
+        "tokenCount": 31,
+        "verified": True,
+        "containerCount": 1,
+    }
+}
+
+# Without fields/minTrust: no atoms, contextHash instead
+PLAIN = {
+    "data": {
+        "containers": [{
+            "id": CONTAINER_ID,
+            "type": "product",
+            "namespace": "bosch",
+            "identifier": "8738208680",
+            "version": 1,
+            "data": {"name": "Compress 7000i AW"},
+            "contextHash": "5d41402abc4b2a76b9719d911017c592",
+            "verified": False,
+        }],
+        "formatted": FORMATTED,
+        "tokenCount": 31,
+        "verified": False,
+        "containerCount": 1,
+    }
+}
+
+
+def client_returning(response: Dict[str, Any]) -> GitChainClient:
+    client = GitChainClient(api_url="http://localhost:1", binary=False)
+    # Normalized atoms are resolved in place, so every call gets a fresh copy
+    client._request = lambda method, path, data=None: copy.deepcopy(response)  # type: ignore[assignment]
+    return client
+
+
+def test_normalized_response():
+    context = client_returning(NORMALIZED).inject([CONTAINER_ID], fields=["leistung.*"])
+
+    assert context.verified
+    assert context.formatted == FORMATTED
+    assert context.token_count == 31
+    (container,) = context.containers
+    assert (container.id, container.namespace, container.identifier, container.version) == (
+        CONTAINER_ID, "bosch", "8738208680", 1
+    )
+    atom = container.atoms["leistung.nennleistung"]
+    assert atom["unit"] == "kW"
+    assert atom["source"]["contributor_id"] == "bosch"
+    assert atom["citation"]["document"] == "0711:document:bosch:bodbsp_8738208680:v1"
+    assert [(c.document_id, c.page) for c in context.citations] == [
+        ("0711:document:bosch:bodbsp_8738208680:v1", 2)
+    ]
+    assert context.container_blocks() == {CONTAINER_ID: FORMATTED}
+
+
+def test_plain_response():
+    context = client_returning(PLAIN).inject([CONTAINER_ID], verify=False)
+
+    assert not context.verified
+    (container,) = context.containers
+    assert container.context_hash == "5d41402abc4b2a76b9719d911017c592"
+    assert container.atoms is None
+    assert container.meta.name == "Compress 7000i AW"
+
+
+@pytest.mark.parametrize("response", [NORMALIZED, PLAIN])
+def test_rows_with_only_the_id(response):
+    # Servers before namespace/identifier/version were added to inject rows
+    rows = [
+        {k: v for k, v in row.items() if k not in ("namespace", "identifier", "version")}
+        for row in response["data"]["containers"]
+    ]
+    older = {"data": {**response["data"], "containers": rows, "tokenCount": None}}
+    context = client_returning(older).inject([CONTAINER_ID], verify=False)
+
+    (container,) = context.containers
+    assert (container.type, container.namespace, container.identifier, container.version) == (
+        "product", "bosch", "8738208680", 1
+    )
+    assert context.token_count > 0
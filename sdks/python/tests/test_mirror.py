@@ -0,0 +1,95 @@
+"""
+LocalMirror sync against the response shapes of the containers routes
+(apps/api/src/routes/containers.ts)
+"""
+
+from typing import Any, Dict, List, Optional
+
+from gitchain.mirror import LocalMirror
+
+CONTAINER_ID = "0711:product:bosch:8738208680:v1"
+
+ATOM = {"value": 8, "unit": "kW", "trust": "highest", "source": {"type": "manufacturer"}}
+
+
+def listing_row(container_id: str = CONTAINER_ID, content_hash: str = "a1") -> Dict[str, Any]:
+    _, type, namespace, identifier, version = container_id.split(":")
+    return {
+        "id": f"uuid-{identifier}",
+        "container_id": container_id,
+        "type": type,
+        "namespace": namespace,
+        "identifier": identifier,
+        "version": int(version[1:]),
+        "content_hash": content_hash,
+        "updated_at": "2026-10-01T12:00:00.000Z",
+        "data": {"name": "Compress 7000i AW"},
+    }
+
+
+class FakeClient:
+    """Listing rows and sendSuccess() replies, as the API sends them"""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self.requests: List[tuple] = []
+
+    def _iter_container_rows(self, **filters: Any):
+        self.requests.append(("LIST", filters))
+        return iter(list(self.rows))
+
+    def _request(self, method: str, path: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self.requests.append((method, path, data))
+        if path.endswith("/history"):
+            return {"data": [{"commit_hash": "9f2c61e0", "version": 1, "message": "Initial import"}]}
+        assert (method, path) == ("POST", "/api/containers/bulk")
+        containers = [
+            {**row, "atoms": {"leistung.nennleistung": ATOM}}
+            for row in self.rows
+            if row["container_id"] in data["ids"]
+        ]
+        return {"data": {"containers": containers}}
+
+
+def test_sync_unwraps_atoms_and_history():
+    client = FakeClient([listing_row()])
+    mirror = LocalMirror(client, ":memory:", namespaces=["bosch"], history=True)
+
+    assert mirror.sync() == 1
+    assert mirror.atoms(CONTAINER_ID) == {"leistung.nennleistung": ATOM}
+    assert [c["commit_hash"] for c in mirror.commits(CONTAINER_ID)] == ["9f2c61e0"]
+
+
+def test_sync_does_not_count_as_inject():
+    client = FakeClient([listing_row()])
+    LocalMirror(client, ":memory:", namespaces=["bosch"]).sync()
+
+    assert [r[:2] for r in client.requests if r[0] != "LIST"] == [("POST", "/api/containers/bulk")]
+    assert client.requests[-1][2] == {"ids": [CONTAINER_ID], "fields": ["*"]}
+
+
+def test_incremental_sync_drops_deleted_containers():
+    other = "0711:product:bosch:7736606982:v3"
+    client = FakeClient([listing_row(), listing_row(other)])
+    mirror = LocalMirror(client, ":memory:", namespaces=["bosch"], prune_interval=0)
+    mirror.sync()
+
+    client.rows = [listing_row()]
+    mirror.sync()
+
+    assert [c.id for c in mirror.iter_containers()] == [CONTAINER_ID]
+    assert mirror.atoms(other) == {}
+
+
+def test_deletions_wait_for_prune_interval():
+    other = "0711:product:bosch:7736606982:v3"
+    client = FakeClient([listing_row(), listing_row(other)])
+    mirror = LocalMirror(client, ":memory:", namespaces=["bosch"], prune_interval=None)
+    mirror.sync()
+
+    client.rows = [listing_row()]
+    mirror.sync()
+    assert mirror.get(other) is not None
+
+    mirror.sync(full=True)
+    assert mirror.get(other) is None
@@ -0,0 +1,46 @@
+"""
+SystemPromptBuilder rendering through the client's ContextFormatter
+"""
+
+from gitchain import GitChainClient, SystemPromptBuilder
+from gitchain.types import Container
+
+ROW = {
+    "id": "0711:product:bosch:8738208680:v1",
+    "data": {"name": "Compress 7000i AW", "specs": {"cop": 4.5, "noise": "35 dB"}},
+    "atoms": {
+        "leistung.nennleistung": {"value": 8, "unit": "kW", "trust": "highest"},
+        "effizienz.cop": {"value": 4.5, "trust": "high"},
+    },
+    "citations": [{"documentId": "datasheet", "page": 2}, {"documentId": "manual"}],
+}
+
+
+def reordered(row):
+    return {
+        **row,
+        "data": {"specs": dict(reversed(row["data"]["specs"].items())), "name": row["data"]["name"]},
+        "atoms": dict(reversed(row["atoms"].items())),
+        "citations": row["citations"][::-1],
+    }
+
+
+def test_prompt_is_byte_stable():
+    client = GitChainClient(api_url="http://localhost:1")
+    builder = SystemPromptBuilder(client)
+
+    first = builder.render([Container.from_dict(ROW)])
+    second = builder.render([Container.from_dict(reordered(ROW))])
+
+    assert first == second
+    assert "- **effizienz.cop:** 4.5 _(high)_\n- **leistung.nennleistung:** 8 kW _(highest)_" in first
+
+
+def test_fragments_come_from_the_client_formatter():
+    client = GitChainClient(api_url="http://localhost:1")
+    container = Container.from_dict(ROW)
+
+    SystemPromptBuilder(client).render([container])
+    SystemPromptBuilder(client).render([container])
+
+    assert (client.formatter.hits, client.formatter.misses) == (1, 1)
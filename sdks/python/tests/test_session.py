@@ -0,0 +1,99 @@
+"""
+ContextSession turns and their use by the OpenAI helpers
+"""
+
+from typing import Any, Dict, List
+
+import pytest
+
+from gitchain import ContextSession, GitChainClient
+from gitchain.openai import GitChainFunctionHandler, create_system_prompt
+from gitchain.types import ContainerDelta, InjectedContext
+
+V1 = "0711:product:bosch:8738208680:v1"
+V2 = "0711:product:bosch:8738208680:v2"
+
+
+class FakeClient(GitChainClient):
+    """Answers inject() and diff() without a server, recording inject calls"""
+
+    def __init__(self, verified: bool = True):
+        super().__init__(api_url="http://localhost:1")
+        self.verified = verified
+        self.injects: List[Dict[str, Any]] = []
+
+    def inject(self, containers, verify=True, **kwargs):
+        self.injects.append({"containers": list(containers), "verify": verify})
+        rows = [{"id": i, "data": {"name": i}} for i in containers]
+        formatted = "".join(f"# {i}\n\n---\n\n" for i in containers)
+        return InjectedContext.from_dict({
+            "containers": rows,
+            "formatted": formatted,
+            "verified": verify and self.verified,
+            "containerCount": len(rows),
+        })
+
+    def diff(self, container_id, from_version=None, to_version=None):
+        return ContainerDelta.from_dict({
+            "containerId": container_id,
+            "fromVersion": from_version,
+            "toVersion": to_version,
+            "data": {"set": {"cop": 4.6}},
+        })
+
+
+def test_turn_passes_verify_through():
+    client = FakeClient()
+    session = ContextSession(client, verify=True)
+
+    assert session.turn([V1], verify=False).verified
+    assert client.injects[-1]["verify"] is False
+
+
+@pytest.mark.parametrize("verify", [True, False])
+def test_turns_without_a_verified_inject(verify):
+    session = ContextSession(FakeClient(), verify=verify)
+    session.turn([V1])
+
+    assert session.turn([V1]).verified is (not verify)  # unchanged only
+    assert session.turn([V2]).verified is (not verify)  # version delta
+
+
+def test_unverified_inject():
+    assert ContextSession(FakeClient(verified=False)).turn([V1]).verified is False
+
+
+def test_function_handler_passes_verify_to_the_session():
+    client = FakeClient()
+    handler = GitChainFunctionHandler(session=ContextSession(client))
+
+    handler.handle_function_call("gitchain_inject", {"container_ids": [V1], "verify": False})
+    assert client.injects[-1]["verify"] is False
+
+
+def test_tool_calls_share_one_session_turn():
+    client = FakeClient()
+    session = ContextSession(client)
+    calls = [
+        {"id": "a", "function": {"name": "gitchain_inject", "arguments": {"container_ids": [V1], "verify": False}}},
+        {"id": "b", "function": {"name": "gitchain_inject", "arguments": {"container_ids": [V2]}}},
+    ]
+
+    GitChainFunctionHandler(session=session).handle_tool_calls(calls)
+
+    assert len(session.turns) == 1
+    assert client.injects == [{"containers": [V1, V2], "verify": True}]
+
+
+def test_system_prompt_with_session():
+    client = FakeClient()
+    session = ContextSession(client)
+
+    first = create_system_prompt([V1], session=session, verify=False)
+    later = create_system_prompt([V1], client=client, session=session)
+
+    assert client.injects[-1]["verify"] is False
+    assert first.endswith("Note: Some data could not be verified.\n")
+    assert later.startswith("Updates to the product data provided earlier:")
+    with pytest.raises(ValueError):
+        create_system_prompt([V1], client=FakeClient(), session=session)